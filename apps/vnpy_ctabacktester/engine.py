@@ -17,6 +17,7 @@ from core.trader.utility import extract_vt_symbol
 from core.trader.object import HistoryRequest, TickData, ContractData, BarData
 from core.trader.datafeed import BaseDatafeed, get_datafeed
 from core.trader.database import BaseDatabase, get_database
+from core.trader.optimize import shutdown_optimization_executor
 
 import apps.vnpy_ctastrategy
 from apps.vnpy_ctastrategy import CtaTemplate, TargetPosTemplate
@@ -140,6 +141,10 @@ class BacktesterEngine(BaseEngine):
         """"""
         self.classes.clear()
         self.load_strategy_class()
+
+        # 常驻优化进程中缓存了旧的策略代码，需要重新创建
+        shutdown_optimization_executor()
+
         self.write_log("策略文件重载刷新完成")
 
     def get_strategy_class_names(self) -> list:
@@ -194,6 +199,7 @@ class BacktesterEngine(BaseEngine):
 
         if self.last_history_bars is None:
             engine.load_data()  # 开始加载数据
+            engine.check_data_gaps()
             self.last_history_bars = engine.history_data
         else:
             last_start = self.last_history_bars[0].datetime.replace(tzinfo=None)
@@ -210,6 +216,7 @@ class BacktesterEngine(BaseEngine):
                 engine.history_data = self.last_history_bars
             else:
                 engine.load_data()  # 时间不对则重新加载数据
+                engine.check_data_gaps()
                 self.last_history_bars = engine.history_data
 
         try:
@@ -348,7 +355,8 @@ class BacktesterEngine(BaseEngine):
             self.result_values = engine.run_bf_optimization(
                 optimization_setting,
                 output=False,
-                max_workers=max_workers
+                max_workers=max_workers,
+                progress=self.write_optimization_progress
             )
 
         # Clear thread object handler.
@@ -359,6 +367,10 @@ class BacktesterEngine(BaseEngine):
         event: Event = Event(EVENT_BACKTESTER_OPTIMIZATION_FINISHED)
         self.event_engine.put(event)
 
+    def write_optimization_progress(self, count: int, total: int, eta: float) -> None:
+        """输出参数优化进度和预计剩余时间"""
+        self.write_log(f"参数优化进度：{count}/{total}，预计剩余{int(eta)}秒")
+
     def start_optimization(
             self,
             class_name: str,
@@ -507,3 +519,7 @@ class BacktesterEngine(BaseEngine):
         strategy_class: type = self.classes[class_name]
         file_path: str = getfile(strategy_class)
         return file_path
+
+    def close(self) -> None:
+        """"""
+        shutdown_optimization_executor()
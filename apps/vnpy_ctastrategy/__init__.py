@@ -28,7 +28,7 @@ import importlib_metadata
 from core.trader.app import BaseApp
 from core.trader.constant import Direction
 from core.trader.object import TickData, BarData, TradeData, OrderData
-from core.trader.utility import BarGenerator, ArrayManager
+from core.trader.utility import BarGenerator, ArrayManager, RingArrayManager, StreamArrayManager
 
 from .base import APP_NAME, StopOrder
 from .engine import CtaEngine
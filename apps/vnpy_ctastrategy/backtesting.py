@@ -1,7 +1,10 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Callable, List, Dict, Optional, Type
+from typing import Callable, Iterator, List, Dict, Optional, Type, Union
 from functools import lru_cache, partial
+from itertools import chain
+from inspect import getfile
+import hashlib
 import traceback
 
 import numpy as np
@@ -13,9 +16,11 @@ from core.trader.constant import (Direction, Offset, Exchange,
                                   Interval, Status)
 from core.trader.database import get_database, BaseDatabase
 from core.trader.object import OrderData, TradeData, BarData, TickData
-from core.trader.utility import round_to
+from core.trader.utility import round_to, BarSeries, SharedBarSeries
 from core.trader.optimize import (
     OptimizationSetting,
+    OptimizationCache,
+    PROGRESS_FUNC,
     check_optimization_setting,
     run_bf_optimization,
     run_ga_optimization
@@ -33,6 +38,10 @@ from .strategies.script.ZQTools import ZQLoadBars, ZQIntervalConvert
 from .template import CtaTemplate
 
 
+# 支持检查数据库K线缺失的回测周期
+GAP_CHECK_INTERVALS: set = {Interval.MINUTE, Interval.MINUTE_15, Interval.HOUR}
+
+
 class BacktestingEngine:
     """"""
 
@@ -64,7 +73,8 @@ class BacktestingEngine:
         self.interval: Interval = None
         self.days: int = 0
         self.callback: Callable = None
-        self.history_data: list = []
+        self.history_data: Union[BarSeries, list] = []
+        self.shared_history: Optional[SharedBarSeries] = None
 
         self.stop_order_count: int = 0
         self.stop_orders: Dict[str, StopOrder] = {}
@@ -147,8 +157,11 @@ class BacktestingEngine:
             self, strategy_class.__name__, self.vt_symbol, setting
         )
 
-    def load_data(self) -> None:
-        """加载回测K线"""
+    def load_data(self, stream: bool = False) -> None:
+        """
+        加载回测K线
+        stream为True时K线在回测时从数据库逐条读取合成，只能回放一次，不支持参数优化
+        """
         self.output("开始加载历史数据")
 
         if not self.end:
@@ -158,18 +171,30 @@ class BacktestingEngine:
             self.output("起始日期必须小于结束日期")
             return
 
-        self.history_data.clear()  # Clear previously loaded history data 清除以前加载的历史数据
+        self.history_data = []  # Clear previously loaded history data 清除以前加载的历史数据
+
+        if stream and self.mode == BacktestingMode.BAR:
+            self.history_data = ZQLoadBars(
+                symbol=self.symbol,
+                exchange=self.exchange,
+                zq_interval=self.interval.value,
+                start=self.start,
+                end=self.end
+            ).iter_bars()
 
-        # 数据库加载K线
+            self.output("历史数据使用流式加载，回放时从数据库逐条读取")
+            return
+
+        # 数据库加载K线，以列式K线序列保存
         if self.mode == BacktestingMode.BAR:
 
-            data: List[BarData] = ZQLoadBars(
+            data: BarSeries = ZQLoadBars(
                 symbol=self.symbol,
                 exchange=self.exchange,
                 zq_interval=self.interval.value,
                 start=self.start,
                 end=self.end
-            ).load()
+            ).load_series()
 
         else:
             data: List[TickData] = load_tick_data(
@@ -179,10 +204,27 @@ class BacktestingEngine:
                 self.end
             )
 
-        self.history_data = data
+        self.history_data = data or []
 
         self.output(f"历史数据加载完成，数据量：{len(self.history_data)}")
 
+    def check_data_gaps(self) -> None:
+        """
+        检查数据库中回测区间内缺失的K线，只输出提示，不影响回测。
+        由界面在加载数据后调用，参数优化重新加载数据时不检查
+        """
+        # 日线、周线K线没有分钟周期的数据库数据，Tick回测不检查
+        if self.mode != BacktestingMode.BAR or self.interval not in GAP_CHECK_INTERVALS:
+            return
+
+        interval: Interval = ZQIntervalConvert(self.interval.value).vnInterval
+        gaps: Optional[list] = get_database().find_gaps(self.symbol, self.exchange, interval, self.start, self.end)
+
+        if gaps is None:
+            self.output("K线连续区间索引尚未建立，跳过历史数据缺失检查")
+        elif gaps:
+            self.output(f"历史数据存在{len(gaps)}处缺失，第一处：{gaps[0][0]} - {gaps[0][1]}")
+
     def run_backtesting(self) -> None:
         """"""
         if self.mode == BacktestingMode.BAR:
@@ -192,6 +234,11 @@ class BacktestingEngine:
 
         self.strategy.on_init()
 
+        # 流式加载的历史数据只能遍历一次，单独处理
+        if isinstance(self.history_data, Iterator):
+            self.run_backtesting_stream(func)
+            return
+
         # Use the first [days] of history data for initializing  使用历史数据的前[天]初始化策略
         day_count: int = 0
         ix: int = 0
@@ -219,7 +266,7 @@ class BacktestingEngine:
         self.output("开始回放历史数据")
 
         # Use the rest of history data for running backtesting
-        backtesting_data: list = self.history_data[ix:]
+        backtesting_data: Union[BarSeries, list] = self.history_data[ix:]
 
         if len(backtesting_data) <= 1:
             self.output("历史数据不足，回测终止")
@@ -229,7 +276,7 @@ class BacktestingEngine:
         batch_size: int = max(int(total_size / 10), 1)
 
         for ix, i in enumerate(range(0, total_size, batch_size)):
-            batch_data: list = backtesting_data[i: i + batch_size]
+            batch_data: Union[BarSeries, list] = backtesting_data[i: i + batch_size]
             for data in batch_data:
                 try:
                     func(data)
@@ -245,6 +292,72 @@ class BacktestingEngine:
         self.strategy.on_stop()
         self.output("历史数据回放结束")
 
+    def run_backtesting_stream(self, func: Callable) -> None:
+        """
+        Run backtesting on history data iterator, bars are consumed lazily.
+        回放流式加载的历史数据，回放进度按时间计算
+        """
+        history_data: Iterator = self.history_data
+
+        # Use the first [days] of history data for initializing  使用历史数据的前[天]初始化策略
+        day_count: int = 0
+        data = None
+
+        for data in history_data:
+            if self.datetime and data.datetime.day != self.datetime.day:
+                day_count += 1
+                if day_count >= self.days:
+                    break
+
+            self.datetime = data.datetime
+
+            try:
+                self.callback(data)
+            except Exception:
+                self.output("触发异常，回测终止")
+                self.output(traceback.format_exc())
+                return
+        else:
+            data = None
+
+        self.strategy.inited = True
+        self.output("策略初始化完成")
+
+        self.strategy.on_start()
+        self.strategy.trading = True
+        self.output("开始回放历史数据")
+
+        # 至少需要两根K线才能回放
+        next_data = next(history_data, None)
+        if not data or not next_data:
+            self.output("历史数据不足，回测终止")
+            return
+
+        start_time: float = data.datetime.timestamp()
+        total_time: float = max(self.end.timestamp() - start_time, 1)
+        progress_count: int = 0
+
+        for data in chain((data, next_data), history_data):
+            try:
+                func(data)
+            except Exception:
+                self.output("触发异常，回测终止")
+                self.output(traceback.format_exc())
+                return
+
+            # 每完成10%输出一次进度
+            progress: float = (data.datetime.timestamp() - start_time) / total_time
+            while progress_count < 10 and progress >= (progress_count + 1) / 10:
+                progress_count += 1
+                progress_bar: str = "=" * progress_count
+                self.output(f"回放进度：{progress_bar} [{progress_count / 10:.0%}]")
+
+        if progress_count < 10:
+            self.output(f"回放进度：{'=' * 10} [100%]")
+
+        self.strategy.on_stop()
+        self.output("历史数据回放结束")
+
     def calculate_result(self) -> DataFrame:
         """"""
         self.output("开始计算逐日盯市盈亏")
@@ -521,20 +634,35 @@ class BacktestingEngine:
             self,
             optimization_setting: OptimizationSetting,
             output: bool = True,
-            max_workers: int = None
+            max_workers: int = None,
+            chunksize: int = 0,
+            progress: PROGRESS_FUNC = None,
+            use_cache: bool = True
     ) -> list:
         """运行穷举算法优化"""
         if not check_optimization_setting(optimization_setting):
             return
 
         evaluate_func: callable = wrap_evaluate(self, optimization_setting.target_name)  # 生成所有进程要执行的函数
-        results: list = run_bf_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            output=self.output
-        )
+        cache: Optional[OptimizationCache] = None
+        try:
+            if use_cache:
+                cache = self.create_optimization_cache(optimization_setting.target_name)
+
+            results: list = run_bf_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                output=self.output,
+                chunksize=chunksize,
+                progress=progress,
+                cache=cache
+            )
+        finally:
+            self.release_shared_history()
+            if cache:
+                cache.close()
 
         if output:
             for result in results:
@@ -549,20 +677,31 @@ class BacktestingEngine:
             self,
             optimization_setting: OptimizationSetting,
             output: bool = True,
-            max_workers: int = None
+            max_workers: int = None,
+            use_cache: bool = True
     ) -> list:
         """运行遗传算法优化"""
         if not check_optimization_setting(optimization_setting):
             return
 
         evaluate_func: callable = wrap_evaluate(self, optimization_setting.target_name)
-        results: list = run_ga_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            output=self.output
-        )
+        cache: Optional[OptimizationCache] = None
+        try:
+            if use_cache:
+                cache = self.create_optimization_cache(optimization_setting.target_name)
+
+            results: list = run_ga_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                output=self.output,
+                cache=cache
+            )
+        finally:
+            self.release_shared_history()
+            if cache:
+                cache.close()
 
         if output:
             for result in results:
@@ -571,6 +710,59 @@ class BacktestingEngine:
 
         return results
 
+    def create_optimization_cache(self, target_name: str) -> OptimizationCache:
+        """
+        Create result cache whose namespace fingerprints strategy source,
+        history data, backtesting costs and optimization target.
+        创建优化结果缓存，策略代码、历史数据、交易成本或优化目标变化时缓存自动失效
+        """
+        md5 = hashlib.md5()
+
+        with open(getfile(self.strategy_class), "rb") as f:
+            md5.update(f.read())
+
+        history_data: Union[BarSeries, list] = self.history_data
+        if isinstance(history_data, BarSeries):
+            for array in (
+                history_data.datetime_array,
+                history_data.open_array,
+                history_data.high_array,
+                history_data.low_array,
+                history_data.close_array,
+                history_data.volume_array
+            ):
+                md5.update(array.tobytes())
+        elif history_data:
+            md5.update(repr((
+                len(history_data),
+                history_data[0].datetime,
+                history_data[-1].datetime
+            )).encode())
+
+        fields: tuple = (
+            self.strategy_class.__name__,
+            self.vt_symbol,
+            self.interval,
+            self.start,
+            self.end,
+            self.mode,
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+            target_name
+        )
+        md5.update(repr(fields).encode())
+
+        return OptimizationCache(md5.hexdigest())
+
+    def release_shared_history(self) -> None:
+        """释放优化时发布到共享内存的历史数据"""
+        if self.shared_history:
+            self.shared_history.release()
+            self.shared_history = None
+
     def update_daily_close(self, price: float) -> None:
         """"""
         d: date = self.datetime.date()
@@ -1081,7 +1273,7 @@ def evaluate(
         capital: int,
         end: datetime,
         mode: BacktestingMode,
-        history_bars: list,
+        history_bars: Union[SharedBarSeries, list],
         setting: dict
 ) -> tuple:
     """
@@ -1107,6 +1299,10 @@ def evaluate(
 
     # engine.load_data()
 
+    # 共享内存中的历史数据，每个进程只连接一次
+    if isinstance(history_bars, SharedBarSeries):
+        history_bars = history_bars.attach()
+
     engine.history_data = history_bars
     print(f'使用历史数据日期范围: {history_bars[0].datetime} ~ {history_bars[-1].datetime}')
 
@@ -1125,6 +1321,13 @@ def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> callable:
     """
     print("仅加载一次加载历史数据---zq优化")
     engine.load_data()
+
+    # K线数据发布到共享内存，任务参数只序列化共享内存名称
+    history_data: Union[SharedBarSeries, list] = engine.history_data
+    if isinstance(history_data, BarSeries) and len(history_data):
+        engine.shared_history = SharedBarSeries(history_data)
+        history_data = engine.shared_history
+
     # 固定不变参数生成执行函数集合
     func: callable = partial(
         evaluate,
@@ -1140,7 +1343,7 @@ def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> callable:
         engine.capital,
         engine.end,
         engine.mode,
-        engine.history_data
+        history_data
     )
     return func
 
@@ -2,10 +2,12 @@
 Defines constants and objects used in CtaStrategy App.
 """
 
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from core.trader.constant import Direction, Offset, Interval
 
@@ -54,6 +56,79 @@ class StopOrder:
         return f'订单id: {self.stop_orderid}  日期: {self.datetime}  方向: {self.direction}  价格: {self.price}  状态: {self.status.value}'
 
 
+class StopOrderBook:
+    """
+    Local stop orders indexed by vt_symbol and direction.
+
+    Each side keeps (price, sequence) keys in an ascending list, so orders
+    triggered by a price are a prefix (long) or suffix (short) found by
+    bisect, instead of scanning all stop orders on every tick.
+    本地停止单按合约和方向索引，价格排序后二分查找被触发的停止单
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0  # for keeping creation order of triggered orders
+        self.keys: Dict[str, Tuple[float, int]] = {}  # stop_orderid: (price, sequence)
+        self.orders: Dict[Tuple[float, int], StopOrder] = {}  # (price, sequence): stop_order
+        self.long_keys: Dict[str, List[Tuple[float, int]]] = defaultdict(list)  # vt_symbol: sorted keys
+        self.short_keys: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+
+    def add(self, stop_order: StopOrder) -> None:
+        """"""
+        self.count += 1
+        key: Tuple[float, int] = (stop_order.price, self.count)
+
+        self.keys[stop_order.stop_orderid] = key
+        self.orders[key] = stop_order
+        insort(self.get_side(stop_order)[stop_order.vt_symbol], key)
+
+    def remove(self, stop_order: StopOrder) -> None:
+        """"""
+        key: Tuple[float, int] = self.keys.pop(stop_order.stop_orderid, None)
+        if not key:
+            return
+        self.orders.pop(key)
+
+        side: Dict[str, List[Tuple[float, int]]] = self.get_side(stop_order)
+        keys: List[Tuple[float, int]] = side[stop_order.vt_symbol]
+        del keys[bisect_left(keys, key)]
+        if not keys:
+            side.pop(stop_order.vt_symbol)
+
+    def get_side(self, stop_order: StopOrder) -> Dict[str, List[Tuple[float, int]]]:
+        """"""
+        if stop_order.direction == Direction.LONG:
+            return self.long_keys
+        else:
+            return self.short_keys
+
+    def get_triggered(self, vt_symbol: str, price: float) -> List[StopOrder]:
+        """
+        Get stop orders triggered by price in creation order. Long orders
+        trigger when price >= order price, short orders when price <= order price.
+        """
+        keys: List[Tuple[float, int]] = []
+
+        long_keys: List[Tuple[float, int]] = self.long_keys.get(vt_symbol)
+        if long_keys and long_keys[0][0] <= price:
+            keys.extend(long_keys[:bisect_right(long_keys, (price, float("inf")))])
+
+        short_keys: List[Tuple[float, int]] = self.short_keys.get(vt_symbol)
+        if short_keys and short_keys[-1][0] >= price:
+            keys.extend(short_keys[bisect_left(short_keys, (price,)):])
+
+        if not keys:
+            return []
+
+        keys.sort(key=lambda key: key[1])
+        return [self.orders[key] for key in keys]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.keys)
+
+
 EVENT_CTA_LOG = "eCtaLog"
 EVENT_CTA_STRATEGY = "eCtaStrategy"
 EVENT_CTA_STOPORDER = "eCtaStopOrder"
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from glob import glob
+from threading import RLock
 from concurrent.futures import Future
 
 from core.event import Event, EventEngine
@@ -48,6 +49,7 @@ from .base import (
     EVENT_CTA_STOPORDER,
     EngineType,
     StopOrder,
+    StopOrderBook,
     StopOrderStatus,
     STOPORDER_PREFIX
 )
@@ -88,11 +90,16 @@ class CtaEngine(BaseEngine):
 
         self.stop_order_count: int = 0  # for generating stop_orderid
         self.stop_orders: Dict[str, StopOrder] = {}  # stop_orderid: stop_order
+        self.stop_order_book: StopOrderBook = StopOrderBook()  # stop orders indexed by vt_symbol and price
 
         self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
 
         self.vt_tradeids: set = set()  # for filtering duplicate trade
 
+        # Tick and order/trade events may be processed on different
+        # event engine lanes, serialize handlers touching strategy state.
+        self.event_lock: RLock = RLock()
+
         self.database: BaseDatabase = get_database()
         self.datafeed: BaseDatafeed = get_datafeed(main_engine)
 
@@ -141,137 +148,138 @@ class CtaEngine(BaseEngine):
 
     def process_tick_event(self, event: Event) -> None:
         """"""
-        tick: TickData = event.data
+        with self.event_lock:
+            tick: TickData = event.data
 
-        strategies: list = self.symbol_strategy_map[tick.vt_symbol]
-        if not strategies:
-            return
+            strategies: list = self.symbol_strategy_map[tick.vt_symbol]
+            if not strategies:
+                return
 
-        self.check_stop_order(tick)
+            self.check_stop_order(tick)
 
-        for strategy in strategies:
-            if strategy.inited:
-                self.call_strategy_func(strategy, strategy.on_tick, tick)
+            for strategy in strategies:
+                if strategy.inited:
+                    self.call_strategy_func(strategy, strategy.on_tick, tick)
 
     def process_order_event(self, event: Event) -> None:
         """"""
-        order: OrderData = event.data
-
-        strategy: Optional[type] = self.orderid_strategy_map.get(order.vt_orderid, None)
-        if not strategy:
-            return
-
-        # Remove vt_orderid if order is no longer active.
-        vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
-        if order.vt_orderid in vt_orderids and not order.is_active():
-            vt_orderids.remove(order.vt_orderid)
-
-        # For server stop order, call strategy on_stop_order function
-        if order.type == OrderType.STOP:
-            so: StopOrder = StopOrder(
-                vt_symbol=order.vt_symbol,
-                direction=order.direction,
-                offset=order.offset,
-                price=order.price,
-                volume=order.volume,
-                stop_orderid=order.vt_orderid,
-                strategy_name=strategy.strategy_name,
-                datetime=order.datetime,
-                status=STOP_STATUS_MAP[order.status],
-                vt_orderids=[order.vt_orderid],
-            )
-            self.call_strategy_func(strategy, strategy.on_stop_order, so)
+        with self.event_lock:
+            order: OrderData = event.data
+
+            strategy: Optional[type] = self.orderid_strategy_map.get(order.vt_orderid, None)
+            if not strategy:
+                return
+
+            # Remove vt_orderid if order is no longer active.
+            vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
+            if order.vt_orderid in vt_orderids and not order.is_active():
+                vt_orderids.remove(order.vt_orderid)
+
+            # For server stop order, call strategy on_stop_order function
+            if order.type == OrderType.STOP:
+                so: StopOrder = StopOrder(
+                    vt_symbol=order.vt_symbol,
+                    direction=order.direction,
+                    offset=order.offset,
+                    price=order.price,
+                    volume=order.volume,
+                    stop_orderid=order.vt_orderid,
+                    strategy_name=strategy.strategy_name,
+                    datetime=order.datetime,
+                    status=STOP_STATUS_MAP[order.status],
+                    vt_orderids=[order.vt_orderid],
+                )
+                self.call_strategy_func(strategy, strategy.on_stop_order, so)
 
-        # Call strategy on_order function
-        self.call_strategy_func(strategy, strategy.on_order, order)
+            # Call strategy on_order function
+            self.call_strategy_func(strategy, strategy.on_order, order)
 
     def process_trade_event(self, event: Event) -> None:
         """"""
-        trade: TradeData = event.data
+        with self.event_lock:
+            trade: TradeData = event.data
 
-        # Filter duplicate trade push
-        if trade.vt_tradeid in self.vt_tradeids:
-            return
-        self.vt_tradeids.add(trade.vt_tradeid)
+            # Filter duplicate trade push
+            if trade.vt_tradeid in self.vt_tradeids:
+                return
+            self.vt_tradeids.add(trade.vt_tradeid)
 
-        strategy: Optional[type] = self.orderid_strategy_map.get(trade.vt_orderid, None)
-        if not strategy:
-            return
+            strategy: Optional[type] = self.orderid_strategy_map.get(trade.vt_orderid, None)
+            if not strategy:
+                return
 
-        # Update strategy pos before calling on_trade method
-        if trade.direction == Direction.LONG:
-            strategy.pos += trade.volume
-        else:
-            strategy.pos -= trade.volume
+            # Update strategy pos before calling on_trade method
+            if trade.direction == Direction.LONG:
+                strategy.pos += trade.volume
+            else:
+                strategy.pos -= trade.volume
 
-        self.call_strategy_func(strategy, strategy.on_trade, trade)
+            self.call_strategy_func(strategy, strategy.on_trade, trade)
 
-        # Sync strategy variables to data file
-        self.sync_strategy_data(strategy)
+            # Sync strategy variables to data file
+            self.sync_strategy_data(strategy)
 
-        # Update GUI
-        self.put_strategy_event(strategy)
+            # Update GUI
+            self.put_strategy_event(strategy)
 
     def check_stop_order(self, tick: TickData) -> None:
-        """"""
-        for stop_order in list(self.stop_orders.values()):
-            if stop_order.vt_symbol != tick.vt_symbol:
+        """
+        Send limit orders for local stop orders triggered by tick price.
+        Only triggered orders of tick.vt_symbol are looked up in the stop
+        order book, so the cost does not grow with resting stop orders.
+        """
+        for stop_order in self.stop_order_book.get_triggered(tick.vt_symbol, tick.last_price):
+            # Cancelled by strategy callback of a previous triggered order
+            if stop_order.stop_orderid not in self.stop_orders:
                 continue
 
-            long_triggered = (
-                    stop_order.direction == Direction.LONG and tick.last_price >= stop_order.price
-            )
-            short_triggered = (
-                    stop_order.direction == Direction.SHORT and tick.last_price <= stop_order.price
-            )
+            strategy: CtaTemplate = self.strategies[stop_order.strategy_name]
 
-            if long_triggered or short_triggered:
-                strategy: CtaTemplate = self.strategies[stop_order.strategy_name]
-
-                # To get excuted immediately after stop order is
-                # triggered, use limit price if available, otherwise
-                # use ask_price_5 or bid_price_5
-                if stop_order.direction == Direction.LONG:
-                    if tick.limit_up:
-                        price = tick.limit_up
-                    else:
-                        price = tick.ask_price_5
+            # To get excuted immediately after stop order is
+            # triggered, use limit price if available, otherwise
+            # use ask_price_5 or bid_price_5
+            if stop_order.direction == Direction.LONG:
+                if tick.limit_up:
+                    price = tick.limit_up
                 else:
-                    if tick.limit_down:
-                        price = tick.limit_down
-                    else:
-                        price = tick.bid_price_5
-
-                contract: Optional[ContractData] = self.main_engine.get_contract(stop_order.vt_symbol)
-
-                vt_orderids: list = self.send_limit_order(
-                    strategy,
-                    contract,
-                    stop_order.direction,
-                    stop_order.offset,
-                    price,
-                    stop_order.volume,
-                    stop_order.lock,
-                    stop_order.net
-                )
+                    price = tick.ask_price_5
+            else:
+                if tick.limit_down:
+                    price = tick.limit_down
+                else:
+                    price = tick.bid_price_5
+
+            contract: Optional[ContractData] = self.main_engine.get_contract(stop_order.vt_symbol)
+
+            vt_orderids: list = self.send_limit_order(
+                strategy,
+                contract,
+                stop_order.direction,
+                stop_order.offset,
+                price,
+                stop_order.volume,
+                stop_order.lock,
+                stop_order.net
+            )
 
-                # Update stop order status if placed successfully
-                if vt_orderids:
-                    # Remove from relation map.
-                    self.stop_orders.pop(stop_order.stop_orderid)
+            # Update stop order status if placed successfully
+            if vt_orderids:
+                # Remove from relation map.
+                self.stop_orders.pop(stop_order.stop_orderid)
+                self.stop_order_book.remove(stop_order)
 
-                    strategy_vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
-                    if stop_order.stop_orderid in strategy_vt_orderids:
-                        strategy_vt_orderids.remove(stop_order.stop_orderid)
+                strategy_vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
+                if stop_order.stop_orderid in strategy_vt_orderids:
+                    strategy_vt_orderids.remove(stop_order.stop_orderid)
 
-                    # Change stop order status to cancelled and update to strategy.
-                    stop_order.status = StopOrderStatus.TRIGGERED
-                    stop_order.vt_orderids = vt_orderids
+                # Change stop order status to cancelled and update to strategy.
+                stop_order.status = StopOrderStatus.TRIGGERED
+                stop_order.vt_orderids = vt_orderids
 
-                    self.call_strategy_func(
-                        strategy, strategy.on_stop_order, stop_order
-                    )
-                    self.put_stop_order_event(stop_order)
+                self.call_strategy_func(
+                    strategy, strategy.on_stop_order, stop_order
+                )
+                self.put_stop_order_event(stop_order)
 
     def send_server_order(
             self,
@@ -414,6 +422,7 @@ class CtaEngine(BaseEngine):
         )
 
         self.stop_orders[stop_orderid] = stop_order
+        self.stop_order_book.add(stop_order)
 
         vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
         vt_orderids.add(stop_orderid)
@@ -446,6 +455,7 @@ class CtaEngine(BaseEngine):
 
         # Remove from relation map.
         self.stop_orders.pop(stop_orderid)
+        self.stop_order_book.remove(stop_order)
 
         vt_orderids: list = self.strategy_orderid_map[strategy.strategy_name]
         if stop_orderid in vt_orderids:
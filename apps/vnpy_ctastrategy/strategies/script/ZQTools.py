@@ -3,14 +3,15 @@ import time
 from abc import ABC
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List
+from typing import Deque, Iterator, List, Optional
+from collections import deque
 from tqdm import tqdm
 
 from apps.vnpy_ctastrategy.base import STOPORDER_PREFIX, StopOrderStatus, StopOrder
 from core.trader.constant import Exchange, Interval, Status
 from core.trader.database import BaseDatabase, get_database
 from core.trader.object import BarData, OrderData
-from core.trader.utility import BarGenerator
+from core.trader.utility import BarGenerator, BarSeries, resample_bars, resample_series
 
 
 class ZQIntervalConvert:
@@ -46,6 +47,12 @@ class ZQKLineGenerator:
         self.src_bars = bars  # 源数据
 
     def start(self, bar_units):
+        # 分钟和小时周期使用numpy向量化合成
+        if self.vn_interval in (Interval.MINUTE, Interval.HOUR):
+            for bar in resample_bars(self.src_bars, bar_units, self.vn_interval):
+                self.add_in_res(bar)
+            return self.res_bars
+
         bar_gnr = BarGenerator(
             on_bar=None,  # 处理新的K线数据的回调函数
             window=bar_units,  # 要用多少根K线合成
@@ -62,6 +69,15 @@ class ZQKLineGenerator:
         self.res_bars.append(new_bar)
 
 
+class ZQBarSeries(BarSeries):
+    """zq列式K线序列，生成K线时添加北京时间"""
+
+    def create_bar(self, *args) -> BarData:
+        bar: BarData = super().create_bar(*args)
+        bar.local_datetime = generator_localtime(bar)  # 添加北京时间
+        return bar
+
+
 class ZQLoadBars:
     """zq加载行情"""
 
@@ -97,8 +113,71 @@ class ZQLoadBars:
 
         return bars
 
-    def load(self):
+    def no_process_load_series(self, start, end) -> Optional[ZQBarSeries]:
+        """无进度条加载，合成结果为列式K线序列"""
+        # 分钟和小时周期直接从数据库加载列式数据并合成，不生成中间BarData
+        if self.zq_interval.vnInterval in (Interval.MINUTE, Interval.HOUR):
+            series = get_database().load_bar_series(
+                self.symbol,
+                self.exchange,
+                self.zq_interval.vnInterval,
+                start,
+                end,
+                ZQBarSeries
+            )
+            if not series:
+                return None
+            return resample_series(series, self.zq_interval.value, self.zq_interval.vnInterval)
+
+        src_bars = load_bars_data(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            interval=self.zq_interval.vnInterval,
+            start=start,
+            end=end,
+        )
+        if not src_bars:
+            return None
+
+        bar_generator = ZQKLineGenerator(src_bars, self.zq_interval.vnInterval)
+        bars = bar_generator.start(self.zq_interval.value)
+        if not bars:
+            return None
+        return ZQBarSeries.from_bars(bars)
+
+    def iter_bars(self) -> Iterator[BarData]:
+        """
+        流式加载：从数据库分页读取原始K线并逐条合成，内存占用与回测区间长度无关。
+        与按周加载不同，合成窗口不会在每周的边界处被截断。
+        """
+        window_bars: Deque[BarData] = deque()
+
+        def on_window_bar(bar: BarData) -> None:
+            bar.local_datetime = generator_localtime(bar)  # 添加北京时间
+            window_bars.append(bar)
+
+        bar_gnr = BarGenerator(
+            on_bar=None,
+            window=self.zq_interval.value,
+            on_window_bar=on_window_bar,
+            interval=self.zq_interval.vnInterval
+        )
+
+        src_bars: Iterator[BarData] = get_database().iter_bar_data(
+            self.symbol,
+            self.exchange,
+            self.zq_interval.vnInterval,
+            self.start,
+            self.end
+        )
+        for bar in src_bars:
+            bar_gnr.update_bar(bar)
 
+            while window_bars:
+                yield window_bars.popleft()
+
+    def split_dates(self):
+        """按周拆分加载区间"""
         total_date = self.end - self.start
 
         weeks = total_date.days // 7
@@ -108,15 +187,32 @@ class ZQLoadBars:
         for i in tqdm(range(0, weeks)):
             item_start = item_end
             item_end = item_end + timedelta(days=7)
-            self.bars.extend(self.no_process_load(item_start, item_end))
+            yield item_start, item_end
 
         if days > 0:
             item_start = item_end
             item_end += timedelta(days=days)
+            yield item_start, item_end
+
+    def load(self):
+        for item_start, item_end in self.split_dates():
             self.bars.extend(self.no_process_load(item_start, item_end))
         # self.no_process_load(self.start, self.end)
         return self.bars
 
+    def load_series(self) -> Optional[ZQBarSeries]:
+        """加载为列式K线序列，用于回测"""
+        series_list: List[ZQBarSeries] = []
+
+        for item_start, item_end in self.split_dates():
+            series = self.no_process_load_series(item_start, item_end)
+            if series:
+                series_list.append(series)
+
+        if not series_list:
+            return None
+        return ZQBarSeries.concat(series_list)
+
 
 class ZQOrderDirection(Enum):
     Long = "long"
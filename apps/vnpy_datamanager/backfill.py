@@ -0,0 +1,372 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from core.trader.constant import Exchange, Interval
+from core.trader.database import BaseDatabase
+from core.trader.utility import BarSeries, extract_vt_symbol, get_file_path
+from sdk.binance_sdk.binance.download.download_kline import (
+    plan_kline_files,
+    make_kline_task,
+    get_fallback_plan
+)
+from sdk.binance_sdk.binance.download.downloader import (
+    Downloader,
+    DownloadTask,
+    STATUS_DOWNLOADED,
+    STATUS_EXISTS,
+    STATUS_MISSING
+)
+from sdk.binance_sdk.binance.download.enums import DAILY_INTERVALS
+from sdk.binance_sdk.binance.download.utility import interval_converter
+from .datafeed.zquant_binancedata import binance_datafeed
+from .datafeed.zquant_binancedata.binance_datafeed import load_kline_series, is_valid_zip
+
+
+@dataclass
+class BackfillTask:
+    """单个K线文件的回补任务"""
+
+    symbol: str
+    exchange: Exchange
+    interval: Interval
+    time_period: str  # monthly/daily
+    period: str  # 2023-01/2023-01-01
+    download: DownloadTask
+    series: Optional[BarSeries] = None
+
+
+class StageStats:
+    """流水线单个阶段的吞吐统计，多个工作线程共用"""
+
+    def __init__(self, name: str, unit: str) -> None:
+        """"""
+        self.name: str = name
+        self.unit: str = unit  # 处理量单位
+
+        self.files: int = 0
+        self.amount: int = 0  # 下载阶段为字节数，其余为K线条数
+        self.failed: int = 0
+        self.busy: float = 0  # 所有线程合计的处理秒数
+
+        self.lock: Lock = Lock()
+
+    def add(self, amount: int, cost: float) -> None:
+        """记录一个完成的文件"""
+        with self.lock:
+            self.files += 1
+            self.amount += amount
+            self.busy += cost
+
+    def add_failed(self, cost: float) -> None:
+        """记录一个失败的文件"""
+        with self.lock:
+            self.failed += 1
+            self.busy += cost
+
+    def get_text(self, elapsed: float) -> str:
+        """输出统计信息"""
+        rate: float = self.amount / elapsed if elapsed else 0
+        return f"{self.name}：{self.files}个文件，失败{self.failed}个，" \
+               f"{self.amount}{self.unit}，{rate:.0f}{self.unit}/秒，线程累计耗时{self.busy:.1f}秒"
+
+
+class BackfillCheckpoint:
+    """
+    已写入数据库的文件记录，每完成一个文件追加一行，同时记录文件首尾K线的时间。
+    任务中断后重新运行时，只跳过首尾K线仍在数据库连续区间内的文件，
+    K线数据被删除后对应记录随之失效
+    """
+
+    def __init__(self, filename: str) -> None:
+        """"""
+        self.path: Path = get_file_path(filename)
+        self.entries: Dict[Tuple[str, str], Dict[str, Optional[Tuple[datetime, datetime]]]] = defaultdict(dict)
+
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="UTF-8") as f:
+            for line in f:
+                # 中断时未写完的最后一行，以及不带合约和时间信息的旧格式记录不计入
+                fields: List[str] = line[:-1].split("\t")
+                if not line.endswith("\n") or len(fields) != 5:
+                    continue
+
+                vt_symbol, interval, file_url, start, end = fields
+                span: Optional[Tuple[datetime, datetime]] = None
+                if start:
+                    span = (datetime.fromisoformat(start), datetime.fromisoformat(end))
+                self.entries[(vt_symbol, interval)][file_url] = span
+
+    def add(self, task: BackfillTask) -> None:
+        """记录完成的文件，没有K线的文件不记录时间"""
+        start: str = ""
+        end: str = ""
+        span: Optional[Tuple[datetime, datetime]] = None
+
+        if task.series:
+            dts: list = task.series.datetime_array[[0, -1]].view("datetime64[ns]").astype("datetime64[us]").tolist()
+            span = (dts[0], dts[1])
+            start, end = dts[0].isoformat(), dts[1].isoformat()
+
+        vt_symbol: str = f"{task.symbol}.{task.exchange.value}"
+        self.entries[(vt_symbol, task.interval.value)][task.download.file_url] = span
+
+        with open(self.path, "a", encoding="UTF-8") as f:
+            f.write("\t".join([vt_symbol, task.interval.value, task.download.file_url, start, end]) + "\n")
+
+    def get_completed(
+            self,
+            vt_symbol: str,
+            interval: Interval,
+            covered: List[Tuple[datetime, datetime]]
+    ) -> Set[str]:
+        """返回数据仍在数据库连续区间内的已完成文件"""
+        completed: Set[str] = set()
+        for file_url, span in self.entries[(vt_symbol, interval.value)].items():
+            if not span or all(any(s <= dt <= e for s, e in covered) for dt in span):
+                completed.add(file_url)
+        return completed
+
+
+class BackfillJob:
+    """
+    Binance K线批量回补任务，合约列表×周期列表×日期范围。
+    下载、解析、写入数据库三个阶段流水线执行，阶段之间使用有界队列，
+    下游较慢时上游阻塞等待，内存中最多保留queue_size个待处理文件。
+    """
+
+    def __init__(
+            self,
+            database: BaseDatabase,
+            vt_symbols: List[str],
+            intervals: List[Interval],
+            start: datetime,
+            end: datetime,
+            output: Callable = print,
+            trading_type: str = "um",
+            folder: str = None,
+            download_workers: int = 8,
+            parse_workers: int = 2,
+            queue_size: int = 4,
+            report_interval: float = 10,
+            checkpoint_name: str = "backfill_checkpoint.txt"
+    ) -> None:
+        """"""
+        self.database: BaseDatabase = database
+        self.vt_symbols: List[str] = vt_symbols
+        self.intervals: List[Interval] = intervals
+        self.start: datetime = start
+        self.end: datetime = end
+        self.output: Callable = output
+        self.trading_type: str = trading_type
+        self.download_workers: int = download_workers
+        self.parse_workers: int = parse_workers
+        self.report_interval: float = report_interval
+
+        # 默认与数据服务使用同一目录，复用已下载的文件
+        if not folder:
+            folder = os.path.dirname(os.path.abspath(binance_datafeed.__file__))
+        self.folder: str = folder
+
+        self.downloader: Downloader = Downloader(max_workers=download_workers)
+        self.checkpoint: BackfillCheckpoint = BackfillCheckpoint(checkpoint_name)
+        self.completed: Set[str] = set()  # 本次运行跳过的已完成文件
+
+        self.parse_queue: Queue = Queue(maxsize=queue_size)
+        self.write_queue: Queue = Queue(maxsize=queue_size)
+
+        self.download_stats: StageStats = StageStats("下载", "字节")
+        self.parse_stats: StageStats = StageStats("解析", "条")
+        self.write_stats: StageStats = StageStats("写入", "条")
+
+        self.active: bool = False
+        self.start_time: float = 0
+        self.parse_running: int = 0
+        self.lock: Lock = Lock()
+
+    def plan(self) -> List[BackfillTask]:
+        """生成全部文件任务，跳过数据库已覆盖和已完成的文件"""
+        tasks: List[BackfillTask] = []
+        for vt_symbol in self.vt_symbols:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+
+            for interval in self.intervals:
+                # csv时间为不带时区的UTC时间，按原值比较
+                covered: List[Tuple[datetime, datetime]] = self.database.get_bar_coverage(symbol, exchange, interval)
+                self.completed |= self.checkpoint.get_completed(vt_symbol, interval, covered)
+
+                plan: List[Tuple[str, str]] = plan_kline_files(
+                    interval_converter[interval.value][0],
+                    self.start.date(),
+                    self.end.date(),
+                    covered
+                )
+
+                for time_period, period in plan:
+                    task: BackfillTask = self.make_task(symbol, exchange, interval, time_period, period)
+                    if task.download.file_url not in self.completed:
+                        tasks.append(task)
+
+        return tasks
+
+    def make_task(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            time_period: str,
+            period: str
+    ) -> BackfillTask:
+        """"""
+        download: DownloadTask = make_kline_task(
+            self.trading_type,
+            symbol,
+            interval_converter[interval.value][0],
+            time_period,
+            period,
+            self.folder
+        )
+        return BackfillTask(symbol, exchange, interval, time_period, period, download)
+
+    def run(self) -> None:
+        """运行回补任务，阻塞直到全部完成或停止"""
+        self.active = True
+        self.start_time = perf_counter()
+        self.parse_running = self.parse_workers
+
+        tasks: List[BackfillTask] = self.plan()
+        self.output(f"回补任务开始，共{len(tasks)}个文件")
+
+        threads: List[Thread] = [Thread(target=self.run_download, args=(tasks,), daemon=True)]
+        threads.extend(Thread(target=self.run_parse, daemon=True) for _ in range(self.parse_workers))
+        write_thread: Thread = Thread(target=self.run_write, daemon=True)
+        threads.append(write_thread)
+
+        for thread in threads:
+            thread.start()
+
+        # 写入线程最后退出，等待期间定时输出各阶段吞吐
+        try:
+            while write_thread.is_alive():
+                write_thread.join(self.report_interval)
+                if write_thread.is_alive():
+                    self.output(self.get_stats_text())
+        finally:
+            self.active = False
+            self.downloader.close()
+
+        self.output(f"回补任务结束\n{self.get_stats_text()}")
+
+    def stop(self) -> None:
+        """停止任务，已下载的文件写入数据库后退出"""
+        self.active = False
+
+    def run_download(self, tasks: List[BackfillTask]) -> None:
+        """下载阶段，完成后通知每个解析线程退出"""
+        try:
+            with ThreadPoolExecutor(self.download_workers) as executor:
+                list(executor.map(self.download_task, tasks))
+        finally:
+            for _ in range(self.parse_workers):
+                self.parse_queue.put(None)
+
+    def download_task(self, task: BackfillTask) -> None:
+        """下载单个文件，月度文件不存在时改为下载当月的日度文件"""
+        if not self.active:
+            return
+
+        start: float = perf_counter()
+        self.downloader.download_file(task.download)
+        cost: float = perf_counter() - start
+        status: str = task.download.status
+
+        if status in (STATUS_DOWNLOADED, STATUS_EXISTS):
+            self.download_stats.add(os.path.getsize(task.download.save_path), cost)
+            self.parse_queue.put(task)
+            return
+
+        # 日度文件不存在时跳过，例如合约上市之前的日期
+        if status != STATUS_MISSING:
+            self.download_stats.add_failed(cost)
+            return
+
+        interval: str = interval_converter[task.interval.value][0]
+        if task.time_period != "monthly" or interval not in DAILY_INTERVALS:
+            return
+
+        for time_period, period in get_fallback_plan(task.period, self.start.date(), self.end.date()):
+            fallback: BackfillTask = self.make_task(task.symbol, task.exchange, task.interval, time_period, period)
+            if fallback.download.file_url not in self.completed:
+                self.download_task(fallback)
+
+    def run_parse(self) -> None:
+        """解析阶段，最后退出的解析线程通知写入线程退出"""
+        try:
+            while True:
+                task: Optional[BackfillTask] = self.parse_queue.get()
+                if task is None:
+                    break
+
+                start: float = perf_counter()
+                try:
+                    task.series = load_kline_series(
+                        [task.download.save_path],
+                        task.symbol,
+                        task.exchange,
+                        task.interval
+                    )
+                except Exception as e:
+                    self.parse_stats.add_failed(perf_counter() - start)
+                    self.output(f"{task.download.file_url}解析失败：{e}")
+
+                    # 删除损坏的文件，重新运行时再次下载
+                    if not is_valid_zip(task.download.save_path):
+                        os.remove(task.download.save_path)
+                    continue
+
+                self.parse_stats.add(len(task.series) if task.series else 0, perf_counter() - start)
+                self.write_queue.put(task)
+        finally:
+            with self.lock:
+                self.parse_running -= 1
+                finished: bool = not self.parse_running
+
+            if finished:
+                self.write_queue.put(None)
+
+    def run_write(self) -> None:
+        """写入阶段，数据库写入由单个线程按顺序执行"""
+        while True:
+            task: Optional[BackfillTask] = self.write_queue.get()
+            if task is None:
+                break
+
+            start: float = perf_counter()
+            try:
+                if task.series:
+                    self.database.save_bar_series(task.series, quiet=True)
+            except Exception as e:
+                self.write_stats.add_failed(perf_counter() - start)
+                self.output(f"{task.download.file_url}写入数据库失败：{e}")
+                continue
+
+            self.write_stats.add(len(task.series) if task.series else 0, perf_counter() - start)
+            self.checkpoint.add(task)
+            task.series = None
+
+    def get_stats_text(self) -> str:
+        """各阶段吞吐统计"""
+        elapsed: float = perf_counter() - self.start_time
+        texts: List[str] = [f"已运行{elapsed:.0f}秒"]
+        for stats in [self.download_stats, self.parse_stats, self.write_stats]:
+            texts.append(stats.get_text(elapsed))
+        return "\n".join(texts)
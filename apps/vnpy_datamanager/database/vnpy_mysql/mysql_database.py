@@ -1,5 +1,7 @@
 from datetime import datetime
-from typing import List
+from math import ceil
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+import numpy as np
 from tqdm import tqdm
 from peewee import (
     AutoField,
@@ -11,20 +13,28 @@ from peewee import (
     ModelSelect,
     ModelDelete,
     chunked,
-    fn, DoubleField
+    fn, DoubleField, SQL
 )
 
 from core.trader.constant import Exchange, Interval
 from core.trader.object import BarData, TickData
+from core.trader.utility import BarSeries
 from core.trader.database import (
     BaseDatabase,
     BarOverview,
     TickOverview,
     DB_TZ,
-    convert_tz
+    INTERVAL_DELTA_MAP,
+    convert_tz,
+    get_bar_segments,
+    merge_bar_segments,
+    get_bar_gaps
 )
 from core.trader.setting import SETTINGS
 
+# 列式加载时每次从游标读取的行数
+LOAD_CHUNK_SIZE = 100_000
+
 # 创建peewee连接mysql对象
 db: PeeweeMySQLDatabase = PeeweeMySQLDatabase(
     database=SETTINGS["database.database"],
@@ -66,6 +76,23 @@ class DbBarData(Model):
         indexes: tuple = ((("symbol", "exchange", "interval", "datetime"), True),)
 
 
+# 批量写入K线时的字段顺序，以及主键冲突时需要更新的字段
+BAR_FIELDS: list = [
+    DbBarData.symbol,
+    DbBarData.exchange,
+    DbBarData.datetime,
+    DbBarData.interval,
+    DbBarData.volume,
+    DbBarData.turnover,
+    DbBarData.open_interest,
+    DbBarData.open_price,
+    DbBarData.high_price,
+    DbBarData.low_price,
+    DbBarData.close_price
+]
+BAR_UPDATE_FIELDS: list = BAR_FIELDS[4:]
+
+
 class DbTickData(Model):
     """TICK数据表模型类"""
 
@@ -137,6 +164,32 @@ class DbBarOverview(Model):
         indexes: tuple = ((("symbol", "exchange", "interval"), True),)
 
 
+class DbBarCoverage(Model):
+    """K线连续区间表模型类，每行为一段没有缺失的K线时间范围"""
+
+    id: AutoField = AutoField()
+
+    symbol: str = CharField()
+    exchange: str = CharField()
+    interval: str = CharField()
+    start: datetime = DateTimeField()
+    end: datetime = DateTimeField()
+
+    class Meta:
+        database: PeeweeMySQLDatabase = db
+        indexes: tuple = ((("symbol", "exchange", "interval", "start"), True),)
+
+
+# 批量写入连续区间时的字段顺序
+COVERAGE_FIELDS: list = [
+    DbBarCoverage.symbol,
+    DbBarCoverage.exchange,
+    DbBarCoverage.interval,
+    DbBarCoverage.start,
+    DbBarCoverage.end
+]
+
+
 class DbTickOverview(Model):
     """Tick汇总数据模型类"""
 
@@ -160,35 +213,117 @@ class MysqlDatabase(BaseDatabase):
         """"""
         self.db: PeeweeMySQLDatabase = db  # peewee对象
         self.db.connect()  # 连接
-        self.db.create_tables([DbBarData, DbTickData, DbBarOverview, DbTickOverview])  # 模型类->创建表
+        self.db.create_tables([DbBarData, DbTickData, DbBarOverview, DbTickOverview, DbBarCoverage])  # 模型类->创建表
 
     def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
         """保存K线数据"""
+        if not bars:
+            return False
+
         # 读取主键参数
         bar: BarData = bars[0]
         symbol: str = bar.symbol
         exchange: Exchange = bar.exchange
         interval: Interval = bar.interval
 
-        # 将BarData数据转换为字典，并调整时区
-        data: list = []
+        start: datetime = convert_tz(bars[0].datetime)
+        end: datetime = convert_tz(bars[-1].datetime)
+
+        # 将BarData数据转换为元组，并调整时区，不修改传入的K线对象
+        data: List[tuple] = [
+            (
+                symbol,
+                exchange.value,
+                convert_tz(bar.datetime),
+                interval.value,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest,
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price
+            )
+            for bar in bars
+        ]
 
-        for bar in bars:
-            bar.datetime = convert_tz(bar.datetime)
+        return self.save_bar_rows(symbol, exchange, interval, start, end, data, stream)
 
-            d: dict = bar.__dict__
-            d["exchange"] = d["exchange"].value
-            d["interval"] = d["interval"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            data.append(d)
+    def save_bar_series(self, series: BarSeries, stream: bool = False, quiet: bool = False) -> bool:
+        """保存列式K线序列，直接由数组生成写入数据，quiet为True时不输出写入进度"""
+        if not len(series):
+            return False
+
+        # 不带时区的时间视为数据库时区的时间，不再逐条转换
+        if series.tzinfo is None or series.tzinfo == DB_TZ:
+            dts: list = series.datetime_array.view("datetime64[ns]").astype("datetime64[us]").tolist()
+        else:
+            dts: list = [convert_tz(bar.datetime) for bar in series]
+
+        count: int = len(dts)
+        data: List[tuple] = list(zip(
+            [series.symbol] * count,
+            [series.exchange.value] * count,
+            dts,
+            [series.interval.value] * count,
+            series.volume_array.tolist(),
+            series.turnover_array.tolist(),
+            series.open_interest_array.tolist(),
+            series.open_array.tolist(),
+            series.high_array.tolist(),
+            series.low_array.tolist(),
+            series.close_array.tolist()
+        ))
+
+        return self.save_bar_rows(series.symbol, series.exchange, series.interval, dts[0], dts[-1], data, stream, quiet)
+
+    def save_bar_rows(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            data: List[tuple],
+            stream: bool,
+            quiet: bool = False
+    ) -> bool:
+        """按BAR_FIELDS字段顺序批量写入K线，并更新汇总数据"""
+        # 写入前后统计本次时间范围内的数据量，差值即为新增数量，无需统计全表
+        range_select: ModelSelect = DbBarData.select().where(
+            (DbBarData.symbol == symbol)
+            & (DbBarData.exchange == exchange.value)
+            & (DbBarData.interval == interval.value)
+            & (DbBarData.datetime >= start)
+            & (DbBarData.datetime <= end)
+        )
+
+        # 已有K线但还没有连续区间索引时（索引建立前保存的数据），写入后全量扫描建立
+        rebuild_coverage: bool = self.is_coverage_missing(symbol, exchange, interval)
+
+        # 使用ON DUPLICATE KEY UPDATE批量更新，已有数据原地更新而不是先删除再插入
+        batch_size: int = SETTINGS["database.batch_size"]
 
-        # 使用upsert操作将数据更新到数据库中
         with self.db.atomic():
-            print(f"\n正在更新{bar.symbol}到数据库，数据总量：{len(data)}")
-            for c in tqdm(chunked(data, 50), total=len(data)//50):
-                DbBarData.insert_many(c).on_conflict_replace().execute()
-        print(f"更新完成，数据总量：{len(data)}")
+            if not quiet:
+                print(f"\n正在更新{symbol}到数据库，数据总量：{len(data)}")
+            before: int = range_select.count()
+
+            for c in tqdm(chunked(data, batch_size), total=ceil(len(data) / batch_size), disable=quiet):
+                DbBarData.insert_many(c, fields=BAR_FIELDS).on_conflict(
+                    preserve=BAR_UPDATE_FIELDS
+                ).execute()
+
+            inserted: int = range_select.count() - before
+
+            # 与K线在同一事务中更新连续区间
+            if rebuild_coverage:
+                self.init_bar_coverage(symbol, exchange, interval)
+            else:
+                self.update_bar_coverage(symbol, exchange, interval, sorted(d[2] for d in data))
+        if not quiet:
+            print(f"更新完成，数据总量：{len(data)}")
+
         # 更新K线汇总数据
         overview: DbBarOverview = DbBarOverview.get_or_none(
             DbBarOverview.symbol == symbol,
@@ -201,26 +336,93 @@ class MysqlDatabase(BaseDatabase):
             overview.symbol = symbol
             overview.exchange = exchange.value
             overview.interval = interval.value
-            overview.start = bars[0].datetime
-            overview.end = bars[-1].datetime
-            overview.count = len(bars)
+            overview.start = start
+            overview.end = end
+            overview.count = DbBarData.select().where(
+                (DbBarData.symbol == symbol)
+                & (DbBarData.exchange == exchange.value)
+                & (DbBarData.interval == interval.value)
+            ).count()
         elif stream:
-            overview.end = bars[-1].datetime
-            overview.count += len(bars)
+            overview.end = end
+            overview.count += len(data)
         else:
-            overview.start = min(bars[0].datetime, overview.start)
-            overview.end = max(bars[-1].datetime, overview.end)
+            overview.start = min(start, overview.start)
+            overview.end = max(end, overview.end)
+            overview.count += inserted
+
+        overview.save()
+
+        return True
 
-            s: ModelSelect = DbBarData.select().where(
+    def is_coverage_missing(self, symbol: str, exchange: Exchange, interval: Interval) -> bool:
+        """是否已有K线但没有连续区间索引"""
+        has_coverage: bool = DbBarCoverage.select().where(
+            (DbBarCoverage.symbol == symbol)
+            & (DbBarCoverage.exchange == exchange.value)
+            & (DbBarCoverage.interval == interval.value)
+        ).exists()
+        if has_coverage:
+            return False
+
+        return DbBarData.select().where(
+            (DbBarData.symbol == symbol)
+            & (DbBarData.exchange == exchange.value)
+            & (DbBarData.interval == interval.value)
+        ).exists()
+
+    def update_bar_coverage(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            datetimes: List[datetime]
+    ) -> None:
+        """将新写入K线的区间与相交或相邻的已有区间合并，只读写涉及的区间"""
+        segments: List[Tuple[datetime, datetime]] = get_bar_segments(datetimes, interval)
+        if not segments:
+            return
+
+        delta = INTERVAL_DELTA_MAP[interval]
+        existing: List[tuple] = list(
+            DbBarCoverage.select(DbBarCoverage.id, DbBarCoverage.start, DbBarCoverage.end).where(
+                (DbBarCoverage.symbol == symbol)
+                & (DbBarCoverage.exchange == exchange.value)
+                & (DbBarCoverage.interval == interval.value)
+                & (DbBarCoverage.end >= segments[0][0] - delta)
+                & (DbBarCoverage.start <= segments[-1][1] + delta)
+            ).tuples()
+        )
+
+        segments = merge_bar_segments(segments + [(start, end) for _, start, end in existing], interval)
+
+        if existing:
+            DbBarCoverage.delete().where(DbBarCoverage.id.in_([i for i, _, _ in existing])).execute()
+
+        rows: List[tuple] = [(symbol, exchange.value, interval.value, start, end) for start, end in segments]
+        DbBarCoverage.insert_many(rows, fields=COVERAGE_FIELDS).execute()
+
+    def init_bar_coverage(self, symbol: str, exchange: Exchange, interval: Interval) -> None:
+        """扫描全部K线时间重建连续区间"""
+        s: ModelSelect = (
+            DbBarData.select(DbBarData.datetime).where(
                 (DbBarData.symbol == symbol)
                 & (DbBarData.exchange == exchange.value)
                 & (DbBarData.interval == interval.value)
-            )
-            overview.count = s.count()
+            ).order_by(DbBarData.datetime).tuples()
+        )
+        segments: List[Tuple[datetime, datetime]] = get_bar_segments((row[0] for row in s.iterator()), interval)
 
-        overview.save()
+        with self.db.atomic():
+            DbBarCoverage.delete().where(
+                (DbBarCoverage.symbol == symbol)
+                & (DbBarCoverage.exchange == exchange.value)
+                & (DbBarCoverage.interval == interval.value)
+            ).execute()
 
-        return True
+            rows: List[tuple] = [(symbol, exchange.value, interval.value, start, end) for start, end in segments]
+            for c in chunked(rows, SETTINGS["database.batch_size"]):
+                DbBarCoverage.insert_many(c, fields=COVERAGE_FIELDS).execute()
 
     def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
         """保存TICK数据"""
@@ -285,9 +487,117 @@ class MysqlDatabase(BaseDatabase):
             end: datetime
     ) -> List[BarData]:
         """加载K线数据"""
-        # print('正在通过mysql_database正在读取K线数据...')
+        s: ModelSelect = self.select_bar_data(symbol, exchange, interval, start, end)
+        return list(self.to_bar_data(symbol, exchange, interval, s.iterator()))
+
+    def iter_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            chunk_size: int = 10000
+    ) -> Iterator[BarData]:
+        """按时间分页逐块加载K线"""
+        # 基于(symbol, exchange, interval, datetime)索引的键集分页，每页从上一页的最后时间之后继续
+        s: ModelSelect = self.select_bar_data(symbol, exchange, interval, start, end)
+
+        while True:
+            rows: list = list(s.limit(chunk_size))
+            yield from self.to_bar_data(symbol, exchange, interval, rows)
+
+            if len(rows) < chunk_size:
+                break
+
+            s = self.select_bar_data(symbol, exchange, interval, start, end, rows[-1][0])
+
+    def select_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            after: datetime = None
+    ) -> ModelSelect:
+        """生成K线查询，只查询需要的字段并返回元组，避免逐行创建模型对象"""
+        condition = (
+            (DbBarData.symbol == symbol)
+            & (DbBarData.exchange == exchange.value)
+            & (DbBarData.interval == interval.value)
+            & (DbBarData.datetime >= start)
+            & (DbBarData.datetime <= end)
+        )
+        if after:
+            condition &= (DbBarData.datetime > after)
+
+        s: ModelSelect = (
+            DbBarData.select(
+                DbBarData.datetime,
+                DbBarData.open_price,
+                DbBarData.high_price,
+                DbBarData.low_price,
+                DbBarData.close_price,
+                DbBarData.volume,
+                DbBarData.turnover,
+                DbBarData.open_interest
+            ).where(condition).order_by(DbBarData.datetime).tuples()
+        )
+        return s
+
+    def to_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            rows: Iterable[tuple]
+    ) -> Iterator[BarData]:
+        """查询结果元组转换为BarData"""
+        # 数据库中保存的是DB_TZ时区的本地时间，直接附加时区即可
+        for (
+            dt, open_price, high_price, low_price, close_price,
+            volume, turnover, open_interest
+        ) in rows:
+            yield BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt.replace(tzinfo=DB_TZ),
+                interval=interval,
+                volume=volume,
+                turnover=turnover,
+                open_interest=open_interest,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                gateway_name="DB"
+            )
+
+    def load_bar_series(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            series_class: Type[BarSeries] = BarSeries
+    ) -> Optional[BarSeries]:
+        """加载K线数据为列式K线序列，不创建BarData对象"""
+        # 时间在数据库中转换为整数秒，按块读取后直接转为numpy数组
+        seconds = fn.TIMESTAMPDIFF(SQL("SECOND"), "1970-01-01 00:00:00", DbBarData.datetime)
+
         s: ModelSelect = (
-            DbBarData.select().where(
+            DbBarData.select(
+                seconds,
+                DbBarData.open_price,
+                DbBarData.high_price,
+                DbBarData.low_price,
+                DbBarData.close_price,
+                DbBarData.volume,
+                DbBarData.turnover,
+                DbBarData.open_interest
+            ).where(
                 (DbBarData.symbol == symbol)
                 & (DbBarData.exchange == exchange.value)
                 & (DbBarData.interval == interval.value)
@@ -295,26 +605,101 @@ class MysqlDatabase(BaseDatabase):
                 & (DbBarData.datetime <= end)
             ).order_by(DbBarData.datetime)
         )
-        # print(f'读取完成正在转化数据,数据量：{len(s)}')
-        bars: List[BarData] = []
-        for db_bar in s:
-            bar: BarData = BarData(
-                symbol=db_bar.symbol,
-                exchange=Exchange(db_bar.exchange),
-                datetime=datetime.fromtimestamp(db_bar.datetime.timestamp(), DB_TZ),
-                interval=Interval(db_bar.interval),
-                volume=db_bar.volume,
-                turnover=db_bar.turnover,
-                open_interest=db_bar.open_interest,
-                open_price=db_bar.open_price,
-                high_price=db_bar.high_price,
-                low_price=db_bar.low_price,
-                close_price=db_bar.close_price,
-                gateway_name="DB"
-            )
-            bars.append(bar)
 
-        return bars
+        chunks: List[np.ndarray] = []
+        cursor = self.db.execute(s)
+        try:
+            while True:
+                rows: list = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.float64))
+        finally:
+            cursor.close()
+
+        if not chunks:
+            return None
+
+        # 转置后每个字段为连续内存的一维数组
+        columns: np.ndarray = np.concatenate(chunks).T.copy()
+
+        return series_class(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            gateway_name="DB",
+            tzinfo=DB_TZ,
+            datetime_array=columns[0].astype(np.int64) * 1_000_000_000,
+            open_array=columns[1],
+            high_array=columns[2],
+            low_array=columns[3],
+            close_array=columns[4],
+            volume_array=columns[5],
+            turnover_array=columns[6],
+            open_interest_array=columns[7]
+        )
+
+    def get_bar_coverage(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval
+    ) -> List[Tuple[datetime, datetime]]:
+        """查询K线连续区间"""
+        return self.select_bar_coverage(symbol, exchange, interval)
+
+    def find_gaps(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """
+        查询时间范围内缺失的K线，只读取与范围相交的区间，
+        连续区间索引尚未建立时返回None，不在查询时扫描全部K线
+        """
+        if start.tzinfo:
+            start = convert_tz(start)
+        if end.tzinfo:
+            end = convert_tz(end)
+
+        if self.is_coverage_missing(symbol, exchange, interval):
+            return None
+
+        segments: List[Tuple[datetime, datetime]] = self.select_bar_coverage(symbol, exchange, interval, start, end)
+        return get_bar_gaps(segments, interval, start, end)
+
+    def select_bar_coverage(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime = None,
+            end: datetime = None
+    ) -> List[Tuple[datetime, datetime]]:
+        """按时间顺序查询连续区间，没有索引时先由已有K线建立"""
+        if self.is_coverage_missing(symbol, exchange, interval):
+            self.init_bar_coverage(symbol, exchange, interval)
+
+        condition = (
+            (DbBarCoverage.symbol == symbol)
+            & (DbBarCoverage.exchange == exchange.value)
+            & (DbBarCoverage.interval == interval.value)
+        )
+        if start:
+            condition &= (DbBarCoverage.end >= start)
+        if end:
+            condition &= (DbBarCoverage.start <= end)
+
+        s: ModelSelect = (
+            DbBarCoverage.select(DbBarCoverage.start, DbBarCoverage.end)
+            .where(condition)
+            .order_by(DbBarCoverage.start)
+            .tuples()
+        )
+        return list(s)
 
     def load_tick_data(
             self,
@@ -399,6 +784,14 @@ class MysqlDatabase(BaseDatabase):
             & (DbBarOverview.interval == interval.value)
         )
         d2.execute()
+
+        # 删除K线连续区间
+        d3: ModelDelete = DbBarCoverage.delete().where(
+            (DbBarCoverage.symbol == symbol)
+            & (DbBarCoverage.exchange == exchange.value)
+            & (DbBarCoverage.interval == interval.value)
+        )
+        d3.execute()
         return count
 
     def delete_tick_data(
@@ -1,43 +1,104 @@
-import csv
+import io
 import zipfile
 import os
-from datetime import datetime, timedelta
-from typing import List, Optional, Callable
-from numpy import ndarray
+from datetime import datetime
+from typing import List, Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
 
 from apps.vnpy_datamanager import ManagerEngine
 from core.trader.setting import SETTINGS
 from core.trader.constant import Exchange, Interval
 from core.trader.object import BarData, TickData, HistoryRequest
-from core.trader.utility import ZoneInfo
+from core.trader.utility import BarSeries
 from core.trader.datafeed import BaseDatafeed
-from sdk.binance_sdk.binance.download.download_kline import download_daily_klines
-
-
-def parse_file_name(file_name):
-    """以日期时间排序key"""
-    # 获取日期部分，并解析为日期时间对象
-    split_list = file_name.split(".")[0].split("-")
-    dt_str = split_list[2] + '-' + split_list[3] + '-' + split_list[4]
-    dt = datetime.strptime(dt_str, "%Y-%m-%d")
-    return dt
-
-
-def csv_time_converter(sum_second):
-    """
-    转换币安下载历史数据的csv时间
-    :param sum_second: 从 1970 年 1 月 1 日开始的毫秒数
-    :return: datetime
-    """
-    # 计算对应的秒数
-    seconds_since_1970 = int(sum_second) // 1000
-    # 创建一个表示 1970 年 1 月 1 日的 datetime 对象
-    year_1970 = datetime(1970, 1, 1)
-    # 计算 1970 年 1 月 1 日开始的时间差
-    time_difference = timedelta(seconds=seconds_since_1970)
-    # 计算对应的日期
-    target_date = year_1970 + time_difference
-    return target_date
+from sdk.binance_sdk.binance.download.download_kline import download_klines
+from sdk.binance_sdk.binance.download.utility import interval_converter
+from sdk.binance_sdk.binance.download.downloader import Downloader
+
+
+# binance K线csv中读取的列：开盘时间、开高低收、成交量、成交额
+KLINE_COLUMNS: List[int] = [0, 1, 2, 3, 4, 5, 7]
+
+
+def is_valid_zip(file_path: str) -> bool:
+    """检查zip文件是否完整"""
+    try:
+        with zipfile.ZipFile(file_path) as zip_ref:
+            return zip_ref.testzip() is None
+    except zipfile.BadZipFile:
+        return False
+
+
+def read_kline_zip(file_path: str) -> List[bytes]:
+    """直接从zip中读取binance K线csv内容，不解压到磁盘，去除表头和空字符"""
+    buffers: List[bytes] = []
+
+    with zipfile.ZipFile(file_path) as zip_ref:
+        for name in zip_ref.namelist():
+            if not name.endswith(".csv"):
+                continue
+
+            buf: bytes = zip_ref.read(name)
+            if b"\0" in buf:
+                buf = buf.replace(b"\0", b"")
+
+            # 部分文件带有表头
+            if buf[:1] and not buf[:1].isdigit():
+                buf = buf[buf.find(b"\n") + 1:]
+
+            if buf.strip():
+                buffers.append(buf if buf.endswith(b"\n") else buf + b"\n")
+
+    return buffers
+
+
+def load_kline_series(
+        files: List[str],
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+) -> Optional[BarSeries]:
+    """读取多个K线zip文件为列式K线序列，时间为不带时区的UTC时间"""
+    buffers: List[bytes] = []
+    for file_path in files:
+        buffers.extend(read_kline_zip(file_path))
+
+    if not buffers:
+        return None
+
+    # 所有文件合并后一次解析，固定列类型
+    df: pd.DataFrame = pd.read_csv(
+        io.BytesIO(b"".join(buffers)),
+        header=None,
+        usecols=KLINE_COLUMNS,
+        dtype={i: (np.int64 if i == 0 else np.float64) for i in KLINE_COLUMNS},
+        engine="c"
+    )
+
+    # 开盘时间为毫秒数，2025年起现货数据为微秒数，统一转为纳秒
+    open_time: np.ndarray = df[0].to_numpy()
+    open_time = np.where(open_time >= 10 ** 15, open_time * 1_000, open_time * 1_000_000)
+
+    # 按时间排序并去除重复K线
+    datetime_array, index = np.unique(open_time, return_index=True)
+
+    return BarSeries(
+        symbol=symbol,
+        exchange=exchange,
+        interval=interval,
+        gateway_name="DB",
+        tzinfo=None,
+        datetime_array=datetime_array,
+        open_array=df[1].to_numpy()[index],
+        high_array=df[2].to_numpy()[index],
+        low_array=df[3].to_numpy()[index],
+        close_array=df[4].to_numpy()[index],
+        volume_array=df[5].to_numpy()[index],
+        turnover_array=df[7].to_numpy()[index],
+        open_interest_array=np.zeros(len(index))
+    )
 
 
 def req_converter(req):
@@ -75,7 +136,10 @@ class BinanceDatafeed(BaseDatafeed):
         self.password: str = SETTINGS["datafeed.password"]
 
         self.inited: bool = False
-        self.symbols: ndarray = None
+        self.symbols: np.ndarray = None
+
+        # 并发下载器，多次查询之间复用连接池
+        self.downloader: Downloader = Downloader()
 
     def init(self, output: Callable = print) -> bool:
         """初始化"""
@@ -84,174 +148,58 @@ class BinanceDatafeed(BaseDatafeed):
     def query_bar_history(self, req: HistoryRequest, output: Callable = print) -> Optional[
         List[BarData]]:
         """查询K线数据"""
+        series: Optional[BarSeries] = self.query_bar_series(req, output)
+        if not series:
+            return []
+        return series.to_bars()
+
+    def query_bar_series(self, req: HistoryRequest, output: Callable = print) -> Optional[BarSeries]:
+        """查询K线数据为列式K线序列"""
         converted_req = req_converter(req)
         save_path = os.path.dirname(os.path.abspath(__file__))
-        # binanceSDK下载历史行情
-        download_path = download_daily_klines(
+        interval: str = interval_converter[req.interval.value][0]
+
+        # binanceSDK下载历史行情，完整月份下载月度文件，只下载数据库中缺失的部分
+        files: Optional[List[str]] = download_klines(
             trading_type=converted_req.trading_type,
-            symbols=converted_req.symbols,
-            intervals=converted_req.intervals,
-            start_date=converted_req.start_date,
-            end_date=converted_req.end_date,
+            symbol=req.symbol,
+            interval=interval,
+            start_date=req.start.date(),
+            end_date=req.end.date(),
             folder=save_path,
+            covered=self.get_bar_coverage(req.symbol, req.exchange, req.interval),
+            downloader=self.downloader
         )
 
-        if download_path is None:
+        if files is None:
             output('网络可能出现异常!')
-            return []
-
-        # 批量解压zip成csv
-        csv_path = self.unzip_to_csv(download_path, req, output)
-        # 批量加载csv
-        data: List[BarData] = self.import_data_from_csv(
-            folder_path=csv_path,
-            symbol=req.symbol,
-            exchange=req.exchange,
-            interval=req.interval,
-            tz_name=SETTINGS['timezone'],
-            datetime_head='open_time',
-            open_head='open',
-            high_head='high',
-            low_head='low',
-            close_head='close',
-            volume_head='volume',
-            turnover_head='quote_volume',
-            open_interest_head='open_interest',
-            datetime_format='%Y-%m-%d %H:%M:%S'
-        )
-        return data
+            return None
+
+        # 直接从zip读取数据
+        print("正在读取历史数据.")
+        try:
+            return load_kline_series(files, req.symbol, req.exchange, req.interval)
+        except zipfile.BadZipFile as e:
+            print(e)
+            output('文件已损坏，读取文件失败！.')
+
+        # 删除损坏的文件后重新下载
+        removed: bool = False
+        for file_path in files:
+            if not is_valid_zip(file_path):
+                os.remove(file_path)
+                removed = True
+                print(f"{os.path.basename(file_path)} 删除成功, 正在尝试重新下载")
+
+        if not removed:
+            return None
+        return self.query_bar_series(req, output)  # 重新调用下载
+
+    def get_bar_coverage(self, symbol: str, exchange: Exchange, interval: Interval) -> List[Tuple[datetime, datetime]]:
+        """查询数据库中已有数据的连续区间，csv时间为不带时区的UTC时间，按原值比较"""
+        dataManager: ManagerEngine = self.mainEngine.get_engine("DataManager")  # 获取DataManager对象
+        return dataManager.database.get_bar_coverage(symbol, exchange, interval)
 
     def query_tick_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[TickData]]:
         """查询Tick数据"""
         pass
-
-    def import_data_from_csv(
-            self,
-            folder_path: str,
-            symbol: str,
-            exchange: Exchange,
-            interval: Interval,
-            tz_name: str,
-            datetime_head: str,
-            open_head: str,
-            high_head: str,
-            low_head: str,
-            close_head: str,
-            volume_head: str,
-            turnover_head: str,
-            open_interest_head: str,
-            datetime_format: str
-    ) -> List[BarData]:
-        """csv文件导入数据"""
-        # 定义表头
-        header = 'open_time,open,high,low,close,volume,close_time,quote_volume,count,taker_buy_volume,taker_buy_quote_volume,ignore\n'
-        print(f"正在读取csv.")
-
-        files = os.listdir(folder_path)  # 获取csv的文件夹中的所有文件
-        sorted_files = sorted(files, key=parse_file_name)  # 文件列表并降序
-
-        dataManager: ManagerEngine = self.mainEngine.get_engine("DataManager")  # 获取DataManager对象
-        overviews = dataManager.get_bar_overview()
-
-        existOverview = False
-        filter_files = []
-        if overviews:
-            for overview in overviews:
-                # 将‘d’转'1d'
-                if interval.value == 'd':
-                    goalInterval = '1' + interval.value
-                else:
-                    goalInterval = interval.value
-
-                # 数据库存在该数据作过滤处理
-                if overview.symbol == symbol and overview.interval.value == goalInterval:
-                    existOverview = True
-                    start_overview = overview.start
-                    end_overview = overview.end
-
-                    for file in sorted_files:
-                        dt = parse_file_name(file)
-                        if dt < start_overview or dt > end_overview:
-                            filter_files.append(file)
-
-                    sorted_files = filter_files
-
-                    break
-
-        data: List[BarData] = []
-        # 循环处理每个文件
-        for file in sorted_files:
-            file_path = os.path.join(folder_path, file)
-
-            if file.endswith('.csv'):  # 只处理后缀名为 .csv 的文件
-                with open(file_path, "rt") as f:
-                    buf: list = [line.replace("\0", "") for line in f]
-
-                if header != buf[0]:  # 无表头动态添加
-                    buf.insert(0, header)
-
-                reader: csv.DictReader = csv.DictReader(buf, delimiter=",")
-
-                start: datetime = None
-                count: int = 0
-                tz = ZoneInfo(tz_name)
-
-                for item in reader:
-                    dt = csv_time_converter(item[datetime_head])  # datetime转换
-
-                    turnover = item.get(turnover_head, 0)
-                    open_interest = item.get(open_interest_head, 0)
-
-                    bar: BarData = BarData(
-                        symbol=symbol,
-                        exchange=exchange,
-                        datetime=dt,
-                        interval=interval,
-                        volume=float(item[volume_head]),
-                        open_price=float(item[open_head]),
-                        high_price=float(item[high_head]),
-                        low_price=float(item[low_head]),
-                        close_price=float(item[close_head]),
-                        turnover=float(turnover),
-                        open_interest=float(open_interest),
-                        gateway_name="DB",
-                    )
-
-                    data.append(bar)
-
-                    # do some statistics
-                    count += 1
-                    # if not start:
-                    #     start = bar.datetime
-
-        # end: datetime = bar.datetime
-        return data
-
-    def unzip_to_csv(self, path, req, output):
-        """解压binanceK线zip"""
-        # 指定待解压的文件夹路径
-        folder_path = path
-
-        # 获取文件夹中的所有文件
-        files = os.listdir(folder_path)
-
-        # 循环处理每个文件
-        print("正在解压历史数据.")
-        for file in files:
-
-            file_path = os.path.join(folder_path, file)
-            if file.endswith('.zip'):  # 只处理后缀名为 .zip 的文件
-                try:
-                    with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                        csv_path = folder_path + 'csv'
-                        zip_ref.extractall(csv_path)  # 解压到csv目录下
-                except Exception as e:
-                    print(e)
-                    output(f' {file}已损坏，解压文件失败！.')
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        print(f"{file} 删除成功, 正在尝试重新下载")
-                        self.query_bar_history(req, output)  # 重新调用下载
-                    else:
-                        print(f"{file} 不存在")
-        return csv_path
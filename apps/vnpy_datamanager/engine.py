@@ -1,13 +1,17 @@
 import csv
 from datetime import datetime
-from typing import List, Optional, Callable
+from threading import Thread
+from typing import List, Optional, Callable, TYPE_CHECKING
 
 from core.trader.engine import BaseEngine, MainEngine, EventEngine
 from core.trader.constant import Interval, Exchange
 from core.trader.object import BarData, TickData, ContractData, HistoryRequest
 from core.trader.database import BaseDatabase, get_database, BarOverview, DB_TZ
 from core.trader.datafeed import BaseDatafeed, get_datafeed
-from core.trader.utility import ZoneInfo
+from core.trader.utility import ZoneInfo, BarSeries
+
+if TYPE_CHECKING:
+    from .backfill import BackfillJob
 
 APP_NAME = "DataManager"
 
@@ -26,6 +30,9 @@ class ManagerEngine(BaseEngine):
         self.database: BaseDatabase = get_database()  # 获取数据库对象
         self.datafeed: BaseDatafeed = get_datafeed(main_engine)  # 获取数据服务对象
 
+        self.backfill_job: Optional["BackfillJob"] = None
+        self.backfill_thread: Optional[Thread] = None
+
     def import_data_from_csv(
             self,
             file_path: str,
@@ -208,9 +215,14 @@ class ManagerEngine(BaseEngine):
             data: List[BarData] = self.main_engine.query_history(
                 req, contract.gateway_name
             )
-        # Otherwise use datafeed to query data 数据服务获取
+        # Otherwise use datafeed to query data as columnar series 数据服务获取列式K线序列
         else:
-            data: List[BarData] = self.datafeed.query_bar_history(req, output)
+            series: Optional[BarSeries] = self.datafeed.query_bar_series(req, output)
+
+            if series:
+                self.database.save_bar_series(series)
+                return len(series)
+            return 0
 
         if data:
             self.database.save_bar_data(data)
@@ -218,6 +230,35 @@ class ManagerEngine(BaseEngine):
 
         return 0
 
+    def start_backfill(
+            self,
+            vt_symbols: List[str],
+            intervals: List[Interval],
+            start: datetime,
+            end: datetime,
+            output: Callable = print,
+            **kwargs
+    ) -> bool:
+        """
+        Start batch backfill job in background thread. 后台批量回补K线
+        """
+        if self.backfill_thread and self.backfill_thread.is_alive():
+            output("已有回补任务正在运行")
+            return False
+
+        # 数据服务模块导入了本应用，运行时再导入避免循环引用
+        from .backfill import BackfillJob
+
+        self.backfill_job = BackfillJob(self.database, vt_symbols, intervals, start, end, output, **kwargs)
+        self.backfill_thread = Thread(target=self.backfill_job.run, daemon=True)
+        self.backfill_thread.start()
+        return True
+
+    def stop_backfill(self) -> None:
+        """停止回补任务，已下载的文件写入数据库后退出"""
+        if self.backfill_job:
+            self.backfill_job.stop()
+
     def download_tick_data(
             self,
             symbol: str,
@@ -7,6 +7,7 @@ from collections import defaultdict
 from copy import copy
 from pathlib import Path
 from datetime import datetime, timedelta
+from threading import RLock
 
 from core.event import EventEngine, Event
 from core.trader.engine import BaseEngine, MainEngine
@@ -47,6 +48,10 @@ class SpreadEngine(BaseEngine):
 
         self.active: bool = False
 
+        # Market data and trading events may be processed on different
+        # event engine lanes, serialize handlers of all sub engines.
+        self.event_lock: RLock = RLock()
+
         self.data_engine: SpreadDataEngine = SpreadDataEngine(self)
         self.algo_engine: SpreadAlgoEngine = SpreadAlgoEngine(self)
         self.strategy_engine: SpreadStrategyEngine = SpreadStrategyEngine(self)
@@ -188,61 +193,65 @@ class SpreadDataEngine:
 
     def process_tick_event(self, event: Event) -> None:
         """"""
-        tick: TickData = event.data
+        with self.spread_engine.event_lock:
+            tick: TickData = event.data
 
-        leg: LegData = self.legs.get(tick.vt_symbol, None)
-        if not leg:
-            return
-        leg.update_tick(tick)
+            leg: LegData = self.legs.get(tick.vt_symbol, None)
+            if not leg:
+                return
+            leg.update_tick(tick)
 
-        for spread in self.symbol_spread_map[tick.vt_symbol]:
-            # 只有能成功计算出价差盘口时，才会送事件
-            if spread.calculate_price():
-                self.put_data_event(spread)
+            for spread in self.symbol_spread_map[tick.vt_symbol]:
+                # 只有能成功计算出价差盘口时，才会送事件
+                if spread.calculate_price():
+                    self.put_data_event(spread)
 
     def process_position_event(self, event: Event) -> None:
         """"""
-        position: PositionData = event.data
+        with self.spread_engine.event_lock:
+            position: PositionData = event.data
 
-        leg: LegData = self.legs.get(position.vt_symbol, None)
-        if not leg:
-            return
-        leg.update_position(position)
+            leg: LegData = self.legs.get(position.vt_symbol, None)
+            if not leg:
+                return
+            leg.update_position(position)
 
-        for spread in self.symbol_spread_map[position.vt_symbol]:
-            spread.calculate_pos()
-            self.put_pos_event(spread)
+            for spread in self.symbol_spread_map[position.vt_symbol]:
+                spread.calculate_pos()
+                self.put_pos_event(spread)
 
     def process_trade_event(self, event: Event) -> None:
         """"""
-        trade: TradeData = event.data
+        with self.spread_engine.event_lock:
+            trade: TradeData = event.data
 
-        if trade.vt_tradeid in self.tradeid_history:
-            return
-        self.tradeid_history.add(trade.vt_tradeid)
+            if trade.vt_tradeid in self.tradeid_history:
+                return
+            self.tradeid_history.add(trade.vt_tradeid)
 
-        # 查询该笔成交，对应的价差，并更新计算价差持仓
-        spread: SpreadData = self.order_spread_map.get(trade.vt_orderid, None)
-        if spread:
-            spread.update_trade(trade)
-            spread.calculate_pos()
-            self.put_pos_event(spread)
+            # 查询该笔成交，对应的价差，并更新计算价差持仓
+            spread: SpreadData = self.order_spread_map.get(trade.vt_orderid, None)
+            if spread:
+                spread.update_trade(trade)
+                spread.calculate_pos()
+                self.put_pos_event(spread)
 
-            self.save_pos()
+                self.save_pos()
 
     def process_contract_event(self, event: Event) -> None:
         """"""
-        contract: ContractData = event.data
-        leg: LegData = self.legs.get(contract.vt_symbol, None)
+        with self.spread_engine.event_lock:
+            contract: ContractData = event.data
+            leg: LegData = self.legs.get(contract.vt_symbol, None)
 
-        if leg:
-            # Update contract data
-            leg.update_contract(contract)
+            if leg:
+                # Update contract data
+                leg.update_contract(contract)
 
-            req: SubscribeRequest = SubscribeRequest(
-                contract.symbol, contract.exchange
-            )
-            self.main_engine.subscribe(req, contract.gateway_name)
+                req: SubscribeRequest = SubscribeRequest(
+                    contract.symbol, contract.exchange
+                )
+                self.main_engine.subscribe(req, contract.gateway_name)
 
     def put_data_event(self, spread: SpreadData) -> None:
         """"""
@@ -403,53 +412,58 @@ class SpreadAlgoEngine:
 
     def process_spread_event(self, event: Event) -> None:
         """"""
-        spread: SpreadData = event.data
-        self.spreads[spread.name] = spread
+        with self.spread_engine.event_lock:
+            spread: SpreadData = event.data
+            self.spreads[spread.name] = spread
 
     def process_tick_event(self, event: Event) -> None:
         """"""
-        tick: TickData = event.data
-        algos: List[SpreadAlgoTemplate] = self.symbol_algo_map[tick.vt_symbol]
-        if not algos:
-            return
-
-        buf: List[SpreadAlgoTemplate] = copy(algos)
-        for algo in buf:
-            if not algo.is_active():
-                algos.remove(algo)
-            else:
-                algo.update_tick(tick)
+        with self.spread_engine.event_lock:
+            tick: TickData = event.data
+            algos: List[SpreadAlgoTemplate] = self.symbol_algo_map[tick.vt_symbol]
+            if not algos:
+                return
+
+            buf: List[SpreadAlgoTemplate] = copy(algos)
+            for algo in buf:
+                if not algo.is_active():
+                    algos.remove(algo)
+                else:
+                    algo.update_tick(tick)
 
     def process_order_event(self, event: Event) -> None:
         """"""
-        order: OrderData = event.data
+        with self.spread_engine.event_lock:
+            order: OrderData = event.data
 
-        algo: SpreadAlgoTemplate = self.order_algo_map.get(order.vt_orderid, None)
-        if algo and algo.is_active():
-            algo.update_order(order)
+            algo: SpreadAlgoTemplate = self.order_algo_map.get(order.vt_orderid, None)
+            if algo and algo.is_active():
+                algo.update_order(order)
 
     def process_trade_event(self, event: Event) -> None:
         """"""
-        trade: TradeData = event.data
+        with self.spread_engine.event_lock:
+            trade: TradeData = event.data
 
-        # Filter duplicate trade push
-        if trade.vt_tradeid in self.vt_tradeids:
-            return
-        self.vt_tradeids.add(trade.vt_tradeid)
+            # Filter duplicate trade push
+            if trade.vt_tradeid in self.vt_tradeids:
+                return
+            self.vt_tradeids.add(trade.vt_tradeid)
 
-        algo: SpreadAlgoTemplate = self.order_algo_map.get(trade.vt_orderid, None)
-        if algo and algo.is_active():
-            algo.update_trade(trade)
+            algo: SpreadAlgoTemplate = self.order_algo_map.get(trade.vt_orderid, None)
+            if algo and algo.is_active():
+                algo.update_trade(trade)
 
     def process_timer_event(self, event: Event) -> None:
         """"""
-        buf: List[SpreadAlgoTemplate] = list(self.algos.values())
+        with self.spread_engine.event_lock:
+            buf: List[SpreadAlgoTemplate] = list(self.algos.values())
 
-        for algo in buf:
-            if not algo.is_active():
-                self.algos.pop(algo.algoid)
-            else:
-                algo.update_timer()
+            for algo in buf:
+                if not algo.is_active():
+                    self.algos.pop(algo.algoid)
+                else:
+                    algo.update_timer()
 
     def start_algo(
         self,
@@ -726,46 +740,51 @@ class SpreadStrategyEngine:
 
     def process_spread_data_event(self, event: Event) -> None:
         """"""
-        spread: SpreadData = event.data
-        strategies: List[SpreadStrategyTemplate] = self.spread_strategy_map[spread.name]
+        with self.spread_engine.event_lock:
+            spread: SpreadData = event.data
+            strategies: List[SpreadStrategyTemplate] = self.spread_strategy_map[spread.name]
 
-        for strategy in strategies:
-            if strategy.inited:
-                self.call_strategy_func(strategy, strategy.on_spread_data)
+            for strategy in strategies:
+                if strategy.inited:
+                    self.call_strategy_func(strategy, strategy.on_spread_data)
 
     def process_spread_pos_event(self, event: Event) -> None:
         """"""
-        spread: SpreadData = event.data
-        strategies: List[SpreadStrategyTemplate] = self.spread_strategy_map[spread.name]
+        with self.spread_engine.event_lock:
+            spread: SpreadData = event.data
+            strategies: List[SpreadStrategyTemplate] = self.spread_strategy_map[spread.name]
 
-        for strategy in strategies:
-            if strategy.inited:
-                self.call_strategy_func(strategy, strategy.on_spread_pos)
+            for strategy in strategies:
+                if strategy.inited:
+                    self.call_strategy_func(strategy, strategy.on_spread_pos)
 
     def process_spread_algo_event(self, event: Event) -> None:
         """"""
-        algo: SpreadAlgoTemplate = event.data
-        strategy: SpreadStrategyTemplate = self.algo_strategy_map.get(algo.algoid, None)
+        with self.spread_engine.event_lock:
+            algo: SpreadAlgoTemplate = event.data
+            strategy: SpreadStrategyTemplate = self.algo_strategy_map.get(algo.algoid, None)
 
-        if strategy:
-            self.call_strategy_func(
-                strategy, strategy.update_spread_algo, algo)
+            if strategy:
+                self.call_strategy_func(
+                    strategy, strategy.update_spread_algo, algo)
 
     def process_order_event(self, event: Event) -> None:
         """"""
-        order: OrderData = event.data
-        strategy: SpreadStrategyTemplate = self.order_strategy_map.get(order.vt_orderid, None)
+        with self.spread_engine.event_lock:
+            order: OrderData = event.data
+            strategy: SpreadStrategyTemplate = self.order_strategy_map.get(order.vt_orderid, None)
 
-        if strategy:
-            self.call_strategy_func(strategy, strategy.update_order, order)
+            if strategy:
+                self.call_strategy_func(strategy, strategy.update_order, order)
 
     def process_trade_event(self, event: Event) -> None:
         """"""
-        trade: TradeData = event.data
-        strategy: SpreadStrategyTemplate = self.order_strategy_map.get(trade.vt_orderid, None)
+        with self.spread_engine.event_lock:
+            trade: TradeData = event.data
+            strategy: SpreadStrategyTemplate = self.order_strategy_map.get(trade.vt_orderid, None)
 
-        if strategy:
-            self.call_strategy_func(strategy, strategy.on_trade, trade)
+            if strategy:
+                self.call_strategy_func(strategy, strategy.on_trade, trade)
 
     def call_strategy_func(
         self, strategy: SpreadStrategyTemplate, func: Callable, params: Any = None
@@ -2,14 +2,22 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
-from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+import logging
+from collections import defaultdict, deque
+from heapq import heappop, heappush
+from threading import Condition, Event as ThreadEvent, Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
 
 # 表示eTimer类型的事件
 EVENT_TIMER = "eTimer"
+# 处理函数耗时统计事件，数据为List[HandlerStats]
+EVENT_PROFILE = "eProfile"
+
+# 未配置车道的事件类型进入默认车道
+DEFAULT_LANE = "default"
+# 低优先级车道在高优先级车道有待处理事件时，每个事件前最多让出的秒数
+LANE_YIELD_TIMEOUT = 0.001
 
 
 class Event:
@@ -33,6 +41,199 @@ class Event:
 HandlerType: callable = Callable[[Event], None]
 
 
+def get_handler_name(handler: HandlerType) -> str:
+    """
+    Get readable name of handler function.
+    获取处理函数的名称，绑定方法包含类名
+    """
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
+class HandlerStats:
+    """
+    Call statistics of one handler for one event type.
+    单个事件类型下单个处理函数的调用次数和耗时统计
+    """
+
+    __slots__ = ("type", "name", "count", "total", "max", "slow")
+
+    def __init__(self, type: str, name: str) -> None:
+        """"""
+        self.type: str = type  # 事件类型
+        self.name: str = name  # 处理函数名称
+        self.count: int = 0  # 调用次数
+        self.total: float = 0  # 累计耗时秒数
+        self.max: float = 0  # 最大耗时秒数
+        self.slow: int = 0  # 超过阈值的调用次数
+
+    def get_average(self) -> float:
+        """
+        Get average seconds per call.
+        平均每次调用耗时秒数
+        """
+        if not self.count:
+            return 0
+        return self.total / self.count
+
+    def copy(self) -> "HandlerStats":
+        """"""
+        stats: HandlerStats = HandlerStats(self.type, self.name)
+        stats.count = self.count
+        stats.total = self.total
+        stats.max = self.max
+        stats.slow = self.slow
+        return stats
+
+
+class TimerTask:
+    """
+    Timer generating an event of its type every interval seconds.
+    每隔interval秒生成一个指定类型事件的计时器
+    """
+
+    __slots__ = ("timer_id", "interval", "type", "deadline", "fired", "missed")
+
+    def __init__(self, timer_id: int, interval: float, type: str) -> None:
+        """"""
+        self.timer_id: int = timer_id
+        self.interval: float = interval
+        self.type: str = type
+        self.deadline: float = 0  # 下次触发的计划时间，perf_counter单调时钟
+        self.fired: int = 0  # 已触发次数
+        self.missed: int = 0  # 计时线程落后超过一个间隔时跳过的次数
+
+    def schedule(self, now: float) -> None:
+        """
+        Advance deadline by whole intervals, skipping missed ones.
+        计划时间按整数个间隔累加，避免误差累积，落后时跳过错过的触发
+        """
+        self.deadline += self.interval
+        if self.deadline <= now:
+            missed: int = int((now - self.deadline) // self.interval) + 1
+            self.deadline += missed * self.interval
+            self.missed += missed
+
+
+class EventLane:
+    """
+    Queue and dispatch thread of a group of event types. Events of one
+    lane are processed in order, lanes run concurrently.
+    一组事件类型的队列和处理线程，车道内按顺序处理事件，不同车道并行处理。
+    """
+
+    def __init__(self, engine: "EventEngine", name: str) -> None:
+        """"""
+        self.engine: EventEngine = engine
+        self.name: str = name
+
+        self.queue: deque = deque()  # 待处理事件，处理线程每次取走全部事件
+        self.condition: Condition = Condition()  # 保护queue，有新事件时唤醒处理线程
+        self.put_time: float = 0  # 当前队列中最早事件的放入时间
+        self.thread: Thread = Thread(target=self.run, name=f"EventLane-{name}")
+
+        # 队列为空且没有正在处理的事件时设置，低优先级车道据此让出
+        self.idle: ThreadEvent = ThreadEvent()
+        self.idle.set()
+        self.higher_lanes: List[EventLane] = []  # 优先级更高的车道
+
+        # 运行统计
+        self.processed: int = 0  # 已处理事件数
+        self.batches: int = 0  # 已处理批次数
+        self.skipped: int = 0  # 合并后跳过的处理函数调用次数
+        self.max_batch: int = 0  # 最大批次事件数
+        self.last_lag: float = 0  # 最近一批最早事件从放入到开始处理的秒数
+        self.max_lag: float = 0
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into lane queue.
+        将事件对象放入车道队列
+        """
+        with self.condition:
+            if not self.queue:
+                self.put_time = perf_counter()
+                self.idle.clear()
+            self.queue.append(event)
+            self.condition.notify()
+
+    def run(self) -> None:
+        """
+        Get events from queue in batches and then process them.
+        从队列中按批取出事件，然后进行处理。
+        """
+        while self.engine._active:
+            with self.condition:
+                # 队列为空时最多等待1秒，之后检查活动状态
+                if not self.queue:
+                    self.condition.wait(1)
+                    if not self.queue:
+                        continue
+
+                # 一次取走全部事件，每批只需获取一次锁
+                events: deque = self.queue
+                self.queue = deque()
+                put_time: float = self.put_time
+
+            self.process_batch(events, put_time)
+
+            with self.condition:
+                if not self.queue:
+                    self.idle.set()
+
+    def process_batch(self, events: deque, put_time: float) -> None:
+        """
+        Process a batch of events in order, skipping superseded events
+        for coalescing handlers.
+        按顺序处理一批事件，合并处理函数跳过被同键新事件取代的事件。
+        """
+        lag: float = perf_counter() - put_time
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.processed += len(events)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(events))
+
+        engine: EventEngine = self.engine
+        higher_lanes: List[EventLane] = self.higher_lanes
+
+        # 启用统计时使用计时的处理方法，未启用时没有额外开销
+        process: Callable = engine._process_profiled if engine._profiling else engine._process
+
+        skipped: Dict[int, Set[HandlerType]] = {}
+        if engine._coalesced and len(events) > 1:
+            skipped = engine._get_superseded(events)
+
+        for i, event in enumerate(events):
+            # 高优先级车道有待处理事件时先让出
+            for lane in higher_lanes:
+                if not lane.idle.is_set():
+                    lane.idle.wait(LANE_YIELD_TIMEOUT)
+
+            if i in skipped:
+                self.skipped += len(skipped[i])
+                process(event, skipped[i])
+            else:
+                process(event)
+
+        if engine._profiling:
+            engine._check_profile()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Get queue depth, lag and throughput counters.
+        获取队列长度、延迟和处理数量统计。
+        """
+        return {
+            "queue_size": len(self.queue),
+            "processed": self.processed,
+            "batches": self.batches,
+            "skipped": self.skipped,
+            "max_batch": self.max_batch,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type
@@ -40,40 +241,115 @@ class EventEngine:
 
     It also generates timer event by every interval seconds,
     which can be used for timing purpose.
+
+    Events are drained from the queue in batches. Handlers registered with
+    a coalesce_key only receive the newest event of each key in a batch.
+    Optional priority lanes give groups of event types their own queue
+    and thread, so that trading updates are not delayed by market data.
     事件引擎根据事件对象的类型将其分发给那些注册的处理程序。它还按每间隔秒生成计时器事件，可用于计时。
+    事件按批从队列中取出，注册时传入coalesce_key的处理函数在一批中只收到每个键最新的事件。
+    可选的优先级车道为一组事件类型提供独立的队列和线程，避免行情数据延迟交易回报的处理。
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(self, interval: float = 1, lanes: Sequence[Tuple[str, Sequence[str]]] = None) -> None:
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
         如果未指定时间间隔，则默认情况下每隔1秒生成一次计时器事件。
 
+        lanes按优先级从高到低排列，每项为(车道名称, 事件类型前缀列表)，
+        每个车道使用独立的队列和线程，未匹配的事件类型进入优先级最低的默认车道。
+        不传入时只有默认车道，全部事件在同一线程中按顺序处理。
+        注意不同车道的处理函数会并行执行。
+
         :param interval: 时间间隔， 默认为1
+        :param lanes: 事件车道配置， 默认为None
         """
-        self._interval: int = interval  # 时间间隔， 下划线前缀'_'表示该变量是类内部使用
-        self._queue: Queue = Queue()  # Queue是Python标准库中的一个线程安全队列，可以用于实现多线程间的数据传输
+        self._interval: float = interval  # 时间间隔， 下划线前缀'_'表示该变量是类内部使用
         self._active: bool = False  # 活动参数, 默认false
-        self._thread: Thread = Thread(target=self._run)  # 用多线程执行self._run
         self._timer: Thread = Thread(target=self._run_timer)  # 用多线程执行self._run_timer
+
+        # 计时器按计划时间排列在堆中，计时线程等待到最早的计划时间
+        self._timers: Dict[int, TimerTask] = {}
+        self._timer_heap: List[Tuple[float, int]] = []  # (计划时间, 计时器编号)
+        self._timer_condition: Condition = Condition()  # 保护计时器，增删计时器和停止时唤醒计时线程
+        self._timer_count: int = 0
         self._handlers: defaultdict = defaultdict(list)  # 当_handlers字典中的键不存在时，会自动创建一个空列表，并将其作为默认值
         self._general_handlers: List = []  # 全体事件处理函数
-
-    def _run(self) -> None:
+        self._coalesced: Dict[str, Dict[str, Set[HandlerType]]] = {}  # 事件类型: {合并键: 处理函数}
+
+        # 事件车道，按优先级从高到低排列
+        self._lanes: List[EventLane] = []
+        self._prefixes: List[Tuple[str, EventLane]] = []  # (事件类型前缀, 车道)，长前缀优先匹配
+        for name, prefixes in (lanes or []):
+            lane: EventLane = EventLane(self, name)
+            self._lanes.append(lane)
+            self._prefixes.extend((prefix, lane) for prefix in prefixes)
+        self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+
+        self._default_lane: EventLane = EventLane(self, DEFAULT_LANE)
+        self._lanes.append(self._default_lane)
+        for i, lane in enumerate(self._lanes):
+            lane.higher_lanes = self._lanes[:i]
+
+        self._routes: Dict[str, EventLane] = {}  # 事件类型: 车道，首次放入时匹配后缓存
+
+        # 处理函数耗时统计，每个事件类型只在一个车道线程中写入，无需加锁
+        self._profiling: bool = False
+        self._profile_threshold: float = 0  # 慢调用阈值秒数
+        self._profile_interval: float = 0  # 发布统计事件的间隔秒数
+        self._profile_time: float = 0  # 上次发布统计事件的时间
+        self._profile_lock: Lock = Lock()  # 多个车道同时到达统计间隔时只发布一次
+        self._profile_logger: logging.Logger = None
+        self._stats: Dict[Tuple[str, HandlerType], HandlerStats] = {}
+        self._slow_logged: Set[Tuple[str, HandlerType]] = set()  # 本周期已记录慢调用日志的处理函数
+
+        self.add_timer(interval)  # 默认的EVENT_TIMER计时器
+
+    def _get_lane(self, type: str) -> EventLane:
         """
-        Get event from queue and then process it.
-        从队列中获取事件，然后进行处理。
+        Get lane of event type by longest matching prefix.
+        按最长匹配前缀获取事件类型所在的车道
         """
-        while self._active:
-            try:
-                # 尝试等待事件发生, 方法是阻塞, 最多等待1秒钟, 超过抛出Empty异常(或处理队列为空）
-                # event变量将包含队列中的一个事件
-                event: Event = self._queue.get(block=True, timeout=1)  # 取出事件对象
-                self._process(event)  # 执行处理
-            except Empty:
-                pass
+        lane: EventLane = self._routes.get(type)
+        if lane:
+            return lane
 
-    def _process(self, event: Event) -> None:
+        lane = self._default_lane
+        for prefix, prefix_lane in self._prefixes:
+            if type.startswith(prefix):
+                lane = prefix_lane
+                break
+
+        self._routes[type] = lane
+        return lane
+
+    def _get_superseded(self, events: deque) -> Dict[int, Set[HandlerType]]:
+        """
+        Return handlers to skip for each event index, an event is
+        superseded by a later one of the same type and key.
+        返回每个事件需要跳过的处理函数，被后续同类型同键的事件取代时跳过。
+        """
+        skipped: Dict[int, Set[HandlerType]] = {}
+        seen: Set[Tuple[str, str, Any]] = set()
+
+        # 倒序遍历，每个键先遇到的是最新事件
+        for i in range(len(events) - 1, -1, -1):
+            event: Event = events[i]
+            coalesced: Dict[str, Set[HandlerType]] = self._coalesced.get(event.type)
+            if not coalesced:
+                continue
+
+            for key_name, handlers in coalesced.items():
+                key: Tuple[str, str, Any] = (event.type, key_name, getattr(event.data, key_name, None))
+                if key in seen:
+                    skipped.setdefault(i, set()).update(handlers)
+                else:
+                    seen.add(key)
+
+        return skipped
+
+    def _process(self, event: Event, skipped: Set[HandlerType] = None) -> None:
         """
         First distribute event to those handlers registered listening
         to this type.
@@ -83,25 +359,154 @@ class EventEngine:
 
         首先将事件分发给那些注册侦听此类型的处理程序。
         然后将事件分发给那些侦听所有类型的通用处理程序。
+        skipped为该事件已被取代、不需要调用的合并处理函数。
         """
 
         if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]  # 取出对应事件类型的处理函数并执行处理函数
+            for handler in self._handlers[event.type]:  # 取出对应事件类型的处理函数并执行处理函数
+                if skipped and handler in skipped:
+                    continue
+                handler(event)
+
+        for handler in self._general_handlers:
+            handler(event)
+
+    def _process_profiled(self, event: Event, skipped: Set[HandlerType] = None) -> None:
+        """
+        Same as _process, timing each handler call.
+        与_process相同，并统计每次处理函数调用的耗时
+        """
+        if event.type in self._handlers:
+            for handler in self._handlers[event.type]:
+                if skipped and handler in skipped:
+                    continue
+                self._call_profiled(event, handler)
+
+        for handler in self._general_handlers:
+            self._call_profiled(event, handler)
+
+    def _call_profiled(self, event: Event, handler: HandlerType) -> None:
+        """
+        Call handler and record its latency.
+        调用处理函数并记录耗时，超过阈值时每个统计周期记录一次日志
+        """
+        start: float = perf_counter()
+        handler(event)
+        cost: float = perf_counter() - start
+
+        key: Tuple[str, HandlerType] = (event.type, handler)
+        stats: HandlerStats = self._stats.get(key)
+        if not stats:
+            stats = HandlerStats(event.type, get_handler_name(handler))
+            self._stats[key] = stats
+
+        stats.count += 1
+        stats.total += cost
+        if cost > stats.max:
+            stats.max = cost
+
+        if cost >= self._profile_threshold:
+            stats.slow += 1
+            if key not in self._slow_logged:
+                self._slow_logged.add(key)
+                self._profile_logger.warning(
+                    f"事件处理函数耗时过长：{stats.name}，事件类型{event.type}，耗时{cost * 1000:.1f}毫秒"
+                )
+
+    def _check_profile(self) -> None:
+        """
+        Publish profile event every interval seconds.
+        每隔统计间隔发布一次耗时统计事件
+        """
+        now: float = perf_counter()
+        if now - self._profile_time < self._profile_interval:
+            return
+
+        with self._profile_lock:
+            if now - self._profile_time < self._profile_interval:
+                return
+            self._profile_time = now
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        self._slow_logged.clear()
+        self.put(Event(EVENT_PROFILE, self.get_profile()))
 
     def _run_timer(self) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
-        按间隔秒休眠，然后生成定时处理事件
+        Wait until the earliest deadline and then generate timer event.
+        等待到最早的计划时间，然后生成定时处理事件，事件数据为计划时间
         """
         while self._active:
-            sleep(self._interval)  # 时间间隔
-            # 创建eTimer类型的事件对象给event
-            event: Event = Event(EVENT_TIMER)
+            with self._timer_condition:
+                if not self._timer_heap:
+                    self._timer_condition.wait(1)
+                    continue
+
+                deadline, timer_id = self._timer_heap[0]
+                delay: float = deadline - perf_counter()
+                if delay > 0:
+                    # 计时器增删或停止时提前唤醒，重新检查最早的计划时间
+                    self._timer_condition.wait(delay)
+                    continue
+
+                heappop(self._timer_heap)
+                task: TimerTask = self._timers.get(timer_id)
+                # 已移除或重新计划的计时器
+                if not task or task.deadline != deadline:
+                    continue
+
+                task.fired += 1
+                task.schedule(perf_counter())
+                heappush(self._timer_heap, (task.deadline, timer_id))
+
             # 调用put方法加入处理队列
-            self.put(event)
+            self.put(Event(task.type, deadline))
+
+    def add_timer(self, interval: float, type: str = EVENT_TIMER) -> int:
+        """
+        Add a timer generating event of type every interval seconds,
+        return timer id.
+        添加每隔interval秒生成type类型事件的计时器，支持小于1秒的间隔，返回计时器编号。
+        计时器按单调时钟计划，处理延迟不会累积到后续触发时间，
+        type配置在高优先级车道时定时事件不会排在其他事件之后。
+        """
+        with self._timer_condition:
+            self._timer_count += 1
+            timer_id: int = self._timer_count
+
+            task: TimerTask = TimerTask(timer_id, interval, type)
+            self._timers[timer_id] = task
+
+            # 未启动时在start中计划
+            if self._active:
+                self._schedule_timer(task, perf_counter())
+                self._timer_condition.notify()
+
+        return timer_id
+
+    def remove_timer(self, timer_id: int) -> None:
+        """
+        Remove a timer added by add_timer.
+        移除计时器
+        """
+        with self._timer_condition:
+            self._timers.pop(timer_id, None)
+            self._timer_condition.notify()
+
+    def get_timers(self) -> List[TimerTask]:
+        """
+        Get timers sorted by id.
+        获取全部计时器
+        """
+        with self._timer_condition:
+            return [self._timers[timer_id] for timer_id in sorted(self._timers)]
+
+    def _schedule_timer(self, task: TimerTask, now: float) -> None:
+        """
+        Schedule first trigger of timer one interval after now.
+        计划计时器在一个间隔后首次触发
+        """
+        task.deadline = now + task.interval
+        heappush(self._timer_heap, (task.deadline, task.timer_id))
 
     def start(self) -> None:
         """
@@ -109,7 +514,16 @@ class EventEngine:
         启动事件引擎以处理事件并生成计时器事件
         """
         self._active = True  # 启用标志
-        self._thread.start()  # 开启多线程执行self._run
+        for lane in self._lanes:
+            lane.thread.start()  # 开启每个车道的处理线程
+
+        # 全部计时器从启动时刻开始计划
+        with self._timer_condition:
+            now: float = perf_counter()
+            self._timer_heap = []
+            for task in self._timers.values():
+                self._schedule_timer(task, now)
+
         self._timer.start()  # 开启多线程执行self._run_timer
 
     def stop(self) -> None:
@@ -118,17 +532,77 @@ class EventEngine:
         停止事件引擎
         """
         self._active = False  # 停用标志
+        with self._timer_condition:
+            self._timer_condition.notify()  # 唤醒等待中的计时线程
         self._timer.join()  # join()会阻塞等待self._timer线程完成,确保在程序退出之前，所有的计时器事件都已被正确处理或停止
-        self._thread.join()
+        for lane in self._lanes:
+            with lane.condition:
+                lane.condition.notify()  # 唤醒等待中的车道线程
+            lane.thread.join()
 
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
-        将事件对象放入事件队列
+        将事件对象放入事件类型所在车道的队列
         """
-        self._queue.put(event)
+        self._get_lane(event.type).put(event)
 
-    def register(self, type: str, handler: HandlerType) -> None:
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Get queue depth, lag and throughput counters of all lanes.
+        获取全部车道合计的队列长度、延迟和处理数量统计。
+        """
+        lane_metrics: List[Dict[str, float]] = [lane.get_metrics() for lane in self._lanes]
+        metrics: Dict[str, float] = {}
+        for key in ["queue_size", "processed", "batches", "skipped"]:
+            metrics[key] = sum(m[key] for m in lane_metrics)
+        for key in ["max_batch", "last_lag", "max_lag"]:
+            metrics[key] = max(m[key] for m in lane_metrics)
+        return metrics
+
+    def get_lane_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get metrics of each lane.
+        获取每个车道的统计
+        """
+        return {lane.name: lane.get_metrics() for lane in self._lanes}
+
+    def start_profiling(
+        self,
+        threshold: float = 0.05,
+        interval: float = 60,
+        logger: logging.Logger = None
+    ) -> None:
+        """
+        Start recording call count and latency of each handler.
+        开始统计每个处理函数的调用次数和耗时，
+        耗时超过threshold秒的调用记录警告日志，每隔interval秒发布EVENT_PROFILE事件
+        """
+        self._stats = {}
+        self._slow_logged = set()
+        self._profile_threshold = threshold
+        self._profile_interval = interval
+        self._profile_time = perf_counter()
+        self._profile_logger = logger or logging.getLogger(__name__)
+        self._profiling = True
+
+    def stop_profiling(self) -> None:
+        """
+        Stop recording handler latency.
+        停止统计处理函数耗时
+        """
+        self._profiling = False
+
+    def get_profile(self) -> List[HandlerStats]:
+        """
+        Get copies of handler statistics sorted by total latency.
+        获取按累计耗时从大到小排序的处理函数统计
+        """
+        stats_list: List[HandlerStats] = [stats.copy() for stats in list(self._stats.values())]
+        stats_list.sort(key=lambda stats: stats.total, reverse=True)
+        return stats_list
+
+    def register(self, type: str, handler: HandlerType, coalesce_key: str = "") -> None:
         """
         Register a new handler function for a specific event type.
         Every function can only be registered once for each event type.
@@ -136,6 +610,9 @@ class EventEngine:
         为特定的事件类型注册一个新的处理程序函数
         对于每个事件类型，每个函数只能注册一次
 
+        coalesce_key为事件数据的属性名，例如vt_symbol，传入时一批事件中
+        同一键只把最新的事件发给该处理函数，适用于只关心最新状态的界面组件
+
         字典self._handlers数据结构：
         {
             'type':[handler1, handler2, ...],
@@ -146,6 +623,10 @@ class EventEngine:
         if handler not in handler_list:
             handler_list.append(handler)  # 添加handler处理函数(对象)到处理函数列表
 
+            if coalesce_key:
+                coalesced: Dict[str, Set[HandlerType]] = self._coalesced.setdefault(type, {})
+                coalesced.setdefault(coalesce_key, set()).add(handler)
+
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
         Unregister an existing handler function from event engine.
@@ -157,10 +638,28 @@ class EventEngine:
 
         if handler in handler_list:  # 处理函数列表中删除处理函数
             handler_list.remove(handler)
+            self._remove_coalesced(type, handler)
 
         if not handler_list:  # 该事件类型的处理函数列表为空则删除空列表
             self._handlers.pop(type)
 
+    def _remove_coalesced(self, type: str, handler: HandlerType) -> None:
+        """
+        Remove handler from coalescing handlers of the event type.
+        从事件类型的合并处理函数中删除处理函数
+        """
+        coalesced: Dict[str, Set[HandlerType]] = self._coalesced.get(type)
+        if not coalesced:
+            return
+
+        for key_name, handlers in list(coalesced.items()):
+            handlers.discard(handler)
+            if not handlers:
+                coalesced.pop(key_name)
+
+        if not coalesced:
+            self._coalesced.pop(type)
+
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types.
@@ -1,14 +1,14 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from types import ModuleType
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
 from dataclasses import dataclass
 from importlib import import_module
 
 from .constant import Interval, Exchange
 from .object import BarData, TickData
 from .setting import SETTINGS
-from .utility import ZoneInfo
+from .utility import ZoneInfo, BarSeries
 
 
 DB_TZ = ZoneInfo(SETTINGS["database.timezone"])
@@ -23,6 +23,89 @@ def convert_tz(dt: datetime) -> datetime:
     return dt.replace(tzinfo=None)
 
 
+# K线周期对应的时间间隔，用于判断相邻K线是否连续
+INTERVAL_DELTA_MAP: dict = {
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.MINUTE_15: timedelta(minutes=15),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(weeks=1),
+}
+
+
+def get_bar_segments(datetimes: Iterable[datetime], interval: Interval) -> List[Tuple[datetime, datetime]]:
+    """
+    Split sorted bar datetimes into contiguous segments.
+    将排序后的K线时间拆分为连续区间，相邻K线间隔超过一个周期即为缺失
+    """
+    delta: timedelta = INTERVAL_DELTA_MAP[interval]
+    segments: List[Tuple[datetime, datetime]] = []
+    start: datetime = None
+    end: datetime = None
+
+    for dt in datetimes:
+        if start is None:
+            start = dt
+        elif dt - end > delta:
+            segments.append((start, end))
+            start = dt
+        end = dt
+
+    if start is not None:
+        segments.append((start, end))
+    return segments
+
+
+def merge_bar_segments(
+        segments: List[Tuple[datetime, datetime]],
+        interval: Interval
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Merge overlapping or adjacent segments.
+    合并重叠或相邻的区间
+    """
+    delta: timedelta = INTERVAL_DELTA_MAP[interval]
+    merged: List[Tuple[datetime, datetime]] = []
+
+    for start, end in sorted(segments):
+        if merged and start - merged[-1][1] <= delta:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def get_bar_gaps(
+        segments: List[Tuple[datetime, datetime]],
+        interval: Interval,
+        start: datetime,
+        end: datetime
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Return missing ranges in [start, end] not covered by sorted segments,
+    each as (first missing bar, last missing bar). Every interval step is
+    expected to have a bar, as in 24/7 crypto markets.
+    计算[start, end]内未被区间覆盖的缺失范围
+    """
+    delta: timedelta = INTERVAL_DELTA_MAP[interval]
+    gaps: List[Tuple[datetime, datetime]] = []
+    cursor: datetime = start  # 下一根应有的K线时间
+
+    for segment_start, segment_end in segments:
+        if segment_end < cursor:
+            continue
+        if segment_start > end:
+            break
+
+        if segment_start > cursor:
+            gaps.append((cursor, segment_start - delta))
+        cursor = segment_end + delta
+
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
 @dataclass
 class BarOverview:
     """
@@ -66,6 +149,15 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def save_bar_series(self, series: BarSeries, stream: bool = False, quiet: bool = False) -> bool:
+        """
+        Save columnar bar series into database.
+        Database implementations can override this to write arrays
+        without creating bar data objects, quiet disables progress output.
+        保存列式K线序列到数据库，quiet为True时不输出写入进度
+        """
+        return self.save_bar_data(series.to_bars(), stream)
+
     @abstractmethod
     def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
         """
@@ -89,6 +181,42 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def iter_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            chunk_size: int = 10000
+    ) -> Iterator[BarData]:
+        """
+        Iterate bar data from database lazily, in order of datetime.
+        Database implementations should override this to load by chunks of
+        chunk_size, the default one loads all data at once.
+        逐条读取K线，数据库实现应按块分页加载以保持内存占用稳定
+        """
+        yield from self.load_bar_data(symbol, exchange, interval, start, end)
+
+    def load_bar_series(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            series_class: Type[BarSeries] = BarSeries
+    ) -> Optional[BarSeries]:
+        """
+        Load bar data from database as columnar bar series, None if no data.
+        Database implementations can override this with a faster path.
+        加载K线为列式K线序列
+        """
+        bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+        if not bars:
+            return None
+        return series_class.from_bars(bars)
+
     @abstractmethod
     def load_tick_data(
             self,
@@ -128,6 +256,46 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def get_bar_coverage(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Return sorted contiguous segments of stored bar data, in naive
+        database time. Database implementations should maintain an index
+        on save, the default one scans all bars.
+        查询已保存K线的连续区间
+        """
+        for overview in self.get_bar_overview():
+            if overview.symbol == symbol and overview.exchange == exchange and overview.interval == interval:
+                bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, overview.start, overview.end)
+                return get_bar_segments((convert_tz(bar.datetime) for bar in bars), interval)
+        return []
+
+    def find_gaps(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """
+        Return missing ranges of bar data in [start, end], in naive database time.
+        Implementations with a coverage index may return None when the index
+        has not been built yet, instead of scanning all bars.
+        查询时间范围内缺失的K线，连续区间索引尚未建立时可返回None
+        """
+        if start.tzinfo:
+            start = convert_tz(start)
+        if end.tzinfo:
+            end = convert_tz(end)
+
+        segments: List[Tuple[datetime, datetime]] = self.get_bar_coverage(symbol, exchange, interval)
+        return get_bar_gaps(segments, interval, start, end)
+
     @abstractmethod
     def get_bar_overview(self) -> List[BarOverview]:
         """
@@ -5,6 +5,7 @@ from importlib import import_module
 
 from .object import HistoryRequest, TickData, BarData
 from .setting import SETTINGS
+from .utility import BarSeries
 
 
 class BaseDatafeed(ABC):
@@ -25,6 +26,16 @@ class BaseDatafeed(ABC):
         """
         pass
 
+    def query_bar_series(self, req: HistoryRequest, output: Callable = print) -> Optional[BarSeries]:
+        """
+        Query history bar data as columnar bar series.
+        Datafeed implementations can override this to skip bar data objects.
+        """
+        bars: Optional[List[BarData]] = self.query_bar_history(req, output)
+        if not bars:
+            return None
+        return BarSeries.from_bars(bars)
+
     def query_tick_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[TickData]]:
         """
         Query history tick data.
@@ -10,7 +10,7 @@ from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Type, Dict, List, Optional
 
-from core.event import Event, EventEngine
+from core.event import Event, EventEngine, HandlerStats
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
@@ -20,7 +20,9 @@ from .event import (
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
     EVENT_LOG,
-    EVENT_QUOTE
+    EVENT_QUOTE,
+    EVENT_PROFILE,
+    EVENT_LANES
 )
 from .gateway import BaseGateway
 from .object import (
@@ -59,8 +61,9 @@ class MainEngine:
         if event_engine:  # 判断有无事件引擎
             self.event_engine: EventEngine = event_engine
         else:
-            # 没有事件引擎就创建
-            self.event_engine = EventEngine()
+            # 没有事件引擎就创建，启用车道时交易回报优先于行情处理
+            lanes: Optional[list] = EVENT_LANES if SETTINGS["event.lanes"] else None
+            self.event_engine = EventEngine(lanes=lanes)
         # 启动事件引擎
         self.event_engine.start()
 
@@ -329,6 +332,14 @@ class LogEngine(BaseEngine):
 
         self.register_event()
 
+        if SETTINGS["event.profile"]:  # 启用事件处理函数耗时统计
+            self.event_engine.register(EVENT_PROFILE, self.process_profile_event)
+            self.event_engine.start_profiling(
+                SETTINGS["event.profile_threshold"],
+                SETTINGS["event.profile_interval"],
+                self.logger
+            )
+
     def add_null_handler(self) -> None:
         """
         Add null handler for logger.
@@ -375,6 +386,19 @@ class LogEngine(BaseEngine):
         log: LogData = event.data
         self.logger.log(log.level, log.msg)  # 记录日志信息
 
+    def process_profile_event(self, event: Event) -> None:
+        """
+        Log top handlers by total latency.
+        记录累计耗时最多的处理函数
+        """
+        stats_list: List[HandlerStats] = event.data
+        for stats in stats_list[:10]:
+            self.logger.info(
+                f"事件处理耗时统计：{stats.name}，事件类型{stats.type}，调用{stats.count}次，"
+                f"累计{stats.total:.3f}秒，平均{stats.get_average() * 1000:.3f}毫秒，"
+                f"最大{stats.max * 1000:.1f}毫秒，慢调用{stats.slow}次"
+            )
+
 
 class OmsEngine(BaseEngine):
     """
@@ -2,7 +2,7 @@
 Event type string used in the trading platform.
 """
 
-from core.event import EVENT_TIMER  # noqa
+from core.event import EVENT_TIMER, EVENT_PROFILE  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_TRADE = "eTrade."
@@ -12,3 +12,11 @@ EVENT_ACCOUNT = "eAccount."
 EVENT_QUOTE = "eQuote."
 EVENT_CONTRACT = "eContract."
 EVENT_LOG = "eLog"
+
+# 启用事件车道时的默认配置，按优先级从高到低排列，未列出的事件类型进入默认车道。
+# 不同车道的处理函数并行执行，同时处理行情和交易回报的引擎需要自行加锁，
+# 例如CtaEngine和SpreadEngine的event_lock
+EVENT_LANES = [
+    ("trading", [EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT, EVENT_QUOTE]),
+    ("market", [EVENT_TICK]),
+]
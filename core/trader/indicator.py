@@ -0,0 +1,314 @@
+"""
+Streaming technical indicators used by StreamArrayManager.
+
+Every indicator keeps O(1) running state and gives the same value as the
+talib function of the same name run on the ArrayManager window. Recursive
+ones (EMA/ATR/RSI) are seeded at the start of the window like talib does,
+instead of carrying the seed from the first bar ever received.
+增量计算的技术指标，每根K线O(1)更新，结果与talib在ArrayManager窗口上的计算一致
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from math import nan, sqrt
+from typing import Deque, List, Tuple
+
+
+def _is_zero(value: float) -> bool:
+    """talib中TA_IS_ZERO的判断"""
+    return -0.00000001 < value < 0.00000001
+
+
+class StreamIndicator(ABC):
+    """
+    Base class of streaming indicator.
+    增量指标基类
+    """
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self.value: float = nan
+
+    @abstractmethod
+    def update(self, high: float, low: float, close: float) -> None:
+        """
+        Update indicator with price of new bar.
+        使用新K线价格更新指标
+        """
+        pass
+
+
+class SmaIndicator(StreamIndicator):
+    """
+    Simple moving average, same as talib.SMA.
+    简单移动均线
+    """
+
+    def __init__(self, n: int) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.n: int = n
+        self.window: Deque[float] = deque()
+        self.total: float = 0
+        self.count: int = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.window.append(close)
+        self.total += close
+
+        if len(self.window) == self.n:
+            self.value = self.total / self.n
+            self.total -= self.window.popleft()
+
+            # 每n根K线按窗口重新求和，消除累计误差
+            self.count += 1
+            if not self.count % self.n:
+                self.total = sum(self.window)
+
+
+class StdIndicator(StreamIndicator):
+    """
+    Standard deviation, same as talib.STDDEV.
+    标准差
+    """
+
+    def __init__(self, n: int, nbdev: float = 1) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.n: int = n
+        self.nbdev: float = nbdev
+        self.window: Deque[float] = deque()
+        self.total: float = 0
+        self.total_square: float = 0
+        self.count: int = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.window.append(close)
+        self.total += close
+        self.total_square += close * close
+
+        if len(self.window) < self.n:
+            return
+
+        mean: float = self.total / self.n
+        mean_square: float = self.total_square / self.n
+        var: float = mean_square - mean * mean
+
+        if var < 0.00000001:
+            self.value = 0
+        else:
+            self.value = sqrt(var) * self.nbdev
+
+        oldest: float = self.window.popleft()
+        self.total -= oldest
+        self.total_square -= oldest * oldest
+
+        # 每n根K线按窗口重新求和，消除累计误差
+        self.count += 1
+        if not self.count % self.n:
+            self.total = sum(self.window)
+            self.total_square = sum(v * v for v in self.window)
+
+
+class WindowSmoothing:
+    """
+    Seeded exponential smoothing over the latest inputs in a sliding window.
+
+    The result equals seeding with the mean of the first n inputs in the
+    window and then applying value = decay * value + weight * input to the
+    rest of the window, which is what talib EMA/ATR/RSI do when run on the
+    ArrayManager window. Both parts are kept as running sums, so sliding the
+    window costs O(1), and the sums are recomputed from the window once per
+    window length to drop accumulated float error.
+    窗口内带初始值的指数平滑，与talib在ArrayManager窗口上重新初始化的计算结果一致
+    """
+
+    def __init__(self, n: int, length: int, decay: float, weight: float) -> None:
+        """Constructor"""
+        self.n: int = n
+        self.length: int = length       # 窗口内输入数量
+        self.steps: int = length - n    # 初始值之后的平滑次数
+        self.decay: float = decay
+        self.weight: float = weight
+
+        self.seed_decay: float = decay ** max(self.steps, 0)
+        self.tail_weights: List[float] = [decay ** (self.steps - 1 - i) for i in range(self.steps)]
+
+        self.seed_window: Deque[float] = deque()
+        self.tail_window: Deque[float] = deque()
+        self.seed_total: float = 0
+        self.tail_total: float = 0
+        self.count: int = 0
+
+        self.value: float = nan
+
+    def update(self, data: float) -> None:
+        """"""
+        # 窗口长度小于初始化周期，与talib一样没有结果
+        if self.steps < 0:
+            return
+
+        self.tail_window.append(data)
+        self.tail_total = self.tail_total * self.decay + data
+
+        # 平滑部分最早的输入移入初始值部分
+        if len(self.tail_window) > self.steps:
+            oldest: float = self.tail_window.popleft()
+            self.tail_total -= oldest * self.seed_decay
+
+            self.seed_window.append(oldest)
+            self.seed_total += oldest
+            if len(self.seed_window) > self.n:
+                self.seed_total -= self.seed_window.popleft()
+
+        if len(self.seed_window) < self.n:
+            return
+
+        self.count += 1
+        if not self.count % self.length:
+            self.seed_total = sum(self.seed_window)
+            self.tail_total = sum(w * v for w, v in zip(self.tail_weights, self.tail_window))
+
+        self.value = self.seed_decay * self.seed_total / self.n + self.weight * self.tail_total
+
+
+class EmaIndicator(StreamIndicator):
+    """
+    Exponential moving average, same as talib.EMA on the latest size bars.
+    指数移动平均线，以窗口内前n根K线的简单均值作为初始值
+    """
+
+    def __init__(self, n: int, size: int) -> None:
+        """Constructor"""
+        super().__init__()
+
+        k: float = 2 / (n + 1)
+        self.smoothing: WindowSmoothing = WindowSmoothing(n, size, 1 - k, k)
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.smoothing.update(close)
+        self.value = self.smoothing.value
+
+
+class AtrIndicator(StreamIndicator):
+    """
+    Average True Range, same as talib.ATR on the latest size bars.
+    平均真实波幅，窗口内第一根K线没有昨收，共size-1个真实波幅
+    """
+
+    def __init__(self, n: int, size: int) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.n: int = n
+        self.size: int = size
+        self.smoothing: WindowSmoothing = WindowSmoothing(n, size - 1, (n - 1) / n, 1 / n)
+        self.pre_close: float = nan
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        if pre_close != pre_close:
+            return
+
+        tr: float = high - low
+        tr = max(tr, abs(pre_close - high), abs(pre_close - low))
+
+        # 周期为1时talib直接返回真实波幅
+        if self.n <= 1:
+            if self.size > 1:
+                self.value = tr
+            return
+
+        self.smoothing.update(tr)
+        self.value = self.smoothing.value
+
+
+class RsiIndicator(StreamIndicator):
+    """
+    Relative Strength Index, same as talib.RSI on the latest size bars.
+    相对强弱指标，涨跌幅分别在窗口内平滑
+    """
+
+    def __init__(self, n: int, size: int) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.gain: WindowSmoothing = WindowSmoothing(n, size - 1, (n - 1) / n, 1 / n)
+        self.loss: WindowSmoothing = WindowSmoothing(n, size - 1, (n - 1) / n, 1 / n)
+        self.pre_close: float = nan
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        if pre_close != pre_close:
+            return
+
+        diff: float = close - pre_close
+        if diff < 0:
+            self.gain.update(0)
+            self.loss.update(-diff)
+        else:
+            self.gain.update(diff)
+            self.loss.update(0)
+
+        gain: float = self.gain.value
+        loss: float = self.loss.value
+        if gain != gain:
+            return
+
+        total: float = gain + loss
+        if _is_zero(total):
+            self.value = 0
+        else:
+            self.value = 100 * (gain / total)
+
+
+class DonchianIndicator(StreamIndicator):
+    """
+    Donchian Channel, same as talib.MAX of high and talib.MIN of low.
+    The extremes are kept in monotonic queues, amortized O(1) per bar.
+    唐奇安通道，使用单调队列维护区间最高最低价
+    """
+
+    def __init__(self, n: int) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.n: int = n
+        self.count: int = 0
+        self.high_queue: Deque[Tuple[int, float]] = deque()
+        self.low_queue: Deque[Tuple[int, float]] = deque()
+
+        self.value: Tuple[float, float] = (nan, nan)
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        count: int = self.count
+        self.count += 1
+
+        high_queue: Deque[Tuple[int, float]] = self.high_queue
+        while high_queue and high_queue[-1][1] <= high:
+            high_queue.pop()
+        high_queue.append((count, high))
+        if high_queue[0][0] <= count - self.n:
+            high_queue.popleft()
+
+        low_queue: Deque[Tuple[int, float]] = self.low_queue
+        while low_queue and low_queue[-1][1] >= low:
+            low_queue.pop()
+        low_queue.append((count, low))
+        if low_queue[0][0] <= count - self.n:
+            low_queue.popleft()
+
+        if self.count >= self.n:
+            self.value = (high_queue[0][1], low_queue[0][1])
@@ -1,17 +1,33 @@
-from typing import Dict, List, Callable, Tuple
+from typing import Dict, List, Callable, Tuple, Optional
 from itertools import product
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from math import ceil
+from os import cpu_count
 from random import random, choice
 from time import perf_counter
-from multiprocessing import Manager, Pool, get_context
+from multiprocessing import Pool, get_context
 from _collections_abc import dict_keys, dict_values, Iterable
+import json
+import pickle
+import sqlite3
 
 from tqdm import tqdm
 from deap import creator, base, tools, algorithms
 
+from .utility import get_file_path
+
 OUTPUT_FUNC = Callable[[str], None]
 EVALUATE_FUNC = Callable[[dict], dict]
 KEY_FUNC = Callable[[list], float]
+PROGRESS_FUNC = Callable[[int, int, float], None]
+
+# 进度回调的最小时间间隔（秒）
+PROGRESS_INTERVAL = 1
+
+# 常驻优化进程池，多次优化之间复用，避免每次重新启动进程和导入模块
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers: int = 0
 
 # Create individual class used in genetic algorithm optimization 遗传算法配置
 creator.create("FitnessMax", base.Fitness, weights=(1.0,))
@@ -76,6 +92,63 @@ class OptimizationSetting:
         return settings
 
 
+class OptimizationCache:
+    """
+    Persistent cache of evaluation results, stored in sqlite under .vntrader.
+    Results are grouped by namespace, which must identify everything other
+    than the parameter setting that affects the result (strategy code,
+    history data, costs and target).
+    参数优化结果的持久化缓存，重复优化时只回测新的参数组合
+    """
+
+    def __init__(self, namespace: str, filename: str = "optimization_cache.db") -> None:
+        """Constructor"""
+        self.namespace: str = namespace
+
+        self.connection: sqlite3.Connection = sqlite3.connect(str(get_file_path(filename)))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS evaluation_result ("
+            "namespace TEXT NOT NULL, "
+            "setting TEXT NOT NULL, "
+            "result BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, setting))"
+        )
+
+        # 一次性读取当前命名空间下的全部结果
+        cursor: sqlite3.Cursor = self.connection.execute(
+            "SELECT setting, result FROM evaluation_result WHERE namespace = ?",
+            (namespace,)
+        )
+        self.results: Dict[str, Tuple] = {key: pickle.loads(data) for key, data in cursor}
+
+    @staticmethod
+    def get_key(setting: dict) -> str:
+        """参数组合转换为与顺序无关的缓存键"""
+        return json.dumps(setting, sort_keys=True, default=str)
+
+    def get(self, setting: dict) -> Optional[Tuple]:
+        """查询参数组合的缓存结果"""
+        return self.results.get(self.get_key(setting), None)
+
+    def put(self, settings: List[dict], results: List[Tuple]) -> None:
+        """批量保存参数组合的结果"""
+        rows: list = []
+        for setting, result in zip(settings, results):
+            key: str = self.get_key(setting)
+            self.results[key] = result
+            rows.append((self.namespace, key, pickle.dumps(result)))
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO evaluation_result VALUES (?, ?, ?)",
+                rows
+            )
+
+    def close(self) -> None:
+        """"""
+        self.connection.close()
+
+
 def check_optimization_setting(
         optimization_setting: OptimizationSetting,
         output: OUTPUT_FUNC = print
@@ -92,12 +165,61 @@ def check_optimization_setting(
     return True
 
 
+def get_optimization_executor(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Get the persistent process pool used by brutal force optimization.
+    The pool is created with spawn context and reused by later runs with
+    the same number of workers, so each worker imports modules, loads the
+    strategy class and attaches history data only once.
+    获取常驻优化进程池，进程数量变化时重新创建
+    """
+    global _executor, _executor_workers
+
+    workers: int = max_workers or cpu_count() or 1
+
+    if _executor and _executor_workers != workers:
+        shutdown_optimization_executor()
+
+    if not _executor:
+        _executor = ProcessPoolExecutor(
+            workers,
+            mp_context=get_context("spawn")
+        )
+        _executor_workers = workers
+
+    return _executor
+
+
+def shutdown_optimization_executor() -> None:
+    """
+    Shutdown the persistent process pool, e.g. after strategy files reloaded.
+    关闭常驻优化进程池，策略文件重载后需要调用使子进程使用新代码
+    """
+    global _executor, _executor_workers
+
+    if _executor:
+        _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+
+def evaluate_chunk(evaluate_func: EVALUATE_FUNC, settings: List[dict]) -> List[Tuple]:
+    """
+    Evaluate a batch of settings in one task to reduce IPC overhead.
+    在子进程中批量执行一组参数
+    """
+    return [evaluate_func(setting) for setting in settings]
+
+
 def run_bf_optimization(
         evaluate_func: EVALUATE_FUNC,  # 评估函数
         optimization_setting: OptimizationSetting,  # 参数设置
         key_func: KEY_FUNC,  # 排序函数
         max_workers: int = None,  # 最大工作进程数
-        output: OUTPUT_FUNC = print  # 输出函数默认print
+        output: OUTPUT_FUNC = print,  # 输出函数默认print
+        chunksize: int = 0,  # 每个任务包含的参数组合数量，0则自动计算
+        progress: PROGRESS_FUNC = None,  # 进度回调(完成数量, 总数量, 预计剩余秒数)
+        cache: OptimizationCache = None  # 结果缓存，已计算过的参数组合不再回测
 ) -> List[Tuple]:
     """Run brutal force optimization 开始执行穷举算法优化"""
     settings: List[Dict] = optimization_setting.generate_settings()
@@ -107,22 +229,77 @@ def run_bf_optimization(
 
     start: int = perf_counter()  # 开始时间
 
-    with ProcessPoolExecutor(
-            max_workers,
-            mp_context=get_context("spawn")
-    ) as executor:
-        it: Iterable = tqdm(
-            executor.map(evaluate_func, settings),
-            total=len(settings)
-        )
-        results: List[Tuple] = list(it)
-        results.sort(reverse=True, key=key_func)
-
-        end: int = perf_counter()
-        cost: int = int((end - start))
-        output(f"穷举算法优化完成，耗时{cost}秒")
-
-        return results
+    cached_results: List[Tuple] = []
+    if cache:
+        pending: List[Dict] = []
+        for setting in settings:
+            result: Optional[Tuple] = cache.get(setting)
+            if result:
+                cached_results.append(result)
+            else:
+                pending.append(setting)
+
+        output(f"命中缓存结果：{len(cached_results)}，需要回测：{len(pending)}")
+        settings = pending
+
+    total: int = len(settings)
+
+    executor: ProcessPoolExecutor = get_optimization_executor(max_workers)
+
+    # 默认每个进程分到约4个任务，兼顾负载均衡和进程间通信开销
+    if chunksize <= 0:
+        chunksize = max(1, ceil(total / (_executor_workers * 4)))
+
+    chunks: Dict[Future, List[Dict]] = {}
+    for i in range(0, total, chunksize):
+        chunk: List[Dict] = settings[i:i + chunksize]
+        future: Future = executor.submit(evaluate_chunk, evaluate_func, chunk)
+        chunks[future] = chunk
+    futures: List[Future] = list(chunks)
+
+    count: int = 0
+    last_report: float = 0
+
+    try:
+        with tqdm(total=total) as bar:
+            for future in as_completed(futures):
+                chunk_results: List[Tuple] = future.result()
+                count += len(chunk_results)
+                bar.update(len(chunk_results))
+
+                # 每完成一批即写入缓存，中断后再次运行可以继续
+                if cache:
+                    cache.put(chunks[future], chunk_results)
+
+                if not progress:
+                    continue
+
+                now: float = perf_counter()
+                if now - last_report < PROGRESS_INTERVAL and count < total:
+                    continue
+                last_report = now
+
+                eta: float = (now - start) / count * (total - count)
+                progress(count, total, eta)
+    except BrokenProcessPool:
+        # 子进程异常退出后进程池不可再用，下次优化重新创建
+        shutdown_optimization_executor()
+        raise
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    # 按提交顺序汇总，保证相同目标值的结果排序稳定
+    results: List[Tuple] = [result for future in futures for result in future.result()]
+    results.extend(cached_results)
+    results.sort(reverse=True, key=key_func)
+
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(f"穷举算法优化完成，耗时{cost}秒")
+
+    return results
 
 
 def run_ga_optimization(
@@ -132,7 +309,8 @@ def run_ga_optimization(
         max_workers: int = None,
         population_size: int = 100,  # 族群大小
         ngen_size: int = 30,  # 迭代代数
-        output: OUTPUT_FUNC = print
+        output: OUTPUT_FUNC = print,
+        cache: OptimizationCache = None  # 结果缓存，已计算过的参数组合不再回测
 ) -> List[Tuple]:
     """Run genetic algorithm optimization 运行遗传算法优化"""
     # Define functions for generate parameter randomly
@@ -152,10 +330,40 @@ def run_ga_optimization(
                 individual[i] = paramlist[i]
         return individual,
 
-    # Set up multiprocessing Pool and Manager
-    with Manager() as manager, Pool(max_workers) as pool:
-        # Create shared dict for result cache
-        cache: Dict[Tuple, Tuple] = manager.dict()
+    # Result of each individual in this run, kept in main process
+    results_map: Dict[Tuple, Tuple] = {}
+
+    # Set up multiprocessing Pool
+    with Pool(max_workers) as pool:
+        def evaluate_population(func: Callable, individuals: list) -> List[Tuple]:
+            """
+            Evaluate individuals in main process with cache lookup, only
+            unseen settings are dispatched to the pool.
+            在主进程中查询缓存，只把未计算过的参数组合分发到进程池
+            """
+            keys: List[Tuple] = [tuple(individual) for individual in individuals]
+
+            pending: List[Dict] = []
+            for key in dict.fromkeys(keys):
+                if key in results_map:
+                    continue
+
+                setting: dict = dict(key)
+                result: Optional[Tuple] = cache.get(setting) if cache else None
+                if result:
+                    results_map[key] = result
+                else:
+                    pending.append(setting)
+
+            if pending:
+                pending_results: List[Tuple] = pool.map(evaluate_func, pending)
+                for setting, result in zip(pending, pending_results):
+                    results_map[tuple(setting.items())] = result
+
+                if cache:
+                    cache.put(pending, pending_results)
+
+            return [func(results_map[key]) for key in keys]
 
         # Set up toolbox
         toolbox: base.Toolbox = base.Toolbox()
@@ -164,14 +372,8 @@ def run_ga_optimization(
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", mutate_individual, indpb=1)
         toolbox.register("select", tools.selNSGA2)
-        toolbox.register("map", pool.map)
-        toolbox.register(
-            "evaluate",
-            ga_evaluate,
-            cache,
-            evaluate_func,
-            key_func
-        )
+        toolbox.register("map", evaluate_population)
+        toolbox.register("evaluate", ga_evaluate, key_func)
 
         total_size: int = len(settings)
         pop_size: int = population_size  # number of individuals in each generation
@@ -211,28 +413,15 @@ def run_ga_optimization(
 
         output(f"遗传算法优化完成，耗时{cost}秒")
 
-        results: list = list(cache.values())
+        results: list = list(results_map.values())
         results.sort(reverse=True, key=key_func)
         return results
 
 
-def ga_evaluate(
-        cache: dict,
-        evaluate_func: callable,
-        key_func: callable,
-        parameters: list
-) -> float:
+def ga_evaluate(key_func: KEY_FUNC, result: Tuple) -> Tuple[float]:
     """
-    Functions to be run in genetic algorithm optimization.
-    要在遗传算法优化中运行的函数
+    Convert evaluation result into fitness of genetic algorithm.
+    将回测结果转换为遗传算法的适应度
     """
-    tp: tuple = tuple(parameters)
-    if tp in cache:
-        result: tuple = cache[tp]
-    else:
-        setting: dict = dict(parameters)
-        result: dict = evaluate_func(setting)
-        cache[tp] = result
-
     value: float = key_func(result)
     return (value,)
@@ -19,6 +19,12 @@ SETTINGS: Dict[str, Any] = {
     "log.level": CRITICAL,  # 记录等级
     "log.console": True,  #
     "log.file": True,
+    # 事件处理函数耗时统计
+    "event.profile": False,  # 统计启用
+    "event.profile_threshold": 0.05,  # 慢调用阈值秒数
+    "event.profile_interval": 60,  # 统计日志间隔秒数
+    # 事件引擎车道
+    "event.lanes": False,  # 交易回报和行情使用独立的事件处理线程
     # 邮件服务器配置
     "email.server": "smtp.qq.com",
     "email.port": 465,
@@ -37,7 +43,8 @@ SETTINGS: Dict[str, Any] = {
     "database.host": "127.0.0.1",
     "database.port": 3306,
     "database.user": "root",
-    "database.password": "111111"
+    "database.password": "111111",
+    "database.batch_size": 10000  # 批量写入时每条INSERT语句的行数
 }
 
 # Load global setting from json file.从json文件加载全局设置
@@ -257,7 +257,8 @@ class BaseMonitor(QtWidgets.QTableWidget):
         """
         if self.event_type:
             self.signal.connect(self.process_event)
-            self.event_engine.register(self.event_type, self.signal.emit)
+            # 按键更新的表格只需要每个键最新的数据
+            self.event_engine.register(self.event_type, self.signal.emit, coalesce_key=self.data_key)
 
     def process_event(self, event: Event) -> None:
         """
@@ -818,7 +819,7 @@ class TradingWidget(QtWidgets.QWidget):
     def register_event(self) -> None:
         """"""
         self.signal_tick.connect(self.process_tick_event)
-        self.event_engine.register(EVENT_TICK, self.signal_tick.emit)
+        self.event_engine.register(EVENT_TICK, self.signal_tick.emit, coalesce_key="vt_symbol")
 
     def process_tick_event(self, event: Event) -> None:
         """"""
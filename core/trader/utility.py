@@ -5,17 +5,27 @@ General utility functions.
 import json
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, tzinfo
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Type, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 import talib
 
 from .object import BarData, TickData
 from .constant import Exchange, Interval
+from .indicator import (
+    StreamIndicator,
+    SmaIndicator,
+    EmaIndicator,
+    StdIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    DonchianIndicator
+)
 
 if sys.version_info >= (3, 9):
     from zoneinfo import ZoneInfo, available_timezones  # noqa
@@ -456,6 +466,476 @@ class BarGenerator:
         return bar
 
 
+def _sum_windows(array: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Sum each window from left to right, same float result as accumulating bar by bar.
+    按窗口从左到右累加，与逐根K线累加的浮点结果一致
+    """
+    lengths: np.ndarray = ends - starts + 1
+    result: np.ndarray = np.zeros(len(starts))
+
+    for i in range(lengths.max()):
+        mask: np.ndarray = lengths > i
+        result[mask] += array[starts[mask] + i]
+
+    return result
+
+
+EPOCH_ORDINAL: int = datetime(1970, 1, 1).toordinal()
+
+
+def _to_wall_ns(dt: datetime) -> int:
+    """
+    Convert wall clock time of datetime into int64 nanoseconds, ignoring tzinfo.
+    将日期时间的本地时间部分转换为纳秒数
+    """
+    seconds: int = (((dt.toordinal() - EPOCH_ORDINAL) * 24 + dt.hour) * 60 + dt.minute) * 60 + dt.second
+    return (seconds * 1_000_000 + dt.microsecond) * 1000
+
+
+class BarSeries:
+    """
+    Columnar container of bar data with same symbol, exchange and interval.
+    列式K线序列，同一合约同一周期的K线按列存储在numpy数组中
+
+    Datetime is stored as int64 nanoseconds of wall clock time in tzinfo,
+    symbol related fields are stored only once. BarData object is only
+    created when a single bar is accessed, so a long history takes much
+    less memory than a list of BarData.
+    """
+
+    def __init__(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            gateway_name: str,
+            tzinfo: Optional[tzinfo],
+            datetime_array: np.ndarray,
+            open_array: np.ndarray,
+            high_array: np.ndarray,
+            low_array: np.ndarray,
+            close_array: np.ndarray,
+            volume_array: np.ndarray,
+            turnover_array: np.ndarray,
+            open_interest_array: np.ndarray
+    ) -> None:
+        """Constructor"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.interval: Interval = interval
+        self.gateway_name: str = gateway_name
+        self.tzinfo: Optional[tzinfo] = tzinfo
+
+        self.datetime_array: np.ndarray = datetime_array  # 本地时间纳秒数
+        self.open_array: np.ndarray = open_array
+        self.high_array: np.ndarray = high_array
+        self.low_array: np.ndarray = low_array
+        self.close_array: np.ndarray = close_array
+        self.volume_array: np.ndarray = volume_array
+        self.turnover_array: np.ndarray = turnover_array
+        self.open_interest_array: np.ndarray = open_interest_array
+
+    @classmethod
+    def from_bars(cls, bars: List[BarData]) -> "BarSeries":
+        """
+        Create bar series from list of bar data.
+        从BarData列表创建K线序列
+        """
+        bar: BarData = bars[0]
+        count: int = len(bars)
+
+        return cls(
+            symbol=bar.symbol,
+            exchange=bar.exchange,
+            interval=bar.interval,
+            gateway_name=bar.gateway_name,
+            tzinfo=bar.datetime.tzinfo,
+            datetime_array=np.fromiter((_to_wall_ns(bar.datetime) for bar in bars), np.int64, count),
+            open_array=np.fromiter((bar.open_price for bar in bars), float, count),
+            high_array=np.fromiter((bar.high_price for bar in bars), float, count),
+            low_array=np.fromiter((bar.low_price for bar in bars), float, count),
+            close_array=np.fromiter((bar.close_price for bar in bars), float, count),
+            volume_array=np.fromiter((bar.volume for bar in bars), float, count),
+            turnover_array=np.fromiter((bar.turnover for bar in bars), float, count),
+            open_interest_array=np.fromiter((bar.open_interest for bar in bars), float, count)
+        )
+
+    @classmethod
+    def concat(cls, series_list: List["BarSeries"]) -> "BarSeries":
+        """
+        Concatenate bar series of same symbol.
+        拼接同一合约的多个K线序列
+        """
+        series: BarSeries = series_list[0]
+
+        return cls(
+            symbol=series.symbol,
+            exchange=series.exchange,
+            interval=series.interval,
+            gateway_name=series.gateway_name,
+            tzinfo=series.tzinfo,
+            datetime_array=np.concatenate([s.datetime_array for s in series_list]),
+            open_array=np.concatenate([s.open_array for s in series_list]),
+            high_array=np.concatenate([s.high_array for s in series_list]),
+            low_array=np.concatenate([s.low_array for s in series_list]),
+            close_array=np.concatenate([s.close_array for s in series_list]),
+            volume_array=np.concatenate([s.volume_array for s in series_list]),
+            turnover_array=np.concatenate([s.turnover_array for s in series_list]),
+            open_interest_array=np.concatenate([s.open_interest_array for s in series_list])
+        )
+
+    def select(self, index: Union[slice, np.ndarray]) -> "BarSeries":
+        """
+        Select rows with slice (numpy view) or index array.
+        按切片或索引数组选取K线，切片不复制数据
+        """
+        return self.__class__(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            interval=self.interval,
+            gateway_name=self.gateway_name,
+            tzinfo=self.tzinfo,
+            datetime_array=self.datetime_array[index],
+            open_array=self.open_array[index],
+            high_array=self.high_array[index],
+            low_array=self.low_array[index],
+            close_array=self.close_array[index],
+            volume_array=self.volume_array[index],
+            turnover_array=self.turnover_array[index],
+            open_interest_array=self.open_interest_array[index]
+        )
+
+    def create_bar(
+            self,
+            dt: datetime,
+            open_price: float,
+            high_price: float,
+            low_price: float,
+            close_price: float,
+            volume: float,
+            turnover: float,
+            open_interest: float
+    ) -> BarData:
+        """
+        Create bar data object of one row.
+        生成单根K线对象
+        """
+        if self.tzinfo:
+            dt = dt.replace(tzinfo=self.tzinfo)
+
+        return BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=dt,
+            interval=self.interval,
+            gateway_name=self.gateway_name,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            close_price=close_price,
+            volume=volume,
+            turnover=turnover,
+            open_interest=open_interest
+        )
+
+    def get_bar(self, index: int) -> BarData:
+        """
+        Get bar data object of one row.
+        获取单根K线
+        """
+        dt: datetime = self.datetime_array[index].view("datetime64[ns]").astype("datetime64[us]").item()
+
+        return self.create_bar(
+            dt,
+            float(self.open_array[index]),
+            float(self.high_array[index]),
+            float(self.low_array[index]),
+            float(self.close_array[index]),
+            float(self.volume_array[index]),
+            float(self.turnover_array[index]),
+            float(self.open_interest_array[index])
+        )
+
+    def index(self, bar: BarData) -> int:
+        """
+        Return position of bar with same datetime, like list.index.
+        按时间查找K线所在位置
+        """
+        ns: int = _to_wall_ns(bar.datetime)
+        ix: int = int(np.searchsorted(self.datetime_array, ns))
+
+        if ix < len(self) and self.datetime_array[ix] == ns:
+            return ix
+        raise ValueError(f"{bar.datetime} is not in bar series")
+
+    def to_bars(self) -> List[BarData]:
+        """
+        Convert to list of bar data.
+        转换为BarData列表
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.datetime_array)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BarData, "BarSeries"]:
+        """"""
+        if isinstance(index, slice):
+            return self.select(index)
+        return self.get_bar(index)
+
+    def __iter__(self) -> Iterator[BarData]:
+        """
+        Iterate bar data objects, converted in chunks to keep memory flat.
+        分块转换为Python对象后逐根生成K线
+        """
+        chunk_size: int = 10_000
+
+        for i in range(0, len(self), chunk_size):
+            s: slice = slice(i, i + chunk_size)
+
+            yield from map(
+                self.create_bar,
+                self.datetime_array[s].view("datetime64[ns]").astype("datetime64[us]").tolist(),
+                self.open_array[s].tolist(),
+                self.high_array[s].tolist(),
+                self.low_array[s].tolist(),
+                self.close_array[s].tolist(),
+                self.volume_array[s].tolist(),
+                self.turnover_array[s].tolist(),
+                self.open_interest_array[s].tolist()
+            )
+
+
+# 工作进程中已连接的共享内存K线序列，每个进程只连接一次，只保留当前这一块
+_attached_series: Dict[str, Tuple[SharedMemory, BarSeries]] = {}
+
+
+class SharedBarSeries:
+    """
+    Bar series published into shared memory.
+    发布到共享内存的K线序列
+
+    Only shared memory name and symbol metadata are pickled, so passing it
+    to worker processes costs nothing no matter how long the history is.
+    Workers call attach to get a BarSeries whose arrays are zero-copy views
+    of the shared memory block.
+    """
+
+    columns: List[str] = [
+        "datetime_array",
+        "open_array",
+        "high_array",
+        "low_array",
+        "close_array",
+        "volume_array",
+        "turnover_array",
+        "open_interest_array"
+    ]
+
+    def __init__(self, series: BarSeries) -> None:
+        """Constructor"""
+        self.series_class: Type[BarSeries] = series.__class__
+        self.symbol: str = series.symbol
+        self.exchange: Exchange = series.exchange
+        self.interval: Interval = series.interval
+        self.gateway_name: str = series.gateway_name
+        self.tzinfo: Optional[tzinfo] = series.tzinfo
+        self.count: int = len(series)
+
+        # 各列依次写入同一块共享内存，每列8字节
+        self.shm: Optional[SharedMemory] = SharedMemory(
+            create=True,
+            size=max(self.count * 8 * len(self.columns), 1)
+        )
+        self.name: str = self.shm.name
+
+        for i, column in enumerate(self.columns):
+            array: np.ndarray = self.get_column(self.shm, i)
+            array[:] = getattr(series, column)
+
+    def get_column(self, shm: SharedMemory, i: int) -> np.ndarray:
+        """获取共享内存中的一列"""
+        dtype: type = np.int64 if i == 0 else np.float64
+        return np.ndarray((self.count,), dtype=dtype, buffer=shm.buf, offset=i * self.count * 8)
+
+    def attach(self) -> BarSeries:
+        """
+        Attach to shared memory and return bar series of zero-copy views.
+        连接共享内存，返回零拷贝的K线序列
+        """
+        if self.name in _attached_series:
+            return _attached_series[self.name][1]
+
+        # 工作进程在多次优化之间复用，断开之前优化的共享内存，
+        # 发布进程unlink后最后一个映射关闭时才会释放内存
+        self.detach_all()
+
+        shm: SharedMemory = SharedMemory(name=self.name)
+
+        arrays: dict = {
+            column: self.get_column(shm, i)
+            for i, column in enumerate(self.columns)
+        }
+        series: BarSeries = self.series_class(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            interval=self.interval,
+            gateway_name=self.gateway_name,
+            tzinfo=self.tzinfo,
+            **arrays
+        )
+
+        _attached_series[self.name] = (shm, series)
+        return series
+
+    @staticmethod
+    def detach_all() -> None:
+        """
+        Close all shared memory attached in this process.
+        关闭当前进程中已连接的全部共享内存
+        """
+        while _attached_series:
+            name, (shm, series) = _attached_series.popitem()
+            del series
+            try:
+                shm.close()
+            except BufferError:
+                # 仍有数组引用时，由最后一个引用释放后的垃圾回收关闭
+                pass
+
+    def release(self) -> None:
+        """
+        Close and unlink shared memory, called by the publishing process.
+        关闭并释放共享内存，由创建共享内存的进程调用
+        """
+        if not self.shm:
+            return
+
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def __getstate__(self) -> dict:
+        """序列化时不包含共享内存对象"""
+        state: dict = self.__dict__.copy()
+        state["shm"] = None
+        return state
+
+
+MINUTE_NS: int = 60_000_000_000
+HOUR_NS: int = 60 * MINUTE_NS
+
+
+def resample_series(
+        series: BarSeries,
+        window: int,
+        interval: Interval = Interval.MINUTE
+) -> BarSeries:
+    """
+    Generate x minute/x hour bars from bar series with numpy.
+    The result is the same as feeding bars one by one into
+    BarGenerator.update_bar, including unfinished window bar being dropped.
+    Hour bars are only vectorized from hour bars, other sources go through
+    BarGenerator.
+    使用numpy向量化合成x分钟/x小时K线，结果与BarGenerator逐根合成一致，
+    小时K线只对小时数据源向量化合成，其他数据源逐根合成
+    """
+    count: int = len(series)
+    datetime_array: np.ndarray = series.datetime_array
+
+    if interval == Interval.MINUTE:
+        minute_array: np.ndarray = datetime_array // MINUTE_NS % 60
+
+        # 分钟数+1能被窗口整除的K线是窗口的最后一根
+        finished: np.ndarray = (minute_array + 1) % window == 0
+        starts: np.ndarray = np.flatnonzero(np.concatenate(([True], finished[:-1])))
+
+        # 最后一个窗口未完成则丢弃
+        if count and not finished[-1]:
+            count = starts[-1]
+            starts = starts[:-1]
+
+        floor_ns: int = MINUTE_NS
+    elif interval == Interval.HOUR:
+        # 分钟数据源时BarGenerator在每小时第一根K线和59分各推送一次小时K线，逐根合成
+        if (datetime_array % HOUR_NS).any():
+            return _generate_series(series, window, interval)
+
+        hour_array: np.ndarray = datetime_array // HOUR_NS % 24
+
+        # 同一小时的连续K线合并到同一根小时K线
+        new_hour: np.ndarray = np.concatenate(([True], hour_array[1:] != hour_array[:-1]))
+        starts: np.ndarray = np.flatnonzero(new_hour)
+
+        # 多小时窗口按小时K线数量合成，合并进已推送小时K线的数据不再计入窗口
+        if window != 1:
+            series = series.select(starts)
+
+            count = len(series) - len(series) % window
+            starts = np.arange(0, count, window)
+
+        floor_ns: int = HOUR_NS
+    else:
+        raise ValueError(f"不支持的K线周期：{interval}")
+
+    if not len(starts):
+        return series.select(slice(0, 0))
+
+    ends: np.ndarray = np.append(starts[1:], count) - 1
+
+    datetime_array = series.datetime_array[starts]
+
+    return series.__class__(
+        symbol=series.symbol,
+        exchange=series.exchange,
+        interval=None,
+        gateway_name=series.gateway_name,
+        tzinfo=series.tzinfo,
+        datetime_array=datetime_array - datetime_array % floor_ns,
+        open_array=series.open_array[starts],
+        high_array=np.maximum.reduceat(series.high_array[:count], starts),
+        low_array=np.minimum.reduceat(series.low_array[:count], starts),
+        close_array=series.close_array[ends],
+        volume_array=_sum_windows(series.volume_array, starts, ends),
+        turnover_array=_sum_windows(series.turnover_array, starts, ends),
+        open_interest_array=series.open_interest_array[ends]
+    )
+
+
+def _generate_series(series: BarSeries, window: int, interval: Interval) -> BarSeries:
+    """
+    Generate window bars by feeding bars one by one into BarGenerator.
+    逐根K线输入BarGenerator合成
+    """
+    window_bars: List[BarData] = []
+    generator: BarGenerator = BarGenerator(None, window, window_bars.append, interval)
+    for bar in series:
+        generator.update_bar(bar)
+
+    if not window_bars:
+        return series.select(slice(0, 0))
+    return series.__class__.from_bars(window_bars)
+
+
+def resample_bars(
+        bars: List[BarData],
+        window: int,
+        interval: Interval = Interval.MINUTE
+) -> List[BarData]:
+    """
+    Generate x minute/x hour bars from bar list with numpy.
+    使用numpy向量化合成x分钟/x小时K线，结果与BarGenerator逐根合成一致
+    """
+    if not bars:
+        return []
+
+    series: BarSeries = resample_series(BarSeries.from_bars(bars), window, interval)
+    return series.to_bars()
+
+
 class ArrayManager(object):
     """
     For:
@@ -1020,6 +1500,206 @@ class ArrayManager(object):
         return k[-1], d[-1]
 
 
+class RingArrayManager(ArrayManager):
+    """
+    ArrayManager backed by ring buffers, new bar is appended in O(1).
+    环形缓冲区K线容器，新K线写入复杂度O(1)，适合大size的分钟级回测
+
+    Each value is written twice (at pos and pos + size), so the latest
+    size values are always a contiguous slice of the buffer, which can be
+    passed to talib directly without copying.
+    """
+
+    def __init__(self, size: int = 100) -> None:
+        """Constructor"""
+        self.count: int = 0  # K线数量
+        self.size: int = size  # 数组储存K线数量大小
+        self.inited: bool = False  # 数组初始化状态
+
+        self.pos: int = 0  # 下一根K线的写入位置
+
+        # 缓冲区长度为2倍size，每个值同时写入pos和pos+size
+        self.open_buffer: np.ndarray = np.zeros(size * 2)
+        self.high_buffer: np.ndarray = np.zeros(size * 2)
+        self.low_buffer: np.ndarray = np.zeros(size * 2)
+        self.close_buffer: np.ndarray = np.zeros(size * 2)
+        self.volume_buffer: np.ndarray = np.zeros(size * 2)
+        self.turnover_buffer: np.ndarray = np.zeros(size * 2)
+        self.open_interest_buffer: np.ndarray = np.zeros(size * 2)
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update new bar data into array manager.
+        更新K线数据
+        """
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        pos: int = self.pos
+        mirror: int = pos + self.size
+
+        self.open_buffer[pos] = self.open_buffer[mirror] = bar.open_price
+        self.high_buffer[pos] = self.high_buffer[mirror] = bar.high_price
+        self.low_buffer[pos] = self.low_buffer[mirror] = bar.low_price
+        self.close_buffer[pos] = self.close_buffer[mirror] = bar.close_price
+        self.volume_buffer[pos] = self.volume_buffer[mirror] = bar.volume
+        self.turnover_buffer[pos] = self.turnover_buffer[mirror] = bar.turnover
+        self.open_interest_buffer[pos] = self.open_interest_buffer[mirror] = bar.open_interest
+
+        self.pos = (pos + 1) % self.size
+
+    @property
+    def open_array(self) -> np.ndarray:
+        """开盘价窗口视图"""
+        return self.open_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def high_array(self) -> np.ndarray:
+        """最高价窗口视图"""
+        return self.high_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def low_array(self) -> np.ndarray:
+        """最低价窗口视图"""
+        return self.low_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def close_array(self) -> np.ndarray:
+        """收盘价窗口视图"""
+        return self.close_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def volume_array(self) -> np.ndarray:
+        """成交量窗口视图"""
+        return self.volume_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def turnover_array(self) -> np.ndarray:
+        """成交额窗口视图"""
+        return self.turnover_buffer[self.pos:self.pos + self.size]
+
+    @property
+    def open_interest_array(self) -> np.ndarray:
+        """持仓量窗口视图"""
+        return self.open_interest_buffer[self.pos:self.pos + self.size]
+
+
+class StreamArrayManager(RingArrayManager):
+    """
+    ArrayManager with streaming indicators.
+    增量指标K线容器
+
+    The first scalar call of sma/ema/std/atr/rsi/boll/keltner/donchian
+    creates a streaming indicator, warmed up with the current window, which
+    is then updated in O(1) by every update_bar. The results equal
+    ArrayManager, recursive indicators included: they are reseeded at the
+    start of the window as talib does on every ArrayManager call.
+
+    Calls with array=True and macd still go through talib, as the signal
+    line of a window reseeded macd cannot be updated incrementally.
+    增量指标结果与ArrayManager一致，macd和array=True的调用仍使用talib计算
+    """
+
+    def __init__(self, size: int = 100) -> None:
+        """Constructor"""
+        super().__init__(size)
+
+        self.indicators: Dict[tuple, StreamIndicator] = {}
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update new bar data into array manager and streaming indicators.
+        更新K线数据和增量指标
+        """
+        super().update_bar(bar)
+
+        high: float = bar.high_price
+        low: float = bar.low_price
+        close: float = bar.close_price
+
+        for indicator in self.indicators.values():
+            indicator.update(high, low, close)
+
+    def get_indicator(self, indicator_class: Type[StreamIndicator], *args) -> StreamIndicator:
+        """
+        Get streaming indicator, create and warm up it if not exists.
+        获取增量指标，首次调用时使用当前窗口内的K线预热
+        """
+        key: tuple = (indicator_class, *args)
+        indicator: Optional[StreamIndicator] = self.indicators.get(key, None)
+
+        if not indicator:
+            indicator = indicator_class(*args)
+
+            high: np.ndarray = self.high
+            low: np.ndarray = self.low
+            close: np.ndarray = self.close
+
+            # 包括尚未写入K线的0值，与ArrayManager窗口一致
+            for i in range(self.size):
+                indicator.update(high[i], low[i], close[i])
+
+            self.indicators[key] = indicator
+
+        return indicator
+
+    def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Simple moving average.
+        简单移动均线
+        """
+        if array:
+            return super().sma(n, array)
+        return self.get_indicator(SmaIndicator, n).value
+
+    def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Exponential moving average.
+        指数移动平均线
+        """
+        if array:
+            return super().ema(n, array)
+        return self.get_indicator(EmaIndicator, n, self.size).value
+
+    def std(self, n: int, nbdev: int = 1, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Standard deviation.
+        """
+        if array:
+            return super().std(n, nbdev, array)
+        return self.get_indicator(StdIndicator, n, nbdev).value
+
+    def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Average True Range (ATR).
+        """
+        if array:
+            return super().atr(n, array)
+        return self.get_indicator(AtrIndicator, n, self.size).value
+
+    def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Relative Strenght Index (RSI).
+        """
+        if array:
+            return super().rsi(n, array)
+        return self.get_indicator(RsiIndicator, n, self.size).value
+
+    def donchian(
+            self, n: int, array: bool = False
+    ) -> Union[
+        Tuple[np.ndarray, np.ndarray],
+        Tuple[float, float]
+    ]:
+        """
+        Donchian Channel.
+        """
+        if array:
+            return super().donchian(n, array)
+        return self.get_indicator(DonchianIndicator, n).value
+
+
 def virtual(func: Callable) -> Callable:
     """
     mark a function as "virtual", which means that this function can be override.
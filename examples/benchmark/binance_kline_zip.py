@@ -0,0 +1,124 @@
+"""
+Benchmark of reading Binance kline archives.
+Generate one month of daily 1-minute kline zips, then compare the legacy
+path (extract to disk, csv.DictReader, one BarData per row) with
+load_kline_series reading csv members straight out of the zips.
+币安K线zip文件读取性能测试
+"""
+
+import csv
+import os
+import random
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import List
+
+from core.trader.constant import Exchange, Interval
+from core.trader.object import BarData
+from apps.vnpy_datamanager.datafeed.zquant_binancedata.binance_datafeed import load_kline_series
+
+SYMBOL = "BTCUSDT"
+EXCHANGE = Exchange.BINANCE
+INTERVAL = Interval.MINUTE
+START = datetime(2023, 1, 1)
+DAYS = 31
+HEADER = "open_time,open,high,low,close,volume,close_time,quote_volume,count," \
+         "taker_buy_volume,taker_buy_quote_volume,ignore\n"
+
+
+def generate_files(folder: str) -> List[str]:
+    """生成一个月的日度1分钟K线zip文件"""
+    files: List[str] = []
+    price: float = 16500
+
+    for day in range(DAYS):
+        date: datetime = START + timedelta(days=day)
+        name: str = f"{SYMBOL}-1m-{date:%Y-%m-%d}"
+        lines: List[str] = []
+
+        for minute in range(1440):
+            open_time: int = int((date + timedelta(minutes=minute)).timestamp()) * 1000
+            close_price: float = price + random.uniform(-10, 10)
+            volume: float = random.uniform(0, 100)
+            lines.append(
+                f"{open_time},{price:.2f},{max(price, close_price) + 1:.2f},{min(price, close_price) - 1:.2f},"
+                f"{close_price:.2f},{volume:.5f},{open_time + 59999},{volume * price:.8f},100,"
+                f"{volume / 2:.5f},{volume * price / 2:.8f},0\n"
+            )
+            price = close_price
+
+        file_path: str = os.path.join(folder, name + ".zip")
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as f:
+            f.writestr(name + ".csv", "".join(lines))
+        files.append(file_path)
+
+    return files
+
+
+def load_legacy(files: List[str]) -> List[BarData]:
+    """旧版解压到磁盘后逐行读取csv并创建BarData"""
+    folder: str = os.path.dirname(files[0])
+    csv_path: str = folder + "csv"
+    bars: List[BarData] = []
+
+    try:
+        for file_path in files:
+            with zipfile.ZipFile(file_path, "r") as zip_ref:
+                zip_ref.extractall(csv_path)
+
+        for file in sorted(os.listdir(csv_path)):
+            with open(os.path.join(csv_path, file), "rt") as f:
+                buf: list = [line.replace("\0", "") for line in f]
+
+            if HEADER != buf[0]:
+                buf.insert(0, HEADER)
+
+            for item in csv.DictReader(buf, delimiter=","):
+                dt: datetime = datetime(1970, 1, 1) + timedelta(seconds=int(item["open_time"]) // 1000)
+
+                bar: BarData = BarData(
+                    symbol=SYMBOL,
+                    exchange=EXCHANGE,
+                    datetime=dt,
+                    interval=INTERVAL,
+                    volume=float(item["volume"]),
+                    open_price=float(item["open"]),
+                    high_price=float(item["high"]),
+                    low_price=float(item["low"]),
+                    close_price=float(item["close"]),
+                    turnover=float(item["quote_volume"]),
+                    open_interest=float(item.get("open_interest", 0)),
+                    gateway_name="DB"
+                )
+                bars.append(bar)
+    finally:
+        shutil.rmtree(csv_path, ignore_errors=True)
+
+    return bars
+
+
+def run_benchmark(name: str, func: callable, *args):
+    """运行并输出耗时和每秒处理行数"""
+    start: float = perf_counter()
+    data = func(*args)
+    cost: float = perf_counter() - start
+    print(f"{name}：{len(data)}条，耗时{cost:.3f}秒，{len(data) / cost:.0f}条/秒")
+    return data
+
+
+if __name__ == "__main__":
+    folder: str = tempfile.mkdtemp()
+
+    try:
+        files: List[str] = generate_files(folder)
+
+        bars: List[BarData] = run_benchmark("旧版解压读取csv", load_legacy, files)
+        series = run_benchmark("load_kline_series", load_kline_series, files, SYMBOL, EXCHANGE, INTERVAL)
+
+        # 检查两种方式读取的数据一致
+        assert bars == series.to_bars()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,72 @@
+"""
+Benchmark of Binance signed request preparation.
+Compare the legacy path (encode params, sign with a freshly keyed HMAC or
+a freshly parsed RSA key, then encode params again) with the cached signer
+used by API, without sending requests.
+币安签名请求性能测试
+"""
+
+from time import perf_counter
+from typing import Callable
+
+from Crypto.PublicKey import RSA
+
+from sdk.binance_sdk.binance.api import API
+from sdk.binance_sdk.binance.lib.authentication import hmac_hashing, rsa_signature
+from sdk.binance_sdk.binance.lib.utils import cleanNoneValue, encoded_string, get_timestamp
+
+COUNT = 20_000
+RSA_COUNT = 100
+API_SECRET = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+PRIVATE_KEY_PASS = "password"
+PRIVATE_KEY = RSA.generate(2048).export_key(
+    passphrase=PRIVATE_KEY_PASS,
+    pkcs=8,
+    protection="PBKDF2WithHMAC-SHA1AndAES128-CBC"
+).decode("utf-8")
+
+
+def make_payload() -> dict:
+    """生成下单参数"""
+    return {
+        "symbol": "BTCUSDT",
+        "side": "BUY",
+        "type": "LIMIT",
+        "timeInForce": "GTC",
+        "quantity": 0.001,
+        "price": 30000,
+        "newClientOrderId": None,
+        "recvWindow": 5000
+    }
+
+
+def sign_legacy(api: API, payload: dict) -> str:
+    """旧版每次重新解析密钥，并编码两次参数"""
+    payload["timestamp"] = get_timestamp()
+    query_string: str = encoded_string(cleanNoneValue(payload))
+
+    if api.private_key:
+        payload["signature"] = rsa_signature(api.private_key, query_string, api.private_key_pass)
+    else:
+        payload["signature"] = hmac_hashing(api.api_secret, query_string)
+
+    return encoded_string(cleanNoneValue(payload))
+
+
+def run_benchmark(name: str, func: Callable, api: API, count: int) -> None:
+    """运行并输出每秒签名请求数"""
+    start: float = perf_counter()
+    for _ in range(count):
+        func(api, make_payload())
+    cost: float = perf_counter() - start
+    print(f"{name}：{count}次，耗时{cost:.2f}秒，{count / cost:.0f}次/秒")
+
+
+if __name__ == "__main__":
+    hmac_api: API = API(api_secret=API_SECRET)
+    run_benchmark("旧版HMAC签名", sign_legacy, hmac_api, COUNT)
+    run_benchmark("HMAC签名器", API._get_signed_query, hmac_api, COUNT)
+
+    rsa_api: API = API(private_key=PRIVATE_KEY, private_key_pass=PRIVATE_KEY_PASS)
+    run_benchmark("旧版RSA签名", sign_legacy, rsa_api, RSA_COUNT)
+    run_benchmark("RSA签名器", API._get_signed_query, rsa_api, RSA_COUNT)
@@ -0,0 +1,91 @@
+"""
+Benchmark of CtaEngine local stop order lookup.
+Compare the legacy scan over all stop orders on every tick with the
+StopOrderBook index, with resting stop orders spread over many symbols
+and ticks that rarely trigger any of them.
+CTA本地停止单触发检查性能测试
+"""
+
+import random
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from core.trader.constant import Direction, Offset
+from apps.vnpy_ctastrategy.base import StopOrder, StopOrderBook
+
+SYMBOLS = 50
+TICKS = 100_000
+PRICE = 100
+
+
+def legacy_triggered(stop_orders: Dict[str, StopOrder], vt_symbol: str, price: float) -> List[StopOrder]:
+    """旧版遍历全部停止单"""
+    triggered: List[StopOrder] = []
+    for stop_order in list(stop_orders.values()):
+        if stop_order.vt_symbol != vt_symbol:
+            continue
+
+        long_triggered = stop_order.direction == Direction.LONG and price >= stop_order.price
+        short_triggered = stop_order.direction == Direction.SHORT and price <= stop_order.price
+        if long_triggered or short_triggered:
+            triggered.append(stop_order)
+    return triggered
+
+
+def create_orders(count: int) -> List[StopOrder]:
+    """多单挂在现价上方，空单挂在现价下方"""
+    orders: List[StopOrder] = []
+    for i in range(count):
+        direction: Direction = Direction.LONG if i % 2 else Direction.SHORT
+        offset: float = random.uniform(0.5, 10)
+        orders.append(StopOrder(
+            vt_symbol=f"SYMBOL{i % SYMBOLS}.BINANCE",
+            direction=direction,
+            offset=Offset.OPEN,
+            price=PRICE + offset if direction == Direction.LONG else PRICE - offset,
+            volume=1,
+            stop_orderid=f"STOP.{i + 1}",
+            strategy_name=f"strategy{i % 100}",
+            datetime=datetime.now()
+        ))
+    return orders
+
+
+def run(func: Callable[[str, float], List[StopOrder]], ticks: List[Tuple[str, float]]) -> Tuple[float, int]:
+    """返回每个tick的平均耗时微秒和触发数量"""
+    triggered: int = 0
+    start: float = perf_counter()
+    for vt_symbol, price in ticks:
+        triggered += len(func(vt_symbol, price))
+    return (perf_counter() - start) / len(ticks) * 1_000_000, triggered
+
+
+def run_benchmark(count: int) -> None:
+    """"""
+    orders: List[StopOrder] = create_orders(count)
+    stop_orders: Dict[str, StopOrder] = {order.stop_orderid: order for order in orders}
+    book: StopOrderBook = StopOrderBook()
+    for order in orders:
+        book.add(order)
+
+    ticks: List[Tuple[str, float]] = [
+        (f"SYMBOL{random.randrange(SYMBOLS)}.BINANCE", PRICE + random.gauss(0, 1)) for _ in range(TICKS)
+    ]
+
+    # 两种方式触发的停止单一致
+    for vt_symbol, price in ticks[:1000]:
+        assert legacy_triggered(stop_orders, vt_symbol, price) == book.get_triggered(vt_symbol, price)
+
+    legacy_cost, legacy_count = run(lambda vt_symbol, price: legacy_triggered(stop_orders, vt_symbol, price), ticks)
+    book_cost, book_count = run(book.get_triggered, ticks)
+    assert legacy_count == book_count
+
+    print(f"{count}个停止单，{TICKS}个tick，触发{book_count}次：旧版{legacy_cost:.2f}微秒/tick，"
+          f"索引{book_cost:.2f}微秒/tick，加速{legacy_cost / book_cost:.0f}倍")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for count in [100, 1_000, 5_000]:
+        run_benchmark(count)
@@ -0,0 +1,167 @@
+"""
+Benchmark of EventEngine dispatch.
+Compare the legacy engine (queue.Queue, one event per get, list comprehension
+per dispatch) with the batched engine: throughput with several producer
+threads, p99 latency from put to handler, and a slow UI handler with and
+without coalescing by vt_symbol. Finally the latency of trade events
+during a tick flood, with and without a separate trading lane.
+事件引擎分发性能测试
+"""
+
+from queue import Empty, Queue
+from threading import Thread
+from time import perf_counter, sleep
+from typing import Callable, List, Type
+
+import numpy as np
+
+from core.event import Event, EventEngine
+
+EVENT_TICK = "eTick."
+EVENT_TRADE = "eTrade."
+PRODUCERS = 4
+COUNT = 50_000  # 每个生产线程的事件数
+SYMBOLS = 100
+UI_COST = 0.00002  # 界面处理函数每次耗时
+
+
+class LegacyEventEngine(EventEngine):
+    """旧版逐个取出事件的事件引擎"""
+
+    def __init__(self, interval: int = 1) -> None:
+        """"""
+        super().__init__(interval)
+        self._queue: Queue = Queue()
+        self._thread: Thread = Thread(target=self._run)
+
+    def start(self) -> None:
+        """"""
+        self._active = True
+        self._thread.start()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """"""
+        self._active = False
+        self._timer.join()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """"""
+        while self._active:
+            try:
+                event: Event = self._queue.get(block=True, timeout=1)
+                self._process(event)
+            except Empty:
+                pass
+
+    def _process(self, event: Event, skipped: set = None) -> None:
+        """"""
+        if event.type in self._handlers:
+            [handler(event) for handler in self._handlers[event.type]]
+
+        if self._general_handlers:
+            [handler(event) for handler in self._general_handlers]
+
+    def put(self, event: Event) -> None:
+        """"""
+        self._queue.put(event)
+
+
+class TickStub:
+    """只包含合并键和放入时间的行情数据"""
+
+    __slots__ = ("vt_symbol", "time")
+
+    def __init__(self, vt_symbol: str) -> None:
+        """"""
+        self.vt_symbol: str = vt_symbol
+        self.time: float = perf_counter()
+
+
+def produce(engine: EventEngine, count: int, interval: float = 0) -> None:
+    """生产线程，interval大于0时按批次推送，模拟行情突发"""
+    for i in range(count):
+        engine.put(Event(EVENT_TICK, TickStub(f"SYMBOL{i % SYMBOLS}.BINANCE")))
+        if interval and not i % 100:
+            sleep(interval)
+
+
+def run_benchmark(name: str, engine_class: Type[EventEngine], ui_handler: Callable = None, coalesce: bool = False,
+                  interval: float = 0) -> None:
+    """运行并输出每秒处理事件数和分发延迟"""
+    engine: EventEngine = engine_class()
+    latencies: List[float] = []
+    total: int = PRODUCERS * COUNT
+
+    def strategy_handler(event: Event) -> None:
+        latencies.append(perf_counter() - event.data.time)
+
+    engine.register(EVENT_TICK, strategy_handler)
+    if ui_handler:
+        if coalesce:
+            engine.register(EVENT_TICK, ui_handler, coalesce_key="vt_symbol")
+        else:
+            engine.register(EVENT_TICK, ui_handler)
+
+    engine.start()
+    start: float = perf_counter()
+
+    producers: List[Thread] = [Thread(target=produce, args=(engine, COUNT, interval)) for _ in range(PRODUCERS)]
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+
+    while len(latencies) < total:
+        sleep(0.001)
+    cost: float = perf_counter() - start
+    engine.stop()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{name}：{total}个事件，耗时{cost:.2f}秒，{total / cost:.0f}个/秒，"
+          f"延迟p50 {p50:.2f}毫秒，p99 {p99:.2f}毫秒")
+
+
+def ui_handler(event: Event) -> None:
+    """模拟界面刷新耗时"""
+    end: float = perf_counter() + UI_COST
+    while perf_counter() < end:
+        pass
+
+
+def run_trade_benchmark(name: str, engine: EventEngine, count: int = 500) -> None:
+    """行情突发期间每隔1毫秒推送成交，输出成交事件的分发延迟"""
+    latencies: List[float] = []
+    engine.register(EVENT_TICK, ui_handler)
+    engine.register(EVENT_TRADE, lambda event: latencies.append(perf_counter() - event.data.time))
+    engine.start()
+
+    producers: List[Thread] = [Thread(target=produce, args=(engine, COUNT // 10)) for _ in range(PRODUCERS)]
+    for thread in producers:
+        thread.start()
+
+    for i in range(count):
+        engine.put(Event(EVENT_TRADE, TickStub(f"SYMBOL{i % SYMBOLS}.BINANCE")))
+        sleep(0.001)
+
+    for thread in producers:
+        thread.join()
+    while len(latencies) < count:
+        sleep(0.001)
+    engine.stop()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{name}：{count}个成交事件，延迟p50 {p50:.2f}毫秒，p99 {p99:.2f}毫秒")
+
+
+if __name__ == "__main__":
+    run_benchmark("旧版引擎", LegacyEventEngine)
+    run_benchmark("批量引擎", EventEngine)
+
+    run_benchmark("旧版引擎+界面", LegacyEventEngine, ui_handler, interval=0.001)
+    run_benchmark("批量引擎+界面", EventEngine, ui_handler, interval=0.001)
+    run_benchmark("批量引擎+界面合并", EventEngine, ui_handler, coalesce=True, interval=0.001)
+
+    run_trade_benchmark("单车道成交", EventEngine())
+    run_trade_benchmark("交易车道成交", EventEngine(lanes=[("trading", [EVENT_TRADE])]))
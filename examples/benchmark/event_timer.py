@@ -0,0 +1,81 @@
+"""
+Benchmark of EventEngine timer accuracy.
+Compare the legacy timer (sleep interval, then put behind the backlog) with
+the scheduler timer on the default lane and on its own lane, while a tick
+flood with a slow UI handler keeps the default lane busy. Lateness is
+measured against the ideal schedule start + n * interval.
+事件引擎计时器精度测试
+"""
+
+from threading import Thread
+from time import perf_counter, sleep
+from typing import List
+
+import numpy as np
+
+from core.event import Event, EventEngine, EVENT_TIMER
+
+EVENT_TICK = "eTick."
+EVENT_FAST_TIMER = "eTimer.fast"
+INTERVAL = 0.05  # 计时器间隔秒数
+DURATION = 3  # 测试秒数
+UI_COST = 0.00002  # 界面处理函数每次耗时
+
+
+class LegacyEventEngine(EventEngine):
+    """旧版按间隔休眠的计时器"""
+
+    def _run_timer(self) -> None:
+        """"""
+        while self._active:
+            sleep(self._interval)
+            self.put(Event(EVENT_TIMER))
+
+
+def ui_handler(event: Event) -> None:
+    """模拟界面刷新耗时"""
+    end: float = perf_counter() + UI_COST
+    while perf_counter() < end:
+        pass
+
+
+def produce(engine: EventEngine, end: float) -> None:
+    """行情推送线程，推送速度超过界面处理速度"""
+    while perf_counter() < end:
+        for i in range(200):
+            engine.put(Event(EVENT_TICK, i))
+        sleep(0.001)
+
+
+def run_benchmark(name: str, engine: EventEngine, type: str = EVENT_TIMER, load: bool = True) -> None:
+    """运行并输出计时事件相对理想计划时间的延迟"""
+    times: List[float] = []
+    engine.register(EVENT_TICK, ui_handler)
+    engine.register(type, lambda event: times.append(perf_counter()))
+    if type != EVENT_TIMER:
+        engine.add_timer(INTERVAL, type)
+
+    start: float = perf_counter()
+    engine.start()
+
+    if load:
+        producer: Thread = Thread(target=produce, args=(engine, start + DURATION))
+        producer.start()
+        producer.join()
+    else:
+        sleep(DURATION)
+    engine.stop()
+
+    lateness: np.ndarray = (np.array(times) - start - INTERVAL * np.arange(1, len(times) + 1)) * 1000
+    p50, p99 = np.percentile(lateness, [50, 99])
+    print(f"{name}：{len(times)}次计时事件（理想{int(DURATION / INTERVAL)}次），"
+          f"延迟p50 {p50:.2f}毫秒，p99 {p99:.2f}毫秒，最后一次 {lateness[-1]:.2f}毫秒")
+
+
+if __name__ == "__main__":
+    run_benchmark("旧版计时器空载", LegacyEventEngine(INTERVAL), load=False)
+    run_benchmark("计划计时器空载", EventEngine(INTERVAL), load=False)
+
+    run_benchmark("旧版计时器", LegacyEventEngine(INTERVAL))
+    run_benchmark("计划计时器", EventEngine(INTERVAL))
+    run_benchmark("计划计时器+独立车道", EventEngine(lanes=[("timer", [EVENT_FAST_TIMER])]), EVENT_FAST_TIMER)
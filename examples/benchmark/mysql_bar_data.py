@@ -0,0 +1,143 @@
+"""
+Benchmark of bar data saving and loading in MysqlDatabase.
+Save 1M synthetic 1-minute bars under a temporary symbol with the legacy
+REPLACE path, with save_bar_data and with save_bar_series, then compare the legacy model-object
+loop with load_bar_data and load_bar_series.
+MySQL数据库K线读写性能测试
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import List
+
+from peewee import chunked
+
+from core.trader.constant import Exchange, Interval
+from core.trader.object import BarData
+from core.trader.database import DB_TZ, convert_tz
+from core.trader.utility import BarSeries
+from apps.vnpy_datamanager.database.vnpy_mysql.mysql_database import (
+    MysqlDatabase,
+    DbBarData
+)
+
+SYMBOL = "BENCHMARK"
+EXCHANGE = Exchange.BINANCE
+INTERVAL = Interval.MINUTE
+COUNT = 1_000_000
+START = datetime(2020, 1, 1)
+END = START + timedelta(minutes=COUNT - 1)
+
+
+def generate_bars() -> List[BarData]:
+    """生成测试数据"""
+    bars: List[BarData] = []
+    for i in range(COUNT):
+        price: float = 10000 + i % 1000
+        bar: BarData = BarData(
+            symbol=SYMBOL,
+            exchange=EXCHANGE,
+            datetime=(START + timedelta(minutes=i)).replace(tzinfo=DB_TZ),
+            interval=INTERVAL,
+            open_price=price,
+            high_price=price + 5,
+            low_price=price - 5,
+            close_price=price + 1,
+            volume=i,
+            turnover=i * price,
+            gateway_name="DB"
+        )
+        bars.append(bar)
+    return bars
+
+
+def save_legacy(bars: List[BarData]) -> List[BarData]:
+    """旧版每50条REPLACE写入并统计全部数据量的保存方式"""
+    data: list = []
+    for bar in bars:
+        data.append({
+            "symbol": bar.symbol,
+            "exchange": bar.exchange.value,
+            "interval": bar.interval.value,
+            "datetime": convert_tz(bar.datetime),
+            "open_price": bar.open_price,
+            "high_price": bar.high_price,
+            "low_price": bar.low_price,
+            "close_price": bar.close_price,
+            "volume": bar.volume,
+            "turnover": bar.turnover,
+            "open_interest": bar.open_interest
+        })
+
+    with DbBarData._meta.database.atomic():
+        for c in chunked(data, 50):
+            DbBarData.insert_many(c).on_conflict_replace().execute()
+
+    DbBarData.select().where(
+        (DbBarData.symbol == SYMBOL)
+        & (DbBarData.exchange == EXCHANGE.value)
+        & (DbBarData.interval == INTERVAL.value)
+    ).count()
+    return bars
+
+
+def load_legacy() -> List[BarData]:
+    """旧版逐行创建模型对象的加载方式"""
+    s = (
+        DbBarData.select().where(
+            (DbBarData.symbol == SYMBOL)
+            & (DbBarData.exchange == EXCHANGE.value)
+            & (DbBarData.interval == INTERVAL.value)
+            & (DbBarData.datetime >= START)
+            & (DbBarData.datetime <= END)
+        ).order_by(DbBarData.datetime)
+    )
+
+    bars: List[BarData] = []
+    for db_bar in s:
+        bar: BarData = BarData(
+            symbol=db_bar.symbol,
+            exchange=Exchange(db_bar.exchange),
+            datetime=datetime.fromtimestamp(db_bar.datetime.timestamp(), DB_TZ),
+            interval=Interval(db_bar.interval),
+            volume=db_bar.volume,
+            turnover=db_bar.turnover,
+            open_interest=db_bar.open_interest,
+            open_price=db_bar.open_price,
+            high_price=db_bar.high_price,
+            low_price=db_bar.low_price,
+            close_price=db_bar.close_price,
+            gateway_name="DB"
+        )
+        bars.append(bar)
+    return bars
+
+
+def run_benchmark(name: str, func: callable, *args) -> None:
+    """运行并输出耗时和每秒处理行数"""
+    start: float = perf_counter()
+    data = func(*args)
+    cost: float = perf_counter() - start
+    print(f"{name}：{len(data)}条，耗时{cost:.2f}秒，{len(data) / cost:.0f}条/秒")
+
+
+if __name__ == "__main__":
+    database: MysqlDatabase = MysqlDatabase()
+    bars: List[BarData] = generate_bars()
+
+    database.delete_bar_data(SYMBOL, EXCHANGE, INTERVAL)
+    run_benchmark("旧版save_bar_data", save_legacy, bars)
+
+    database.delete_bar_data(SYMBOL, EXCHANGE, INTERVAL)
+    run_benchmark("save_bar_data", lambda b: database.save_bar_data(b) and b, bars)
+    run_benchmark("save_bar_data更新已有数据", lambda b: database.save_bar_data(b) and b, bars)
+
+    series: BarSeries = BarSeries.from_bars(bars)
+    database.delete_bar_data(SYMBOL, EXCHANGE, INTERVAL)
+    run_benchmark("save_bar_series", lambda s: database.save_bar_series(s) and s, series)
+
+    run_benchmark("旧版load_bar_data", load_legacy)
+    run_benchmark("load_bar_data", database.load_bar_data, SYMBOL, EXCHANGE, INTERVAL, START, END)
+    run_benchmark("load_bar_series", database.load_bar_series, SYMBOL, EXCHANGE, INTERVAL, START, END)
+
+    database.delete_bar_data(SYMBOL, EXCHANGE, INTERVAL)
@@ -3,12 +3,12 @@ from json import JSONDecodeError
 import logging
 import requests
 from .__version__ import __version__
-from sdk.binance_sdk.binance.error import ClientError, ServerError
-from sdk.binance_sdk.binance.lib.utils import get_timestamp
-from sdk.binance_sdk.binance.lib.utils import cleanNoneValue
-from sdk.binance_sdk.binance.lib.utils import encoded_string
-from sdk.binance_sdk.binance.lib.utils import check_required_parameter
-from sdk.binance_sdk.binance.lib.authentication import hmac_hashing, rsa_signature
+from .error import ClientError, ServerError
+from .lib.utils import get_timestamp
+from .lib.utils import cleanNoneValue
+from .lib.utils import encoded_string
+from .lib.utils import check_required_parameter
+from .lib.authentication import get_signer
 
 
 class API(object):
@@ -22,6 +22,7 @@ class API(object):
         show_header (bool, optional): whether return the whole response header. By default, it's False
         private_key (str, optional): RSA private key for RSA authentication
         private_key_pass(str, optional): Password for PSA private key
+        rate_limiter (RateLimiter, optional): limiter shared by clients of the same IP, consulted before sending. By default, it's None
 
         关键字Args:
         base_url（str，optional）：API基本url，用于切换到测试网等。默认情况下，它是https://api.binance.com
@@ -31,6 +32,7 @@ class API(object):
         show_header（bool，optional）：是否返回整个响应标头。默认情况下，它是False
         private_key（str，optional）：用于RSA身份验证的RSA私钥
         private_key_pass（str, optional）：用于PSA私钥的密码
+        rate_limiter（RateLimiter，optional）：同一IP的客户端共用的限流器，发送请求前获取额度。默认为None
     """
 
     def __init__(
@@ -44,6 +46,7 @@ class API(object):
             show_header=False,
             private_key=None,
             private_key_pass=None,
+            rate_limiter=None,
     ):
         self.api_key = api_key
         self.api_secret = api_secret
@@ -54,6 +57,8 @@ class API(object):
         self.show_header = False
         self.private_key = private_key
         self.private_key_pass = private_key_pass
+        self.signer = None  # 签名器，首次签名时创建，之后复用已解析的密钥
+        self.rate_limiter = rate_limiter
         self.session = requests.Session()  # 创建session对象
         self.session.headers.update(  # 更新session请求头
             {
@@ -77,7 +82,7 @@ class API(object):
 
     def query(self, url_path, payload=None):
         """发送请求返回响应"""
-        return self.send_request("GET", url_path, payload=payload)
+        return self._request("GET", url_path, payload)
 
     def limit_request(self, http_method, url_path, payload=None):
         """
@@ -86,16 +91,11 @@ class API(object):
         """
 
         check_required_parameter(self.api_key, "api_key")  # 检查是否设置了 API 密钥
-        return self.send_request(http_method, url_path, payload=payload)  # 发送请求返回data
+        return self._request(http_method, url_path, payload)  # 发送请求返回data
 
     def sign_request(self, http_method, url_path, payload=None):
         """payload带签名发送请求"""
-        if payload is None:
-            payload = {}
-        payload["timestamp"] = get_timestamp()  # 生成毫秒时间戳
-        query_string = self._prepare_params(payload)  # 编码转换 %40 <=> @
-        payload["signature"] = self._get_sign(query_string)  # 生成签名
-        return self.send_request(http_method, url_path, payload)  # 发送请求返回data
+        return self._request(http_method, url_path, payload, signed=True)  # 发送请求返回data
 
     def limited_encoded_sign_request(self, http_method, url_path, payload=None):
         """This is used for some endpoints has special symbol in the url.
@@ -107,30 +107,52 @@ class API(object):
         so we have to append those parameters in the url
         带签名url的发送请求
         """
-        if payload is None:
-            payload = {}
-        payload["timestamp"] = get_timestamp()
-        query_string = self._prepare_params(payload)
-        url_path = (
-                url_path + "?" + query_string + "&signature=" + self._get_sign(query_string)
-        )
-        return self.send_request(http_method, url_path)
-
-    def send_request(self, http_method, url_path, payload=None):
-        """发送请求并接受响应"""
-        if payload is None:
-            payload = {}
+        return self._request(http_method, url_path, payload, signed=True, encoded_url=True)
+
+    def send_request(self, http_method, url_path, payload=None, query_string=None):
+        """发送请求并接受响应，query_string为已编码的参数，传入时忽略payload"""
+        return self._request(http_method, url_path, payload, query_string=query_string)
+
+    def _request(self, http_method, url_path, payload=None, query_string=None, signed=False, encoded_url=False):
+        """获取限流额度后发送请求，额度等待结束后再签名"""
+        sent = None
+        if self.rate_limiter:
+            sent = self.rate_limiter.acquire(http_method, url_path, payload)
+
+        url_path, query_string = self._prepare_query(url_path, payload, query_string, signed, encoded_url)
+        response = self._send(http_method, url_path, query_string)  # 发送请求返回response对象
+
+        if self.rate_limiter:
+            self.rate_limiter.update(response, sent)
+        return self._handle_response(response)
+
+    def _prepare_query(self, url_path, payload, query_string, signed, encoded_url):
+        """返回请求路径和编码后的参数，签名参数只编码一次，签名追加在末尾"""
+        if signed:
+            query_string = self._get_signed_query(payload)
+        elif query_string is None:
+            query_string = self._prepare_params(payload or {})
+
+        if encoded_url:
+            return url_path + "?" + query_string, ""
+        return url_path, query_string
+
+    def _send(self, http_method, url_path, query_string):
+        """发送已编码参数的请求，返回response对象"""
         url = self.base_url + url_path
         self._logger.debug("url: " + url)
         params = cleanNoneValue(  # 清除字典中值为 None 的键值对
             {
                 "url": url,
-                "params": self._prepare_params(payload),
+                "params": query_string,
                 "timeout": self.timeout,
                 "proxies": self.proxies,
             }
         )
-        response = self._dispatch_request(http_method)(**params)  # 发送请求返回response对象
+        return self._dispatch_request(http_method)(**params)
+
+    def _handle_response(self, response):
+        """处理响应状态码，提取数据以及限制使用量和响应头"""
         self._logger.debug("raw response from server:" + response.text)
         self._handle_exception(response)  # 响应状态码的处理
 
@@ -165,11 +187,19 @@ class API(object):
         """编码转换 %40 <=> @"""
         return encoded_string(cleanNoneValue(params))
 
+    def _get_signed_query(self, payload):
+        """添加时间戳后编码参数，并在末尾追加签名"""
+        if payload is None:
+            payload = {}
+        payload["timestamp"] = get_timestamp()  # 生成毫秒时间戳
+        query_string = self._prepare_params(payload)  # 编码转换 %40 <=> @
+        return query_string + "&" + encoded_string({"signature": self._get_sign(query_string)})
+
     def _get_sign(self, payload):
         """RSA/hash签名"""
-        if self.private_key:  # 有私钥
-            return rsa_signature(self.private_key, payload, self.private_key_pass)  # 对 payload 进行 RSA 签名
-        return hmac_hashing(self.api_secret, payload)  # 对 payload 进行哈希处理
+        if not self.signer:
+            self.signer = get_signer(self.api_secret, self.private_key, self.private_key_pass)
+        return self.signer.sign(payload)
 
     def _dispatch_request(self, http_method):
         """返回对应请求方法"""
@@ -0,0 +1,100 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
+
+from .api import API
+from .lib.rate_limiter import RateLimiter
+from .lib.utils import check_required_parameter
+
+
+class AsyncAPI(API):
+    """Asyncio API base class
+
+    query/limit_request/sign_request/limited_encoded_sign_request/send_request
+    return coroutines, so every endpoint of the subclass can be awaited and
+    fanned out with asyncio.gather. Requests are sent on a pooled session by
+    a thread pool, at most max_concurrency at a time.
+
+    Keyword Args:
+        max_concurrency (int, optional): the max number of requests in flight and pooled connections. By default, it's 10
+        rate_limiter (RateLimiter, optional): limiter shared by clients of the same IP. By default, a new RateLimiter
+        the other keyword args are the same as API
+
+        关键字Args:
+        max_concurrency（int，optional）：同时发送的最大请求数量，也是连接池大小。默认为10
+        rate_limiter（RateLimiter，optional）：同一IP的客户端共用的限流器。默认创建新的RateLimiter
+        其余参数与API相同
+    """
+
+    def __init__(self, api_key=None, api_secret=None, max_concurrency=10, rate_limiter=None, **kwargs):
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        super().__init__(api_key, api_secret, rate_limiter=rate_limiter, **kwargs)
+        self.max_concurrency = max_concurrency
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_concurrency)
+
+        # 信号量与事件循环绑定，在使用时按当前循环创建
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def query(self, url_path, payload=None):
+        """发送请求返回响应"""
+        return await self._request_async("GET", url_path, payload)
+
+    async def limit_request(self, http_method, url_path, payload=None):
+        """调用那些需要在请求头中包含 API 密钥的接口"""
+        check_required_parameter(self.api_key, "api_key")
+        return await self._request_async(http_method, url_path, payload)
+
+    async def sign_request(self, http_method, url_path, payload=None):
+        """payload带签名发送请求"""
+        return await self._request_async(http_method, url_path, payload, signed=True)
+
+    async def limited_encoded_sign_request(self, http_method, url_path, payload=None):
+        """带签名url的发送请求，参数追加在url中不再编码"""
+        return await self._request_async(http_method, url_path, payload, signed=True, encoded_url=True)
+
+    async def send_request(self, http_method, url_path, payload=None, query_string=None):
+        """发送请求并接受响应，query_string为已编码的参数，传入时忽略payload"""
+        return await self._request_async(http_method, url_path, payload, query_string=query_string)
+
+    def close(self):
+        """关闭线程池和连接池"""
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+    async def _request_async(
+            self, http_method, url_path, payload=None, query_string=None, signed=False, encoded_url=False
+    ):
+        """等待限流额度和并发名额后在线程池中发送请求"""
+        # 在占用并发名额之前等待额度，避免等待中的行情请求占满名额阻塞下单请求
+        sent = await self.rate_limiter.acquire_async(http_method, url_path, payload)
+
+        async with self._get_semaphore():
+            # 取得并发名额后再签名，排队等待不会使时间戳超出recvWindow
+            url_path, query_string = self._prepare_query(url_path, payload, query_string, signed, encoded_url)
+
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self.executor, self._send, http_method, url_path, query_string)
+
+        self.rate_limiter.update(response, sent)
+        return self._handle_response(response)
+
+    def _get_semaphore(self):
+        """返回当前事件循环的并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
@@ -7,18 +7,28 @@
   e.g. STORE_DIRECTORY=/data/ ./download_kline.py
     下载K线
 """
+import os
 import sys
 from datetime import *
-from typing import Callable
+from typing import Callable, List, Optional, Tuple
 
 import pandas as pd
-from sdk.binance_sdk.binance.download.enums import *
-from sdk.binance_sdk.binance.download.utility import download_file, get_all_symbols, get_parser, \
+from .enums import *
+from .utility import download_file, get_all_symbols, get_parser, \
     get_start_end_date_objects, convert_to_date_object, \
-    get_path, get_dates
+    get_path, get_dates, get_date_range, get_destination_dir
+from .downloader import Downloader, DownloadTask, STATUS_FAILED, \
+    STATUS_MISSING, STATUS_DOWNLOADED, STATUS_EXISTS
 from core.trader.constant import Interval as ZQ_INTERVAL
 from .utility import interval_converter
 
+# 判断文件是否已被数据库覆盖时，每个周期最后一根K线相对周期结束的偏移
+INTERVAL_DELTA = {
+    '1m': timedelta(minutes=1),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+}
+
 
 def download_monthly_klines(trading_type, symbols, num_symbols, intervals, years, months, start_date, end_date, folder,
                             checksum):
@@ -69,7 +79,8 @@ def download_daily_klines(trading_type: str = None,
                           start_date: str = None,
                           end_date: str = None,
                           folder=None,
-                          checksum: int = None, ) -> str:
+                          checksum: int = None,
+                          downloader: Downloader = None) -> str:
     """
     下载日内K线
     :param trading_type: 'um'           - 交易类型 (spot/um(BTCUSDT)/cm（BTCUSD))
@@ -81,47 +92,18 @@ def download_daily_klines(trading_type: str = None,
     :param end_date: '2020-01-30'       - 结束日期
     :param folder:                      - 保存文件夹
     :param checksum: 0                  - 是否下载校验
-    :return:None
+    :param downloader:                  - 并发下载器，为空则使用默认设置创建
+    :return: 保存目录，有文件下载失败时返回None
     """
     # 获取num_symbols
     if not num_symbols:
-        num_symbols = get_all_symbols(trading_type)
-        if num_symbols is None:
-            return None
-
-    # 获取日期列表
-    if not dates:
-        dates = get_dates()
+        num_symbols = len(symbols)
 
     # Get valid intervals for daily 获取K线时间周期
     intervals = interval_converter.get(intervals[0])
     intervals = list(set(intervals) & set(INTERVALS))
 
-    # 截取符合时间周期的日期列表
-    if '1w' in intervals:  # 周线
-        new_dates = []
-        for date in dates:
-            new_date = convert_to_date_object(date)
-            if new_date.weekday() == 0:
-                new_dates.append(new_date.strftime('%Y-%m-%d'))
-
-        dates = new_dates
-
-    # elif '1m' in intervals:  # 月线
-    #     new_dates = []
-    #     for date in dates:
-    #         new_date = convert_to_date_object(date)
-    #         if new_date.day == 1:
-    #             new_dates.append(new_date.strftime('%Y-%m-%d'))
-    #
-    #     dates = new_dates
-
-    current = 0
-    date_range = None
     # 下载日期范围
-    if start_date and end_date:
-        date_range = start_date + " " + end_date
-
     if not start_date:
         start_date = START_DATE
     else:
@@ -132,29 +114,200 @@ def download_daily_klines(trading_type: str = None,
     else:
         end_date = convert_to_date_object(end_date)
 
+    # 获取日期列表，只生成下载范围内的日期
+    if not dates:
+        dates = get_date_range(start_date, end_date)
+
+    # 截取符合时间周期的日期列表
+    if '1w' in intervals:  # 周线
+        new_dates = []
+        for date in dates:
+            new_date = convert_to_date_object(date)
+            if new_date.weekday() == 0:
+                new_dates.append(new_date.strftime('%Y-%m-%d'))
+
+        dates = new_dates
+
     print("Found {} symbols".format(num_symbols))
 
+    # 生成全部下载任务后并发下载
+    tasks = []
+    download_path = None
+
     for symbol in symbols:
-        print("[{}/{}] - start download daily {} klines ".format(current + 1, num_symbols, symbol))
         for interval in intervals:
+            # 拼接url 'data/futures/um/daily/klines/BTCUSDT/1m/'
+            path = get_path(trading_type, "klines", "daily", symbol, interval)
+            download_path = get_destination_dir(path, folder)
+
             for date in dates:
                 current_date = convert_to_date_object(date)
                 if current_date >= start_date and current_date <= end_date:
-                    # 拼接url 'data/futures/um/daily/klines/BTCUSDT/1m/'
-                    path = get_path(trading_type, "klines", "daily", symbol, interval)
-                    file_name = "{}-{}-{}.zip".format(symbol.upper(), interval, date)
-                    download_path = download_file(path, file_name, date_range, folder)  # 下载文件
-
+                    file_names = ["{}-{}-{}.zip".format(symbol.upper(), interval, date)]
                     if checksum == 1:
-                        checksum_path = get_path(trading_type, "klines", "daily", symbol, interval)
-                        checksum_file_name = "{}-{}-{}.zip.CHECKSUM".format(symbol.upper(), interval, date)
-                        download_file(checksum_path, checksum_file_name, date_range, folder)
+                        file_names.append("{}-{}-{}.zip.CHECKSUM".format(symbol.upper(), interval, date))
 
-        current += 1
+                    for file_name in file_names:
+                        task = DownloadTask(path + file_name, os.path.join(download_path, file_name))
+                        tasks.append(task)
+
+    own_downloader = not downloader
+    if own_downloader:
+        downloader = Downloader()
+
+    try:
+        downloader.download(tasks)
+    finally:
+        if own_downloader:
+            downloader.close()
+
+    failed = [task for task in tasks if task.status == STATUS_FAILED]
+    if failed:
+        print("{} files failed to download".format(len(failed)))
+        return None
 
     return download_path  # 返回保存目录
 
 
+def get_next_month(day: date) -> date:
+    """下个月的第一天"""
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def is_covered(covered: Optional[List[Tuple[datetime, datetime]]], interval: str, start: date, end: date) -> bool:
+    """
+    判断[start, end)日期内的K线是否已全部在数据库中
+    :param covered: [(start, end),...]  - 数据库中已有数据的连续区间，来自get_bar_coverage
+    """
+    if not covered or interval not in INTERVAL_DELTA:
+        return False
+
+    first_bar = datetime.combine(start, time())
+    last_bar = datetime.combine(end, time()) - INTERVAL_DELTA[interval]
+    return any(segment[0] <= first_bar and last_bar <= segment[1] for segment in covered)
+
+
+def plan_kline_files(interval: str,
+                     start_date: date,
+                     end_date: date,
+                     covered: Optional[List[Tuple[datetime, datetime]]] = None,
+                     today: date = None) -> List[Tuple[str, str]]:
+    """
+    规划最少的下载文件：已结束的完整月份使用月度文件，首尾不完整的月份使用日度文件，
+    已被数据库覆盖的文件跳过，只下载缺失的部分
+    :param interval: '1m'               - K线时间间隔
+    :param start_date:                  - 起始日期
+    :param end_date:                    - 结束日期（包含）
+    :param covered: [(start, end),...]  - 数据库中已有数据的连续区间
+    :param today:                       - 当前日期，月度文件在月份结束后才会发布
+    :return: [('monthly', '2023-01'), ('daily', '2023-02-01'), ...]
+    """
+    if not today:
+        today = datetime.utcnow().date()
+
+    plan = []
+    day = start_date
+
+    while day <= end_date:
+        month_start = day.replace(day=1)
+        next_month = get_next_month(day)
+
+        # 周线等没有日度文件，只能下载月度文件
+        if interval not in DAILY_INTERVALS:
+            if next_month <= today and not is_covered(covered, interval, month_start, next_month):
+                plan.append(("monthly", month_start.strftime("%Y-%m")))
+            day = next_month
+        elif day == month_start and next_month - timedelta(days=1) <= end_date and next_month <= today:
+            # 月内部分日期已有数据时只下载缺失日期的日度文件
+            days = [month_start + timedelta(days=i) for i in range((next_month - month_start).days)]
+            missing = [d for d in days if not is_covered(covered, interval, d, d + timedelta(days=1))]
+            if len(missing) == len(days):
+                plan.append(("monthly", month_start.strftime("%Y-%m")))
+            else:
+                plan.extend(("daily", d.strftime("%Y-%m-%d")) for d in missing)
+            day = next_month
+        else:
+            if not is_covered(covered, interval, day, day + timedelta(days=1)):
+                plan.append(("daily", day.strftime("%Y-%m-%d")))
+            day += timedelta(days=1)
+
+    return plan
+
+
+def get_fallback_plan(period: str, start_date: date, end_date: date) -> List[Tuple[str, str]]:
+    """月度文件不存在时，改为下载该月在下载范围内的日度文件"""
+    month_start = convert_to_date_object(period + "-01")
+    month_end = get_next_month(month_start) - timedelta(days=1)
+    return [("daily", day) for day in get_date_range(max(month_start, start_date), min(month_end, end_date))]
+
+
+def make_kline_task(trading_type: str, symbol: str, interval: str, time_period: str, period: str,
+                    folder=None) -> DownloadTask:
+    """生成单个K线文件的下载任务"""
+    path = get_path(trading_type, "klines", time_period, symbol, interval)
+    file_name = "{}-{}-{}.zip".format(symbol.upper(), interval, period)
+    return DownloadTask(path + file_name, os.path.join(get_destination_dir(path, folder), file_name))
+
+
+def download_klines(trading_type: str,
+                    symbol: str,
+                    interval: str,
+                    start_date: date,
+                    end_date: date,
+                    folder=None,
+                    covered: Optional[List[Tuple[datetime, datetime]]] = None,
+                    downloader: Downloader = None) -> Optional[List[str]]:
+    """
+    按最少请求数下载K线文件，月度文件尚未发布时改为下载该月的日度文件
+    :param trading_type: 'um'           - 交易类型 (spot/um/cm)
+    :param symbol: 'BTCUSDT'            - 交易对符号
+    :param interval: '1m'               - K线时间间隔
+    :param start_date:                  - 起始日期
+    :param end_date:                    - 结束日期（包含）
+    :param folder:                      - 保存文件夹
+    :param covered: [(start, end),...]  - 数据库中已有数据的连续区间，完全覆盖的文件不再下载
+    :param downloader:                  - 并发下载器，为空则使用默认设置创建
+    :return: 按时间排序的本地文件路径列表，有文件下载失败时返回None
+    """
+    plan = plan_kline_files(interval, start_date, end_date, covered)
+    tasks = [make_kline_task(trading_type, symbol, interval, time_period, period, folder)
+             for time_period, period in plan]
+
+    fallback_tasks = []
+    own_downloader = not downloader
+    if own_downloader:
+        downloader = Downloader()
+
+    try:
+        downloader.download(tasks)
+
+        # 月度文件不存在时，补充下载该月范围内的日度文件
+        for (time_period, period), task in zip(plan, tasks):
+            if time_period != "monthly" or task.status != STATUS_MISSING or interval not in DAILY_INTERVALS:
+                continue
+
+            for time_period, day in get_fallback_plan(period, start_date, end_date):
+                fallback_tasks.append(make_kline_task(trading_type, symbol, interval, time_period, day, folder))
+
+        if fallback_tasks:
+            downloader.download(fallback_tasks)
+    finally:
+        if own_downloader:
+            downloader.close()
+
+    tasks.extend(fallback_tasks)
+    print("Planned {} files for {} {} klines, {} downloaded".format(
+        len(tasks), symbol, interval, len([task for task in tasks if task.status == STATUS_DOWNLOADED])))
+
+    failed = [task for task in tasks if task.status == STATUS_FAILED]
+    if failed:
+        print("{} files failed to download".format(len(failed)))
+        return None
+
+    files = [task.save_path for task in tasks if task.status in (STATUS_DOWNLOADED, STATUS_EXISTS)]
+    return sorted(files, key=lambda path: os.path.basename(path).split("-", 2)[2])
+
+
 if __name__ == "__main__":
     parser = get_parser('klines')
     args = parser.parse_args(sys.argv[1:])
@@ -0,0 +1,179 @@
+"""
+  Concurrent downloader of data.binance.vision archives.
+  Files are fetched by a thread pool over one keep-alive connection pool,
+  with rate limit, per-file retry/backoff and resumable partial downloads.
+    并发下载币安历史数据文件
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, sleep
+from typing import List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .enums import BASE_URL
+
+CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = ".part"
+
+# 下载结果状态
+STATUS_DOWNLOADED = "downloaded"  # 下载完成
+STATUS_EXISTS = "exists"  # 本地已存在，跳过
+STATUS_MISSING = "missing"  # 服务器上不存在该文件
+STATUS_FAILED = "failed"  # 重试后仍然失败
+
+
+class RetryableError(Exception):
+    """可重试的下载错误（限流、服务器错误）"""
+    pass
+
+
+class DownloadError(Exception):
+    """不可重试的下载错误（限流以外的4xx）"""
+    pass
+
+
+@dataclass
+class DownloadTask:
+    """
+    单个文件下载任务
+    :param file_url: 'data/futures/um/daily/klines/BTCUSDT/1m/BTCUSDT-1m-2023-01-01.zip'
+    :param save_path: 本地保存路径
+    """
+    file_url: str
+    save_path: str
+    status: str = ""
+    error: str = ""
+
+
+class DownloadThrottle:
+    """限制所有线程合计的每秒请求数"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_time = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """等待直到允许发出下一个请求"""
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+
+        if wait > 0:
+            sleep(wait)
+
+
+class Downloader:
+    """
+    并发下载管理器
+    :param base_url: 'https://data.binance.vision/'   - 下载服务器地址
+    :param max_workers: 8                              - 下载线程数，同时也是连接池大小
+    :param max_retries: 3                              - 单个文件的最大重试次数
+    :param backoff: 1                                  - 重试等待秒数，每次重试翻倍
+    :param rate_limit: 20                              - 每秒最大请求数，0则不限制
+    :param timeout: 30                                 - 请求超时秒数
+    """
+
+    def __init__(self,
+                 base_url: str = BASE_URL,
+                 max_workers: int = 8,
+                 max_retries: int = 3,
+                 backoff: float = 1,
+                 rate_limit: float = 20,
+                 timeout: float = 30):
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.throttle = DownloadThrottle(rate_limit)
+
+        # 所有线程共用的长连接池
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def download(self, tasks: List[DownloadTask]) -> List[DownloadTask]:
+        """并发执行下载任务，返回带有下载状态的任务列表"""
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            list(executor.map(self.download_file, tasks))
+
+        return tasks
+
+    def download_file(self, task: DownloadTask) -> DownloadTask:
+        """下载单个文件，失败时按指数退避重试"""
+        if os.path.exists(task.save_path):
+            task.status = STATUS_EXISTS
+            return task
+
+        Path(os.path.dirname(task.save_path)).mkdir(parents=True, exist_ok=True)
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                sleep(self.backoff * 2 ** (attempt - 1))
+
+            try:
+                task.status = self.fetch(task)
+                task.error = ""
+                return task
+            except DownloadError as e:
+                task.error = str(e)
+                break
+            except (requests.RequestException, RetryableError, OSError) as e:
+                task.error = str(e)
+
+        print("\nFile download failed: {} {}".format(task.file_url, task.error))
+        task.status = STATUS_FAILED
+        return task
+
+    def fetch(self, task: DownloadTask) -> str:
+        """
+        请求并写入文件，先写入.part临时文件，完成后再重命名。
+        临时文件已存在时使用Range请求从断点继续下载。
+        """
+        url = self.base_url + task.file_url
+        part_path = task.save_path + PART_SUFFIX
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+
+        self.throttle.acquire()
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 404:
+                return STATUS_MISSING
+
+            # 断点位置无效，删除临时文件后重新下载
+            if response.status_code == 416:
+                os.remove(part_path)
+                raise RetryableError("range not satisfiable: {}".format(url))
+
+            if response.status_code == 429 or response.status_code >= 500:
+                raise RetryableError("{} {}".format(response.status_code, url))
+
+            # 其他4xx重试也不会成功，直接失败
+            if response.status_code >= 400:
+                raise DownloadError("{} {}".format(response.status_code, url))
+
+            # 服务器不支持Range时返回200，需要从头写入
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+
+        os.replace(part_path, task.save_path)
+        return STATUS_DOWNLOADED
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
@@ -6,7 +6,7 @@ import urllib.request
 from argparse import ArgumentParser, RawTextHelpFormatter, ArgumentTypeError
 from time import sleep
 
-from sdk.binance_sdk.binance.download.enums import *
+from .enums import *
 import pandas as pd
 
 interval_converter = {
@@ -27,6 +27,12 @@ def get_dates():
     return dates
 
 
+def get_date_range(start_date, end_date):
+    """获取起止日期之间（包含两端）的日期列表"""
+    days = (end_date - start_date).days
+    return [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days + 1)]
+
+
 def get_destination_dir(file_url, folder=None):
     store_directory = os.environ.get('STORE_DIRECTORY')
     if folder:
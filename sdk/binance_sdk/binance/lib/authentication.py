@@ -18,3 +18,36 @@ def rsa_signature(private_key, payload, private_key_pass=None):
     h = SHA256.new(payload.encode("utf-8"))
     signature = PKCS1_v1_5.new(private_key).sign(h)
     return b64encode(signature)
+
+
+class HmacSigner(object):
+    """哈希签名器，密钥只编码一次，每次签名复制预先设置好密钥的hmac对象"""
+
+    def __init__(self, api_secret):
+        self.hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def sign(self, payload):
+        """返回十六进制签名"""
+        m = self.hmac.copy()
+        m.update(payload.encode("utf-8"))
+        return m.hexdigest()
+
+
+class RsaSigner(object):
+    """rsa签名器，私钥只解析一次"""
+
+    def __init__(self, private_key, private_key_pass=None):
+        key = RSA.import_key(private_key, passphrase=private_key_pass)
+        self.signer = PKCS1_v1_5.new(key)
+
+    def sign(self, payload):
+        """返回base64编码的签名"""
+        h = SHA256.new(payload.encode("utf-8"))
+        return b64encode(self.signer.sign(h)).decode("utf-8")
+
+
+def get_signer(api_secret=None, private_key=None, private_key_pass=None):
+    """有私钥时使用rsa签名，否则使用哈希签名"""
+    if private_key:
+        return RsaSigner(private_key, private_key_pass)
+    return HmacSigner(api_secret)
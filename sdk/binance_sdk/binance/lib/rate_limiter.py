@@ -0,0 +1,268 @@
+import asyncio
+import time
+from threading import Condition
+
+
+# 现货接口的请求权重，未列出的接口权重为1
+REQUEST_WEIGHTS = {
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/trades": 25,
+    "/api/v3/historicalTrades": 25,
+    "/api/v3/aggTrades": 2,
+    "/api/v3/klines": 2,
+    "/api/v3/uiKlines": 2,
+    "/api/v3/avgPrice": 2,
+    "/api/v3/ticker": 4,
+    "/api/v3/account": 20,
+    "/api/v3/myTrades": 20,
+    "/api/v3/allOrders": 20,
+    "/api/v3/allOrderList": 20,
+    "/api/v3/openOrderList": 6,
+    "/api/v3/rateLimit/order": 40,
+    "/api/v3/myPreventedMatches": 20,
+}
+
+# 带symbol参数和不带symbol参数时的权重
+SYMBOL_WEIGHTS = {
+    "/api/v3/ticker/24hr": (2, 80),
+    "/api/v3/ticker/price": (2, 4),
+    "/api/v3/ticker/bookTicker": (2, 4),
+    "/api/v3/openOrders": (6, 80),
+}
+
+# 深度接口按档位数量计算权重
+DEPTH_WEIGHTS = [(100, 5), (500, 25), (1000, 50), (5000, 250)]
+
+# 下单和撤单接口，非GET请求优先发送
+ORDER_PATHS = {
+    "/api/v3/order",
+    "/api/v3/order/oco",
+    "/api/v3/order/cancelReplace",
+    "/api/v3/orderList",
+    "/api/v3/openOrders",
+    "/sapi/v1/margin/order",
+    "/sapi/v1/margin/order/oco",
+    "/sapi/v1/margin/orderList",
+    "/sapi/v1/margin/openOrders",
+}
+
+# 计入下单数量限制的接口
+ORDER_COUNT_PATHS = {
+    "/api/v3/order",
+    "/api/v3/order/oco",
+    "/api/v3/order/cancelReplace",
+}
+
+PRIORITY_ORDER = 0
+PRIORITY_DATA = 1
+
+
+def get_request_weight(http_method, url_path, payload=None):
+    """返回接口的请求权重"""
+    payload = payload or {}
+    if url_path == "/api/v3/depth":
+        limit = payload.get("limit") or 100
+        for max_limit, weight in DEPTH_WEIGHTS:
+            if limit <= max_limit:
+                return weight
+        return DEPTH_WEIGHTS[-1][1]
+
+    if url_path in SYMBOL_WEIGHTS and http_method == "GET":
+        with_symbol, without_symbol = SYMBOL_WEIGHTS[url_path]
+        if payload.get("symbol"):
+            return with_symbol
+        return without_symbol
+
+    if url_path == "/api/v3/order" and http_method == "GET":
+        return 4
+
+    return REQUEST_WEIGHTS.get(url_path, 1)
+
+
+class RateRequest(object):
+    """一个请求需要占用的各项限额"""
+
+    def __init__(self, http_method, url_path, payload=None):
+        self.weight = get_request_weight(http_method, url_path, payload)
+        self.sapi = url_path.startswith("/sapi/")
+
+        if http_method != "GET" and url_path in ORDER_PATHS:
+            self.priority = PRIORITY_ORDER
+        else:
+            self.priority = PRIORITY_DATA
+
+        self.order_count = 1 if http_method == "POST" and url_path in ORDER_COUNT_PATHS else 0
+
+
+class RateBucket(object):
+    """
+    按交易所固定时间窗口补充令牌的令牌桶，窗口与服务器一致按整分钟/整10秒对齐，
+    reserve为行情请求不能占用、留给下单请求的额度
+    """
+
+    def __init__(self, limit, interval, header, reserve=0):
+        self.limit = limit
+        self.interval = interval  # 窗口秒数
+        self.header = header  # 服务器返回已用额度的响应头
+        self.reserve = reserve
+
+        self.window = 0  # 当前窗口序号
+        self.used = 0  # 当前窗口已用额度
+
+    def get_window(self, now):
+        """时间戳所在的窗口序号"""
+        return int(now // self.interval)
+
+    def refill(self, now):
+        """进入新窗口时补满令牌"""
+        window = self.get_window(now)
+        if window != self.window:
+            self.window = window
+            self.used = 0
+
+    def get_delay(self, amount, priority, now):
+        """返回需要等待的秒数，0表示额度足够"""
+        if not amount:
+            return 0
+
+        self.refill(now)
+        limit = self.limit if priority == PRIORITY_ORDER else self.limit - self.reserve
+        # 单个请求超过上限时，在空窗口中发送
+        if self.used + amount <= limit or not self.used:
+            return 0
+        return (self.window + 1) * self.interval - now
+
+    def consume(self, amount):
+        """"""
+        self.used += amount
+
+    def sync(self, used, sent):
+        """
+        按服务器返回的已用额度校正，同一IP的其他进程也会占用额度，
+        请求发送后已进入新窗口时忽略
+        """
+        if self.get_window(sent) == self.window:
+            self.used = max(self.used, used)
+
+
+class RateLimiter(object):
+    """
+    多个REST客户端共用的限流器，发送请求前按接口权重获取额度，
+    收到响应后按x-mbx-used-weight/x-mbx-order-count校正已用额度，
+    收到429/418时暂停所有请求到Retry-After之后。
+    额度不足时下单撤单请求优先于行情请求获取额度
+
+    Args:
+        weight_limit (int, optional): request weight per minute of /api endpoints. By default, it's 6000
+        sapi_weight_limit (int, optional): IP weight per minute of /sapi endpoints. By default, it's 12000
+        order_limit (int, optional): new orders per 10 seconds. By default, it's 100
+        reserve_ratio (float, optional): share of the weight reserved for order requests. By default, it's 0.1
+        clock (callable, optional): returns the current timestamp in seconds. By default, it's time.time
+
+        Args:
+        weight_limit（int，optional）：/api接口每分钟请求权重上限，默认为6000
+        sapi_weight_limit（int，optional）：/sapi接口每分钟IP权重上限，默认为12000
+        order_limit（int，optional）：每10秒下单数量上限，默认为100
+        reserve_ratio（float，optional）：留给下单撤单请求的权重比例，默认为0.1
+        clock（callable，optional）：返回当前时间戳（秒），默认为time.time
+    """
+
+    def __init__(self, weight_limit=6000, sapi_weight_limit=12000, order_limit=100, reserve_ratio=0.1, clock=time.time):
+        self.weight_bucket = RateBucket(
+            weight_limit, 60, "x-mbx-used-weight-1m", int(weight_limit * reserve_ratio)
+        )
+        self.sapi_bucket = RateBucket(
+            sapi_weight_limit, 60, "x-sapi-used-ip-weight-1m", int(sapi_weight_limit * reserve_ratio)
+        )
+        self.order_bucket = RateBucket(order_limit, 10, "x-mbx-order-count-10s")
+
+        self.blocked_until = 0  # 被限流时暂停发送到该时间戳
+        self.order_waiting = 0  # 正在等待额度的下单撤单请求数量
+        self.poll_interval = 0.05  # 异步等待时的最长轮询间隔
+        self.clock = clock  # 窗口按该时钟对齐
+
+        self.condition = Condition()
+
+    def acquire(self, http_method, url_path, payload=None):
+        """阻塞等待额度，返回获取额度的时间戳，用于收到响应后校正"""
+        request = RateRequest(http_method, url_path, payload)
+
+        with self.condition:
+            self._add_waiting(request, 1)
+            try:
+                while True:
+                    now = self.clock()
+                    delay = self._try_consume(request, now)
+                    if not delay:
+                        return now
+                    self.condition.wait(delay)
+            finally:
+                self._add_waiting(request, -1)
+
+    async def acquire_async(self, http_method, url_path, payload=None):
+        """acquire的asyncio版本，等待时不阻塞事件循环"""
+        request = RateRequest(http_method, url_path, payload)
+
+        with self.condition:
+            self._add_waiting(request, 1)
+        try:
+            while True:
+                with self.condition:
+                    now = self.clock()
+                    delay = self._try_consume(request, now)
+                if not delay:
+                    return now
+                await asyncio.sleep(min(delay, self.poll_interval))
+        finally:
+            with self.condition:
+                self._add_waiting(request, -1)
+
+    def update(self, response, sent):
+        """根据响应头校正已用额度，sent为acquire返回的时间戳"""
+        headers = response.headers
+        with self.condition:
+            now = self.clock()
+            for bucket in [self.weight_bucket, self.sapi_bucket, self.order_bucket]:
+                used = headers.get(bucket.header)
+                if used is not None:
+                    bucket.refill(now)
+                    bucket.sync(int(used), sent)
+
+            if response.status_code in (418, 429):
+                retry_after = headers.get("Retry-After")
+                if retry_after:
+                    delay = int(retry_after)
+                else:
+                    delay = 60 - now % 60
+                self.blocked_until = max(self.blocked_until, now + delay)
+
+            self.condition.notify_all()
+
+    def _add_waiting(self, request, count):
+        """"""
+        if request.priority == PRIORITY_ORDER:
+            self.order_waiting += count
+            if not self.order_waiting:
+                self.condition.notify_all()
+
+    def _try_consume(self, request, now):
+        """额度足够时占用并返回0，否则返回需要等待的秒数"""
+        if self.blocked_until > now:
+            return self.blocked_until - now
+
+        # 有下单撤单请求等待时，行情请求让出额度
+        if request.priority == PRIORITY_DATA and self.order_waiting:
+            return self.poll_interval
+
+        bucket = self.sapi_bucket if request.sapi else self.weight_bucket
+        delay = max(
+            bucket.get_delay(request.weight, request.priority, now),
+            self.order_bucket.get_delay(request.order_count, request.priority, now)
+        )
+        if delay:
+            return delay
+
+        bucket.consume(request.weight)
+        self.order_bucket.consume(request.order_count)
+        self.condition.notify_all()
+        return 0
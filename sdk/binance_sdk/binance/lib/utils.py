@@ -3,8 +3,8 @@ import time
 import uuid
 from collections import OrderedDict
 from urllib.parse import urlencode
-from sdk.binance_sdk.binance.lib.authentication import hmac_hashing
-from sdk.binance_sdk.binance.error import (
+from .authentication import hmac_hashing
+from ..error import (
     ParameterRequiredError,
     ParameterValueError,
     ParameterTypeError,
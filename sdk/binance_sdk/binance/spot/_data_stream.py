@@ -1,4 +1,4 @@
-from sdk.binance_sdk.binance.lib.utils import check_required_parameter, check_required_parameters
+from ..lib.utils import check_required_parameter, check_required_parameters
 
 
 def new_listen_key(self):
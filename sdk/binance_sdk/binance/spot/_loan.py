@@ -1,4 +1,4 @@
-from sdk.binance_sdk.binance.lib.utils import check_required_parameters, check_required_parameter
+from ..lib.utils import check_required_parameters, check_required_parameter
 
 
 def loan_history(self, asset: str, **kwargs):
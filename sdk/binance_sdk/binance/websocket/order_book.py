@@ -0,0 +1,283 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tzlocal import get_localzone_name
+
+from core.trader.constant import Exchange
+from core.trader.object import TickData
+from core.trader.utility import ZoneInfo
+
+LOCAL_TZ = ZoneInfo(get_localzone_name())
+
+
+class BookSide:
+    """
+    订单簿单边的价格档位，排序键存放在升序数组中，最优价在数组末尾，
+    买方排序键为价格，卖方为价格的相反数。
+    二分查找定位档位，盘口附近的增删只移动数组末尾少量元素，读取最优价为O(1)
+    """
+
+    def __init__(self, is_bid: bool) -> None:
+        """"""
+        self.sign: int = 1 if is_bid else -1
+        self.keys: List[float] = []
+        self.volumes: Dict[float, float] = {}
+
+    def update(self, price: float, volume: float) -> None:
+        """更新档位，数量为0时删除"""
+        key: float = price * self.sign
+
+        if volume:
+            if key not in self.volumes:
+                insort(self.keys, key)
+            self.volumes[key] = volume
+        elif key in self.volumes:
+            del self.volumes[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def clear(self) -> None:
+        """"""
+        self.keys.clear()
+        self.volumes.clear()
+
+    def get_best(self) -> Optional[Tuple[float, float]]:
+        """最优价和数量"""
+        if not self.keys:
+            return None
+        key: float = self.keys[-1]
+        return key * self.sign, self.volumes[key]
+
+    def get_levels(self, count: int) -> List[Tuple[float, float]]:
+        """从最优价开始的count档价格和数量"""
+        keys: List[float] = self.keys[-count:]
+        return [(key * self.sign, self.volumes[key]) for key in reversed(keys)]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.keys)
+
+
+class BinanceOrderBook:
+    """
+    Binance本地订单簿，REST快照加深度增量推送维护完整订单簿。
+    on_depth作为BinanceStreamManager/SpotWebsocketStreamClient的depth@100ms处理函数，
+    未同步时缓存增量并在后台线程获取快照，之后按U/u（合约为pu）校验连续性，
+    发现缺失时重新获取快照。每次更新后最多每throttle秒推送一次TickData
+    """
+
+    def __init__(
+            self,
+            client,
+            symbol: str,
+            exchange: Exchange = Exchange.BINANCE,
+            on_tick: Callable[[TickData], None] = None,
+            throttle: float = 0.1,
+            snapshot_limit: int = 1000,
+            extra_levels: int = 20,
+            snapshot_interval: float = 1,
+            gateway_name: str = "BINANCE",
+            logger: logging.Logger = None
+    ) -> None:
+        """
+        client为提供depth(symbol, limit=...)的REST客户端，例如Spot，
+        extra_levels为TickData.extra中附带的档位数量
+        """
+        self.client = client
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.on_tick: Callable[[TickData], None] = on_tick
+        self.throttle: float = throttle
+        self.snapshot_limit: int = snapshot_limit
+        self.extra_levels: int = extra_levels
+        self.snapshot_interval: float = snapshot_interval  # 两次获取快照的最小间隔秒数
+        self.gateway_name: str = gateway_name
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        self.bids: BookSide = BookSide(True)
+        self.asks: BookSide = BookSide(False)
+
+        self.last_update_id: int = 0
+        self.event_time: int = 0  # 最后一条增量的推送时间，毫秒
+        self.synced: bool = False
+        self.first_update: bool = False  # 快照后的第一条增量，按快照位置校验
+
+        self.buffer: List[dict] = []  # 未同步时缓存的增量
+        self.fetching: bool = False
+        self.snapshot_time: float = 0
+        self.tick_time: float = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def on_depth(self, stream: str, data: dict) -> None:
+        """处理深度增量推送"""
+        tick: Optional[TickData] = None
+
+        with self.lock:
+            if not self.synced:
+                self.buffer.append(data)
+                self.request_snapshot()
+                return
+
+            if not self.apply_update(data):
+                self.logger.warning(
+                    "{}订单簿增量不连续，上次{}，本次{}-{}，重新获取快照".format(
+                        self.symbol, self.last_update_id, data["U"], data["u"]
+                    )
+                )
+                self.resync(data)
+                return
+
+            tick = self.check_tick()
+
+        if tick:
+            self.on_tick(tick)
+
+    def apply_update(self, data: dict) -> bool:
+        """应用一条增量，不连续时返回False"""
+        first_id: int = data["U"]
+        last_id: int = data["u"]
+
+        # 快照已包含的增量
+        if last_id <= self.last_update_id:
+            return True
+
+        if self.first_update:
+            valid: bool = first_id <= self.last_update_id + 1
+        elif "pu" in data:
+            valid = data["pu"] == self.last_update_id
+        else:
+            valid = first_id == self.last_update_id + 1
+
+        if not valid:
+            return False
+
+        for price, volume in data["b"]:
+            self.bids.update(float(price), float(volume))
+        for price, volume in data["a"]:
+            self.asks.update(float(price), float(volume))
+
+        self.last_update_id = last_id
+        self.event_time = data.get("E", self.event_time)
+        self.first_update = False
+        return True
+
+    def apply_snapshot(self, snapshot: dict) -> bool:
+        """应用快照和缓存的增量，缓存增量与快照不连续时返回False"""
+        self.bids.clear()
+        self.asks.clear()
+        for price, volume in snapshot["bids"]:
+            self.bids.update(float(price), float(volume))
+        for price, volume in snapshot["asks"]:
+            self.asks.update(float(price), float(volume))
+
+        self.last_update_id = snapshot["lastUpdateId"]
+        self.first_update = True
+
+        buffer: List[dict] = self.buffer
+        self.buffer = []
+        for data in buffer:
+            if not self.apply_update(data):
+                # 快照早于缓存的第一条增量，保留之后的增量重新获取
+                self.buffer = [d for d in buffer if d["u"] > self.last_update_id]
+                return False
+
+        self.synced = True
+        return True
+
+    def resync(self, data: dict = None) -> None:
+        """丢弃当前订单簿，重新获取快照"""
+        self.synced = False
+        self.buffer = [data] if data else []
+        self.request_snapshot()
+
+    def request_snapshot(self) -> None:
+        """在后台线程获取快照，避免阻塞推送线程"""
+        if self.fetching:
+            return
+
+        self.fetching = True
+        delay: float = max(self.snapshot_time + self.snapshot_interval - time.monotonic(), 0)
+        threading.Thread(target=self.fetch_snapshot, args=(delay,), daemon=True).start()
+
+    def fetch_snapshot(self, delay: float) -> None:
+        """"""
+        if delay:
+            time.sleep(delay)
+
+        try:
+            snapshot: dict = self.client.depth(self.symbol, limit=self.snapshot_limit)
+        except Exception as e:
+            self.logger.error("{}订单簿快照获取失败：{}".format(self.symbol, e))
+            snapshot = None
+
+        tick: Optional[TickData] = None
+        with self.lock:
+            self.snapshot_time = time.monotonic()
+            self.fetching = False
+
+            if snapshot is None:
+                # 下一条增量到达时重试
+                return
+
+            if not self.apply_snapshot(snapshot):
+                self.request_snapshot()
+                return
+
+            self.tick_time = 0
+            tick = self.check_tick()
+
+        if tick:
+            self.on_tick(tick)
+
+    def check_tick(self) -> Optional[TickData]:
+        """距上次推送超过throttle秒时返回TickData"""
+        if not self.on_tick:
+            return None
+
+        now: float = time.monotonic()
+        if now - self.tick_time < self.throttle:
+            return None
+
+        self.tick_time = now
+        return self.get_tick()
+
+    def get_tick(self) -> TickData:
+        """订单簿快照转换为TickData，前5档写入字段，extra中附带extra_levels档"""
+        if self.event_time:
+            dt: datetime = datetime.fromtimestamp(self.event_time / 1000, LOCAL_TZ)
+        else:
+            dt = datetime.now(LOCAL_TZ)
+
+        tick: TickData = TickData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=dt,
+            name=self.symbol,
+            gateway_name=self.gateway_name,
+            localtime=datetime.now()
+        )
+
+        bids: List[Tuple[float, float]] = self.bids.get_levels(max(self.extra_levels, 5))
+        asks: List[Tuple[float, float]] = self.asks.get_levels(max(self.extra_levels, 5))
+
+        for i, (price, volume) in enumerate(bids[:5], 1):
+            setattr(tick, f"bid_price_{i}", price)
+            setattr(tick, f"bid_volume_{i}", volume)
+        for i, (price, volume) in enumerate(asks[:5], 1):
+            setattr(tick, f"ask_price_{i}", price)
+            setattr(tick, f"ask_volume_{i}", volume)
+
+        tick.extra = {
+            "bids": bids[:self.extra_levels],
+            "asks": asks[:self.extra_levels],
+            "last_update_id": self.last_update_id
+        }
+        return tick
+
+    def get_best(self) -> Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]:
+        """买一和卖一的价格和数量"""
+        with self.lock:
+            return self.bids.get_best(), self.asks.get_best()
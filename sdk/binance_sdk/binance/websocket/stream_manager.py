@@ -0,0 +1,354 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from websocket import ABNF, create_connection
+
+from ..lib.utils import get_timestamp
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+def get_sequence(data):
+    """
+    返回消息的(首个序号, 最后序号, 上一条消息的最后序号)，没有序号时返回None
+    深度增量使用U/u，合约深度增量额外带有pu，逐笔成交使用t，归集成交使用a
+    """
+    event = data.get("e")
+    if event == "depthUpdate":
+        return data["U"], data["u"], data.get("pu")
+    if event == "trade":
+        return data["t"], data["t"], None
+    if event == "aggTrade":
+        return data["a"], data["a"], None
+    return None
+
+
+class StreamConnection(threading.Thread):
+    """
+    一个组合流连接，订阅的全部stream在连接地址中，
+    断线后按退避时间重连，重连地址包含当前全部stream，无需再次订阅
+    """
+
+    def __init__(self, manager, name):
+        threading.Thread.__init__(self, name=name, daemon=True)
+        self.manager = manager
+        self.logger = manager.logger
+
+        self.streams = set()
+        self.ws = None
+        self.active = False
+        self.connected = threading.Event()
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.last_send = 0  # 上次发送控制消息的时间，服务器限制每秒5条
+
+    def add_streams(self, streams):
+        """添加stream，已连接时发送订阅消息"""
+        with self.lock:
+            self.streams.update(streams)
+            if self.connected.is_set():
+                self._send_method("SUBSCRIBE", streams)
+
+    def remove_streams(self, streams):
+        """移除stream，已连接时发送取消订阅消息"""
+        with self.lock:
+            self.streams.difference_update(streams)
+            if self.connected.is_set():
+                self._send_method("UNSUBSCRIBE", streams)
+
+    def run(self):
+        self.active = True
+        delay = self.manager.reconnect_delay
+
+        while self.active:
+            try:
+                self.connect()
+                delay = self.manager.reconnect_delay
+                self.read_data()
+            except Exception as e:
+                if self.active:
+                    self.logger.error("Stream connection {} error: {}".format(self.name, e))
+            finally:
+                self.disconnect()
+
+            if not self.active:
+                break
+
+            self.logger.warning("Stream connection {} lost, reconnecting in {}s".format(self.name, delay))
+            self.manager._callback(self.manager.on_reconnect, self)
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, self.manager.max_reconnect_delay)
+
+    def stop(self):
+        """停止重连并关闭连接"""
+        self.active = False
+        self.stop_event.set()
+        ws = self.ws
+        if ws:
+            # 唤醒阻塞在recv中的线程
+            ws.abort()
+
+    def connect(self):
+        """使用当前全部stream创建组合流连接"""
+        with self.lock:
+            url = self.manager.stream_url + "/stream?" + urlencode(
+                {"streams": "/".join(sorted(self.streams))}, safe="/@"
+            )
+            self.logger.debug("Creating stream connection {}: {}".format(self.name, url))
+            self.ws = create_connection(url, timeout=self.manager.timeout)
+            self.connected.set()
+        self.manager._callback(self.manager.on_open, self)
+
+    def disconnect(self):
+        """"""
+        with self.lock:
+            self.connected.clear()
+            if self.ws:
+                self.ws.close()
+                self.ws = None
+
+    def read_data(self):
+        """读取数据帧，收到关闭帧时返回"""
+        while self.active:
+            op_code, frame = self.ws.recv_data_frame(True)
+
+            if op_code == ABNF.OPCODE_CLOSE:
+                self.logger.warning("CLOSE frame received on stream connection {}".format(self.name))
+                return
+            elif op_code == ABNF.OPCODE_PING:
+                self.ws.pong(frame.data)
+            elif op_code in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+                # 不解码为str，直接解析bytes
+                self.manager.on_frame(frame.data)
+
+    def _send_method(self, method, streams):
+        """发送订阅/取消订阅消息，间隔不少于0.2秒"""
+        wait = self.last_send + 0.2 - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        message = {"method": method, "params": list(streams), "id": get_timestamp()}
+        self.ws.send(json.dumps(message))
+        self.last_send = time.monotonic()
+
+
+class BinanceStreamManager:
+    """
+    多路复用的行情流管理器，多个stream合并到组合流连接中，
+    每个连接最多streams_per_connection个stream，一个连接一个线程。
+    收到的数据只解析一次，按stream名称分发到订阅时传入的处理函数，
+    并按消息序号检查是否丢失数据
+
+    Args:
+        stream_url (str, optional): the stream base url. By default, it's wss://stream.binance.com:9443
+        streams_per_connection (int, optional): max streams of one combined connection. By default, it's 200
+        on_gap (function, optional): called with (stream, expected, received) when a sequence gap is detected
+        on_open/on_reconnect (function, optional): called with the connection after connecting/losing connection
+        on_error (function, optional): called with the exception raised by a handler
+        reconnect_delay/max_reconnect_delay (float, optional): reconnect backoff seconds. By default, 1 and 60
+        timeout (float, optional): seconds without any frame before reconnecting. By default, 300
+
+        Args:
+        stream_url（str，optional）：行情流地址，默认为wss://stream.binance.com:9443
+        streams_per_connection（int，optional）：每个组合流连接最多的stream数量，默认为200
+        on_gap（function，optional）：发现序号缺失时调用，参数为(stream, 期望序号, 收到序号)
+        on_open/on_reconnect（function，optional）：连接成功/断线时调用，参数为连接
+        on_error（function，optional）：处理函数抛出异常时调用，参数为异常
+        reconnect_delay/max_reconnect_delay（float，optional）：重连退避秒数，默认为1和60
+        timeout（float，optional）：超过该秒数没有收到任何数据时重连，默认为300
+    """
+
+    def __init__(
+        self,
+        stream_url="wss://stream.binance.com:9443",
+        streams_per_connection=200,
+        on_gap=None,
+        on_open=None,
+        on_reconnect=None,
+        on_error=None,
+        reconnect_delay=1,
+        max_reconnect_delay=60,
+        timeout=300,
+        logger=None,
+    ):
+        if not logger:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+        self.stream_url = stream_url
+        self.streams_per_connection = streams_per_connection
+        self.on_gap = on_gap
+        self.on_open = on_open
+        self.on_reconnect = on_reconnect
+        self.on_error = on_error
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.timeout = timeout
+
+        self.handlers = {}  # stream: (handler, ...)，修改时整体替换，读取时无需加锁
+        self.sequences = {}  # stream: 最后收到的序号
+        self.connections = []
+        self.stream_connections = {}  # stream: connection
+        self.connection_count = 0  # 用于连接命名
+        self.lock = threading.Lock()
+
+    def subscribe(self, streams, handler):
+        """
+        订阅stream，收到数据时调用handler(stream, data)，
+        同一个stream可以有多个处理函数
+        """
+        if isinstance(streams, str):
+            streams = [streams]
+
+        new_streams = []
+        with self.lock:
+            for stream in streams:
+                if stream not in self.handlers:
+                    new_streams.append(stream)
+                self.handlers[stream] = self.handlers.get(stream, ()) + (handler,)
+
+            # 按连接分组，填满已有连接后创建新连接
+            added = defaultdict(list)
+            for stream in new_streams:
+                connection = self._get_free_connection(added)
+                added[connection].append(stream)
+                self.stream_connections[stream] = connection
+
+        for connection, connection_streams in added.items():
+            connection.add_streams(connection_streams)
+            if not connection.is_alive():
+                connection.start()
+
+    def unsubscribe(self, streams, handler=None):
+        """取消订阅，不传入handler时移除stream的全部处理函数"""
+        if isinstance(streams, str):
+            streams = [streams]
+
+        removed = defaultdict(list)
+        with self.lock:
+            for stream in streams:
+                handlers = self.handlers.get(stream)
+                if not handlers:
+                    continue
+
+                if handler:
+                    handlers = tuple(h for h in handlers if h != handler)
+                    if handlers:
+                        self.handlers[stream] = handlers
+                        continue
+
+                self.handlers.pop(stream)
+                self.sequences.pop(stream, None)
+                removed[self.stream_connections.pop(stream)].append(stream)
+
+            # 全部stream都已取消的连接直接关闭，不再用空地址重连
+            used = set(self.stream_connections.values())
+            closed = [connection for connection in removed if connection not in used]
+            for connection in closed:
+                self.connections.remove(connection)
+
+        for connection, connection_streams in removed.items():
+            if connection in closed:
+                connection.stop()
+            else:
+                connection.remove_streams(connection_streams)
+
+    def stop(self):
+        """关闭全部连接并清空订阅，之后可以重新订阅"""
+        with self.lock:
+            connections = self.connections
+            self.connections = []
+            self.stream_connections = {}
+            self.handlers = {}
+            self.sequences = {}
+        for connection in connections:
+            connection.stop()
+        for connection in connections:
+            if connection.is_alive():
+                connection.join()
+
+    def wait_connected(self, timeout=None):
+        """等待全部连接建立，返回是否全部连接成功"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not connection.connected.wait(remaining):
+                return False
+        return True
+
+    def on_frame(self, frame):
+        """解析组合流数据并分发到处理函数"""
+        try:
+            message = loads(frame)
+        except ValueError as e:
+            self.logger.error("Invalid stream message {!r}: {}".format(frame, e))
+            return
+
+        stream = message.get("stream") if isinstance(message, dict) else None
+        if stream is None:
+            # 订阅/取消订阅的回复
+            if isinstance(message, dict) and "code" in message:
+                self.logger.error("Stream error message: {}".format(message))
+            else:
+                self.logger.debug("Stream control message: {}".format(message))
+            return
+
+        data = message.get("data")
+        if isinstance(data, dict):
+            self.check_sequence(stream, data)
+
+        for handler in self.handlers.get(stream, ()):
+            try:
+                handler(stream, data)
+            except Exception as e:
+                self.logger.error("Error from handler {} of {}: {}".format(handler, stream, e))
+                if self.on_error:
+                    self.on_error(e)
+
+    def check_sequence(self, stream, data):
+        """检查序号是否连续，包括断线重连期间丢失的数据"""
+        sequence = get_sequence(data)
+        if not sequence:
+            return
+        first, last, prev = sequence
+
+        previous = self.sequences.get(stream)
+        if previous is not None and last > previous:
+            if prev is not None:
+                gap = prev != previous
+            else:
+                gap = first > previous + 1
+            if gap:
+                self.logger.warning("Sequence gap in {}: expected {}, received {}".format(stream, previous + 1, first))
+                if self.on_gap:
+                    self.on_gap(stream, previous + 1, first)
+
+        if previous is None or last > previous:
+            self.sequences[stream] = last
+
+    def _get_free_connection(self, added):
+        """返回还能添加stream的连接，没有时创建新连接"""
+        for connection in self.connections:
+            if len(connection.streams) + len(added.get(connection, ())) < self.streams_per_connection:
+                return connection
+
+        connection = StreamConnection(self, "stream-{}".format(self.connection_count))
+        self.connection_count += 1
+        self.connections.append(connection)
+        return connection
+
+    def _callback(self, callback, *args):
+        if callback:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error("Error from callback {}: {}".format(callback, e))
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+
+from binance.download.download_kline import plan_kline_files
+
+
+TODAY = date(2023, 6, 15)
+
+
+def test_plan_monthly_for_complete_months():
+    plan = plan_kline_files("1m", date(2023, 1, 30), date(2023, 4, 2), today=TODAY)
+
+    plan.should.equal([
+        ("daily", "2023-01-30"),
+        ("daily", "2023-01-31"),
+        ("monthly", "2023-02"),
+        ("monthly", "2023-03"),
+        ("daily", "2023-04-01"),
+        ("daily", "2023-04-02"),
+    ])
+
+
+def test_plan_daily_for_unfinished_month():
+    plan = plan_kline_files("1h", date(2023, 5, 1), date(2023, 6, 3), today=TODAY)
+
+    plan.should.equal([
+        ("monthly", "2023-05"),
+        ("daily", "2023-06-01"),
+        ("daily", "2023-06-02"),
+        ("daily", "2023-06-03"),
+    ])
+
+
+def test_plan_skip_covered_files():
+    covered = [(datetime(2023, 1, 1), datetime(2023, 2, 28, 23, 59))]
+    plan = plan_kline_files("1m", date(2023, 1, 1), date(2023, 3, 1), covered, today=TODAY)
+
+    plan.should.equal([("daily", "2023-03-01")])
+
+
+def test_plan_daily_for_gaps_in_covered_month():
+    covered = [
+        (datetime(2023, 1, 1), datetime(2023, 1, 9, 23, 59)),
+        (datetime(2023, 1, 12), datetime(2023, 1, 31, 23, 59)),
+    ]
+    plan = plan_kline_files("1m", date(2023, 1, 1), date(2023, 1, 31), covered, today=TODAY)
+
+    plan.should.equal([("daily", "2023-01-10"), ("daily", "2023-01-11")])
+
+
+def test_plan_partially_covered_day_is_downloaded():
+    covered = [(datetime(2023, 1, 1), datetime(2023, 1, 20, 12))]
+    plan = plan_kline_files("1h", date(2023, 1, 1), date(2023, 1, 31), covered, today=TODAY)
+
+    plan.should.equal([("daily", "2023-01-{}".format(d)) for d in range(20, 32)])
+
+
+def test_plan_weekly_monthly_only():
+    plan = plan_kline_files("1w", date(2023, 1, 15), date(2023, 7, 1), today=TODAY)
+
+    plan.should.equal([
+        ("monthly", "2023-01"),
+        ("monthly", "2023-02"),
+        ("monthly", "2023-03"),
+        ("monthly", "2023-04"),
+        ("monthly", "2023-05"),
+    ])
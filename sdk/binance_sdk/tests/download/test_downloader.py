@@ -0,0 +1,236 @@
+import io
+import os
+import random
+import threading
+import time
+import zipfile
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from binance.download.downloader import (
+    Downloader,
+    DownloadTask,
+    STATUS_DOWNLOADED,
+    STATUS_EXISTS,
+    STATUS_MISSING,
+    STATUS_FAILED,
+)
+from binance.download.download_kline import download_klines
+
+
+def make_zip(name, rows=5000):
+    rand = random.Random(name)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as f:
+        lines = ["{},{},{},{},{},{}".format(i * 60000, *[rand.random() for _ in range(5)]) for i in range(rows)]
+        f.writestr(name.replace(".zip", ".csv"), "\n".join(lines))
+    return buffer.getvalue()
+
+
+FILES = {
+    "/data/spot/daily/klines/BTCUSDT/1m/BTCUSDT-1m-2023-01-0{}.zip".format(i): make_zip(
+        "BTCUSDT-1m-2023-01-0{}.zip".format(i)
+    )
+    for i in range(1, 6)
+}
+
+
+# 直接返回错误状态码的故障
+FAULT_STATUS = {"error": 500, "throttled": 429, "forbidden": 403}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve fixture zips with Range support and injectable faults"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+            faults = server.faults.get(self.path)
+            fault = faults.pop(0) if faults else None
+
+        if fault in FAULT_STATUS:
+            self.send_response(FAULT_STATUS[fault])
+            self.end_headers()
+            return
+
+        data = FILES.get(self.path)
+        if data is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        offset = 0
+        range_header = self.headers.get("Range")
+        if range_header:
+            offset = int(range_header[len("bytes="):-1])
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(offset, len(data) - 1, len(data)))
+        else:
+            self.send_response(200)
+
+        body = data[offset:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # 只发送一半内容后断开，模拟传输中断
+        if fault == "truncate":
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.faults = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_downloader(server, **kwargs):
+    base_url = "http://127.0.0.1:{}/".format(server.server_address[1])
+    kwargs.setdefault("backoff", 0)
+    kwargs.setdefault("rate_limit", 0)
+    return Downloader(base_url=base_url, **kwargs)
+
+
+def make_tasks(tmp_path, paths):
+    return [DownloadTask(path.lstrip("/"), os.path.join(str(tmp_path), os.path.basename(path))) for path in paths]
+
+
+def test_download_files_concurrently(server, tmp_path):
+    downloader = make_downloader(server, max_workers=4)
+    tasks = downloader.download(make_tasks(tmp_path, FILES))
+
+    for task in tasks:
+        task.status.should.equal(STATUS_DOWNLOADED)
+        with open(task.save_path, "rb") as f:
+            f.read().should.equal(FILES["/" + task.file_url])
+        with zipfile.ZipFile(task.save_path) as f:
+            len(f.namelist()).should.equal(1)
+
+    os.listdir(str(tmp_path)).should.have.length_of(len(FILES))
+
+
+def test_skip_existing_file(server, tmp_path):
+    path = list(FILES)[0]
+    task = make_tasks(tmp_path, [path])[0]
+    with open(task.save_path, "wb") as f:
+        f.write(b"local")
+
+    make_downloader(server).download([task])
+
+    task.status.should.equal(STATUS_EXISTS)
+    server.requests.should.be.empty
+
+
+def test_missing_file_is_not_retried(server, tmp_path):
+    path = "/data/spot/daily/klines/BTCUSDT/1m/BTCUSDT-1m-2023-02-01.zip"
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=3).download([task])
+
+    task.status.should.equal(STATUS_MISSING)
+    len(server.requests).should.equal(1)
+    os.path.exists(task.save_path).should.be.false
+
+
+def test_retry_server_error(server, tmp_path):
+    path = list(FILES)[0]
+    server.faults[path] = ["error", "error"]
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=2).download([task])
+
+    task.status.should.equal(STATUS_DOWNLOADED)
+    len(server.requests).should.equal(3)
+
+
+def test_retry_rate_limited(server, tmp_path):
+    path = list(FILES)[0]
+    server.faults[path] = ["throttled"]
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=2).download([task])
+
+    task.status.should.equal(STATUS_DOWNLOADED)
+    len(server.requests).should.equal(2)
+
+
+def test_client_error_is_not_retried(server, tmp_path):
+    path = list(FILES)[0]
+    server.faults[path] = ["forbidden"]
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=3).download([task])
+
+    task.status.should.equal(STATUS_FAILED)
+    task.error.should.contain("403")
+    len(server.requests).should.equal(1)
+
+
+def test_fail_after_max_retries(server, tmp_path):
+    path = list(FILES)[0]
+    server.faults[path] = ["error"] * 3
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=1).download([task])
+
+    task.status.should.equal(STATUS_FAILED)
+    len(server.requests).should.equal(2)
+    os.path.exists(task.save_path).should.be.false
+
+
+def test_resume_partial_download(server, tmp_path):
+    path = list(FILES)[0]
+    server.faults[path] = ["truncate"]
+    task = make_tasks(tmp_path, [path])[0]
+
+    make_downloader(server, max_retries=1).download([task])
+
+    task.status.should.equal(STATUS_DOWNLOADED)
+    with open(task.save_path, "rb") as f:
+        f.read().should.equal(FILES[path])
+
+    # 第二次请求从已写入临时文件的位置继续
+    server.requests[0][1].should.be.none
+    offset = int(server.requests[1][1][len("bytes="):-1])
+    offset.should.be.greater_than(0)
+    offset.should.be.lower_than_or_equal_to(len(FILES[path]) // 2)
+
+
+def test_rate_limit(server, tmp_path):
+    downloader = make_downloader(server, max_workers=5, rate_limit=20)
+    start = time.monotonic()
+    downloader.download(make_tasks(tmp_path, FILES))
+
+    # 5个请求间隔至少0.05秒
+    (time.monotonic() - start).should.be.greater_than(0.19)
+
+
+def test_download_klines_fallback_to_daily(server, tmp_path):
+    downloader = make_downloader(server)
+    files = download_klines("spot", "BTCUSDT", "1m", date(2023, 1, 1), date(2023, 1, 31),
+                            folder=str(tmp_path), downloader=downloader)
+
+    # 月度文件不存在，改为下载当月日度文件，其中只有5个存在
+    server.requests[0][0].should.equal("/data/spot/monthly/klines/BTCUSDT/1m/BTCUSDT-1m-2023-01.zip")
+    len(server.requests).should.equal(32)
+    [os.path.basename(path) for path in files].should.equal(
+        ["BTCUSDT-1m-2023-01-0{}.zip".format(i) for i in range(1, 6)]
+    )
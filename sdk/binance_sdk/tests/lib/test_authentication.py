@@ -1,4 +1,6 @@
-from binance.lib.authentication import hmac_hashing, rsa_signature
+from Crypto.PublicKey import RSA
+
+from binance.lib.authentication import hmac_hashing, rsa_signature, HmacSigner, RsaSigner, get_signer
 
 
 def test_hamc_hashing():
@@ -81,3 +83,27 @@ qoOMy1yIoV7uYL+c4zugjzpgy58iBAiR1IVectxQY9lx1+d9tfjwK2Ne96hdzlLO
         "utf-8"
     )
     sign.should.equal(expected_signature)
+
+
+def test_hmac_signer():
+    secret = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+    signer = HmacSigner(secret)
+
+    # 重复签名结果一致，不受之前签名的影响
+    for data in ["timestamp=1578963600000", "symbol=BTCUSDT&timestamp=1578963600000", "timestamp=1578963600000"]:
+        signer.sign(data).should.equal(hmac_hashing(secret, data))
+
+
+def test_rsa_signer():
+    private_key = RSA.generate(2048).export_key().decode("utf-8")
+    payload = "symbol=LTCBTC&side=BUY&type=LIMIT&timeInForce=GTC&quantity=1&price=0.1&recvWindow=5000&timestamp=1499827319559"
+    signer = RsaSigner(private_key)
+
+    signer.sign(payload).should.equal(rsa_signature(private_key, payload).decode("utf-8"))
+    signer.sign(payload + "0").should.equal(rsa_signature(private_key, payload + "0").decode("utf-8"))
+
+
+def test_get_signer():
+    private_key = RSA.generate(2048).export_key().decode("utf-8")
+    get_signer(api_secret="secret").should.be.a(HmacSigner)
+    get_signer(api_secret="secret", private_key=private_key).should.be.a(RsaSigner)
@@ -0,0 +1,141 @@
+import threading
+import time
+
+from binance.lib.rate_limiter import (
+    RateBucket,
+    RateLimiter,
+    RateRequest,
+    get_request_weight,
+    PRIORITY_ORDER,
+    PRIORITY_DATA,
+)
+from tests.util import window_clock
+
+
+class FakeResponse(object):
+    def __init__(self, headers=None, status_code=200):
+        self.headers = headers or {}
+        self.status_code = status_code
+
+
+def test_request_weight():
+    get_request_weight("GET", "/api/v3/klines").should.equal(2)
+    get_request_weight("GET", "/api/v3/depth").should.equal(5)
+    get_request_weight("GET", "/api/v3/depth", {"limit": 1000}).should.equal(50)
+    get_request_weight("GET", "/api/v3/depth", {"limit": 5000}).should.equal(250)
+    get_request_weight("GET", "/api/v3/ticker/24hr", {"symbol": "BTCUSDT"}).should.equal(2)
+    get_request_weight("GET", "/api/v3/ticker/24hr").should.equal(80)
+    get_request_weight("GET", "/api/v3/openOrders").should.equal(80)
+    get_request_weight("DELETE", "/api/v3/openOrders", {"symbol": "BTCUSDT"}).should.equal(1)
+    get_request_weight("GET", "/api/v3/order").should.equal(4)
+    get_request_weight("POST", "/api/v3/order").should.equal(1)
+    get_request_weight("GET", "/api/v3/time").should.equal(1)
+
+
+def test_request_priority():
+    order = RateRequest("POST", "/api/v3/order")
+    order.priority.should.equal(PRIORITY_ORDER)
+    order.order_count.should.equal(1)
+
+    cancel = RateRequest("DELETE", "/api/v3/order")
+    cancel.priority.should.equal(PRIORITY_ORDER)
+    cancel.order_count.should.equal(0)
+
+    query = RateRequest("GET", "/api/v3/order")
+    query.priority.should.equal(PRIORITY_DATA)
+
+    RateRequest("GET", "/sapi/v1/capital/config/getall").sapi.should.be.true
+
+
+def test_bucket_reserve_for_orders():
+    bucket = RateBucket(100, 60, "x-mbx-used-weight-1m", reserve=10)
+    now = 600.0
+
+    bucket.get_delay(90, PRIORITY_DATA, now).should.equal(0)
+    bucket.consume(90)
+
+    # 行情请求不能占用保留额度，等待到下一分钟
+    bucket.get_delay(1, PRIORITY_DATA, now + 10).should.equal(50)
+    bucket.get_delay(10, PRIORITY_ORDER, now + 10).should.equal(0)
+    bucket.get_delay(11, PRIORITY_ORDER, now + 10).should.equal(50)
+
+    # 进入新窗口后额度补满
+    bucket.get_delay(90, PRIORITY_DATA, now + 60).should.equal(0)
+    bucket.used.should.equal(0)
+
+
+def test_bucket_sync_with_server():
+    bucket = RateBucket(100, 60, "x-mbx-used-weight-1m")
+    bucket.refill(600.0)
+    bucket.consume(5)
+
+    bucket.sync(40, 601.0)
+    bucket.used.should.equal(40)
+
+    # 服务器返回值小于本地已用额度时不减少
+    bucket.sync(20, 602.0)
+    bucket.used.should.equal(40)
+
+    # 请求在上一个窗口发送，忽略
+    bucket.sync(90, 599.0)
+    bucket.used.should.equal(40)
+
+
+def test_update_from_headers():
+    limiter = RateLimiter()
+    sent = limiter.acquire("GET", "/api/v3/klines")
+    limiter.update(FakeResponse({"x-mbx-used-weight-1m": "3000", "x-mbx-order-count-10s": "7"}), sent)
+
+    limiter.weight_bucket.used.should.equal(3000)
+    limiter.order_bucket.used.should.equal(7)
+    limiter.sapi_bucket.used.should.equal(0)
+
+
+def test_block_after_rate_limited():
+    limiter = RateLimiter()
+    sent = limiter.acquire("GET", "/api/v3/time")
+    limiter.update(FakeResponse({"Retry-After": "1"}, 429), sent)
+
+    start = time.monotonic()
+    limiter.acquire("GET", "/api/v3/time")
+    (time.monotonic() - start).should.be.greater_than(0.8)
+
+
+def test_order_limit():
+    limiter = RateLimiter(order_limit=2, clock=window_clock())
+    limiter.acquire("POST", "/api/v3/order")
+    limiter.acquire("POST", "/api/v3/order")
+
+    # 撤单不计入下单数量
+    limiter.acquire("DELETE", "/api/v3/order")
+
+    request = RateRequest("POST", "/api/v3/order")
+    with limiter.condition:
+        limiter._try_consume(request, limiter.clock()).should.be.greater_than(0)
+
+
+def test_orders_before_market_data():
+    limiter = RateLimiter(weight_limit=2, reserve_ratio=0, clock=window_clock())
+    limiter.acquire("GET", "/api/v3/klines")
+    finished = []
+
+    def send(http_method, url_path):
+        limiter.acquire(http_method, url_path)
+        finished.append(url_path)
+
+    # 额度用尽后先有行情请求等待，再有下单请求等待
+    threads = [threading.Thread(target=send, args=("GET", "/api/v3/time"), daemon=True)]
+    threads.append(threading.Thread(target=send, args=("POST", "/api/v3/order"), daemon=True))
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+
+    # 释放1个额度，由后到的下单请求获取
+    with limiter.condition:
+        limiter.weight_bucket.used = 1
+        limiter.condition.notify_all()
+
+    threads[1].join(1)
+    time.sleep(0.05)
+    finished.should.equal(["/api/v3/order"])
+    limiter.order_waiting.should.equal(0)
@@ -6,6 +6,7 @@ from binance.__version__ import __version__
 from binance.api import API
 from binance.error import ParameterRequiredError, ServerError
 from binance.error import ClientError
+from binance.lib.rate_limiter import RateLimiter
 import logging
 
 mock_item = {"key_1": "value_1", "key_2": "value_2"}
@@ -206,3 +207,33 @@ def test_error_response_with_400_status_code():
     url = "/test/error/response/with/400"
     client = API(base_url=mock_base_url)
     client.send_request.when.called_with("GET", url).should.throw(ClientError)
+
+
+@mock_http_response(responses.POST, "/test/sign", mock_item, 200)
+def test_sign_request_reuse_signer():
+    """Tests the signer is created once and the signature is appended last"""
+
+    client = API(random_str(), "secret", base_url=mock_base_url)
+    client.sign_request("POST", "/test/sign", {"symbol": "BTCUSDT", "price": None})
+    signer = client.signer
+    client.sign_request("POST", "/test/sign", {"symbol": "ETHUSDT"})
+
+    client.signer.should.be(signer)
+    query = responses.calls[1].request.url.split("?")[1]
+    query.should.match(r"^symbol=ETHUSDT&timestamp=\d+&signature=[0-9a-f]{64}$")
+    signer.sign(query.split("&signature=")[0]).should.equal(query.split("&signature=")[1])
+
+
+@mock_http_response(
+    responses.GET, "/api/v3/klines", mock_item, 200, headers={"x-mbx-used-weight-1m": "300"}
+)
+def test_rate_limiter_shared_by_clients():
+    """Tests the clients consume weight from one limiter and sync with the server"""
+
+    limiter = RateLimiter()
+    for _ in range(2):
+        client = API(base_url=mock_base_url, rate_limiter=limiter)
+        client.query("/api/v3/klines", {"symbol": "BTCUSDT", "interval": "1m"}).should.equal(mock_item)
+
+    # 第一次响应校正为300，第二次请求在此基础上占用2
+    limiter.weight_bucket.used.should.equal(302)
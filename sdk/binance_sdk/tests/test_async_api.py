@@ -0,0 +1,180 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from binance.error import ClientError
+from binance.lib.authentication import hmac_hashing
+from binance.lib.rate_limiter import RateLimiter
+from binance.spot import AsyncSpot
+from tests.util import window_clock
+
+API_KEY = "api_key"
+API_SECRET = "api_secret"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Answer every request with its path and params after a short delay"""
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            status, headers = server.faults.pop(0) if server.faults else (200, {})
+            server.weight += 1
+
+        time.sleep(server.delay)
+
+        with server.lock:
+            server.active -= 1
+            weight = server.weight
+
+        if status == 200:
+            body = {"path": url.path, "query": url.query, "params": parse_qs(url.query)}
+        else:
+            body = {"code": -1003, "msg": "Too many requests."}
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("x-mbx-used-weight-1m", str(weight))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = do_GET
+    do_DELETE = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.faults = []
+    httpd.active = 0
+    httpd.max_active = 0
+    httpd.weight = 0
+    httpd.delay = 0.1
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **kwargs):
+    base_url = "http://127.0.0.1:{}".format(server.server_address[1])
+    return AsyncSpot(API_KEY, API_SECRET, base_url=base_url, **kwargs)
+
+
+def test_gather_requests_concurrently(server):
+    symbols = ["SYMBOL{}".format(i) for i in range(8)]
+
+    async def run():
+        async with make_client(server, max_concurrency=4) as client:
+            return await asyncio.gather(*[client.klines(symbol, "1m") for symbol in symbols])
+
+    start = time.monotonic()
+    results = asyncio.run(run())
+    cost = time.monotonic() - start
+
+    # 8个请求每个耗时0.1秒，4个并发约需0.2秒
+    [result["params"]["symbol"][0] for result in results].should.equal(symbols)
+    server.max_active.should.equal(4)
+    cost.should.be.lower_than(0.6)
+
+
+def test_sign_request(server):
+    async def run():
+        async with make_client(server) as client:
+            return await client.get_open_orders("BTCUSDT")
+
+    result = asyncio.run(run())
+
+    result["path"].should.equal("/api/v3/openOrders")
+    query, signature = result["query"].rsplit("&signature=", 1)
+    signature.should.equal(hmac_hashing(API_SECRET, query))
+    result["params"]["symbol"].should.equal(["BTCUSDT"])
+    result["params"].should.have.key("timestamp")
+
+
+def test_limited_encoded_sign_request(server):
+    async def run():
+        async with make_client(server) as client:
+            return await client.limited_encoded_sign_request("GET", "/sapi/v1/test", {"symbols": '["A","B"]'})
+
+    result = asyncio.run(run())
+
+    query, signature = result["query"].rsplit("&signature=", 1)
+    signature.should.equal(hmac_hashing(API_SECRET, query))
+    result["params"]["symbols"].should.equal(['["A","B"]'])
+
+
+def test_track_used_weight(server):
+    # 同一IP的其他进程已占用100权重
+    server.weight = 100
+
+    async def run():
+        async with make_client(server) as client:
+            await asyncio.gather(*[client.time() for _ in range(5)])
+            return client.rate_limiter.weight_bucket.used
+
+    asyncio.run(run()).should.equal(105)
+
+
+def test_pause_after_rate_limited(server):
+    server.faults = [(429, {"Retry-After": "1"})]
+
+    async def run():
+        async with make_client(server) as client:
+            with pytest.raises(ClientError) as e:
+                await client.time()
+            e.value.status_code.should.equal(429)
+
+            # 下一个请求等待Retry-After之后再发送
+            start = time.monotonic()
+            await client.time()
+            return time.monotonic() - start
+
+    asyncio.run(run()).should.be.greater_than(0.8)
+    len(server.requests).should.equal(2)
+
+
+def test_pause_when_weight_limit_reached(server):
+    async def run():
+        limiter = RateLimiter(weight_limit=2, reserve_ratio=0, clock=window_clock())
+        async with make_client(server, rate_limiter=limiter) as client:
+            await client.time()
+            await client.time()
+
+            # 权重用尽后新请求等待到下一分钟
+            task = asyncio.ensure_future(client.time())
+            await asyncio.sleep(0.3)
+            done = task.done()
+            task.cancel()
+            return done
+
+    asyncio.run(run()).should.be.false
+    len(server.requests).should.equal(2)
+
+
+def test_reuse_client_across_event_loops(server):
+    client = make_client(server)
+    asyncio.run(client.time())
+    asyncio.run(client.time())
+    client.close()
+
+    len(server.requests).should.equal(2)
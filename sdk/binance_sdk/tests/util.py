@@ -43,3 +43,9 @@ def current_timestamp() -> int:
 
 def timestamp(in_future: int = 0) -> int:
     return current_timestamp() + in_future
+
+
+def window_clock():
+    """从整分钟开始计时的时钟，限流测试在同一个窗口内完成，不受整分钟边界影响"""
+    start = time.monotonic()
+    return lambda: 1700000040 + time.monotonic() - start
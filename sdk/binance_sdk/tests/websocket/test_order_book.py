@@ -0,0 +1,179 @@
+import threading
+import time
+
+from binance.websocket.order_book import BinanceOrderBook, BookSide
+
+
+class FakeClient(object):
+    """Return queued depth snapshots, blocking until one is available"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = []
+        self.event = threading.Event()
+        if self.snapshots:
+            self.event.set()
+
+    def depth(self, symbol, limit=None):
+        self.event.wait(3)
+        self.calls.append((symbol, limit))
+        snapshot = self.snapshots.pop(0)
+        if not self.snapshots:
+            self.event.clear()
+        return snapshot
+
+    def add(self, snapshot):
+        self.snapshots.append(snapshot)
+        self.event.set()
+
+
+def snapshot(last_update_id, bids, asks):
+    return {
+        "lastUpdateId": last_update_id,
+        "bids": [[str(p), str(v)] for p, v in bids],
+        "asks": [[str(p), str(v)] for p, v in asks],
+    }
+
+
+def depth(first, last, bids=(), asks=(), **kwargs):
+    data = {
+        "e": "depthUpdate",
+        "E": 1672531200000,
+        "s": "BTCUSDT",
+        "U": first,
+        "u": last,
+        "b": [[str(p), str(v)] for p, v in bids],
+        "a": [[str(p), str(v)] for p, v in asks],
+    }
+    data.update(kwargs)
+    return data
+
+
+def wait_until(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_book(client, **kwargs):
+    kwargs.setdefault("snapshot_interval", 0)
+    return BinanceOrderBook(client, "BTCUSDT", **kwargs)
+
+
+def test_book_side():
+    bids = BookSide(True)
+    for price, volume in [(100, 1), (102, 2), (101, 3)]:
+        bids.update(price, volume)
+    bids.get_best().should.equal((102, 2))
+    bids.get_levels(2).should.equal([(102, 2), (101, 3)])
+
+    bids.update(102, 0)
+    bids.update(99, 0)
+    bids.get_best().should.equal((101, 3))
+    len(bids).should.equal(2)
+
+    asks = BookSide(False)
+    for price, volume in [(105, 1), (103, 2), (104, 3)]:
+        asks.update(price, volume)
+    asks.get_levels(5).should.equal([(103, 2), (104, 3), (105, 1)])
+
+    asks.update(103, 5)
+    asks.get_best().should.equal((103, 5))
+    len(asks).should.equal(3)
+
+
+def test_sync_with_buffered_updates():
+    client = FakeClient()
+    book = make_book(client)
+
+    # 获取快照期间的增量先缓存
+    book.on_depth("btcusdt@depth", depth(5, 8, bids=[(99, 9)]))
+    book.on_depth("btcusdt@depth", depth(9, 12, bids=[(100, 0), (98, 4)], asks=[(101, 6)]))
+    book.synced.should.be.false
+
+    client.add(snapshot(10, [(100, 1), (99, 2)], [(101, 1), (102, 2)]))
+    wait_until(lambda: book.synced).should.be.true
+
+    book.on_depth("btcusdt@depth", depth(13, 15, asks=[(101, 0)]))
+
+    client.calls.should.equal([("BTCUSDT", 1000)])
+    book.last_update_id.should.equal(15)
+    book.bids.get_levels(5).should.equal([(99, 2), (98, 4)])
+    book.asks.get_levels(5).should.equal([(102, 2)])
+
+
+def test_resync_on_gap():
+    client = FakeClient(snapshot(10, [(100, 1)], [(101, 1)]))
+    book = make_book(client)
+    book.on_depth("btcusdt@depth", depth(11, 12))
+    wait_until(lambda: book.synced).should.be.true
+
+    # 缺失13-14
+    book.on_depth("btcusdt@depth", depth(15, 16, bids=[(100, 5)]))
+    book.synced.should.be.false
+
+    client.add(snapshot(20, [(100, 3)], [(101, 1)]))
+    book.on_depth("btcusdt@depth", depth(17, 21, bids=[(100, 4)]))
+    wait_until(lambda: book.synced).should.be.true
+
+    len(client.calls).should.equal(2)
+    book.last_update_id.should.equal(21)
+    book.bids.get_best().should.equal((100, 4))
+
+
+def test_refetch_when_snapshot_is_stale():
+    client = FakeClient(snapshot(5, [(100, 1)], [(101, 1)]))
+    book = make_book(client)
+
+    # 快照早于缓存的第一条增量，重新获取
+    book.on_depth("btcusdt@depth", depth(10, 12))
+    wait_until(lambda: len(client.calls) == 1).should.be.true
+    client.add(snapshot(11, [(100, 2)], [(101, 1)]))
+
+    wait_until(lambda: book.synced).should.be.true
+    len(client.calls).should.equal(2)
+    book.last_update_id.should.equal(12)
+
+
+def test_futures_previous_update_id():
+    client = FakeClient(snapshot(10, [(100, 1)], [(101, 1)]))
+    book = make_book(client)
+    book.on_depth("btcusdt@depth", depth(8, 11, pu=7))
+    wait_until(lambda: book.synced).should.be.true
+
+    # 合约增量的U不连续，按pu校验
+    book.on_depth("btcusdt@depth", depth(14, 16, pu=11, bids=[(100, 2)]))
+    book.synced.should.be.true
+    book.bids.get_best().should.equal((100, 2))
+
+    book.on_depth("btcusdt@depth", depth(20, 22, pu=18))
+    book.synced.should.be.false
+
+
+def test_throttle_ticks():
+    ticks = []
+    client = FakeClient(snapshot(10, [(100 - i, 1) for i in range(30)], [(101 + i, 1) for i in range(30)]))
+    book = make_book(client, on_tick=ticks.append, throttle=10)
+    book.on_depth("btcusdt@depth", depth(11, 11))
+    wait_until(lambda: ticks).should.be.true
+
+    for i in range(12, 20):
+        book.on_depth("btcusdt@depth", depth(i, i, bids=[(100, i)]))
+    len(ticks).should.equal(1)
+
+    tick = ticks[0]
+    tick.vt_symbol.should.equal("BTCUSDT.BINANCE")
+    tick.bid_price_1.should.equal(100)
+    tick.bid_price_5.should.equal(96)
+    tick.ask_price_1.should.equal(101)
+    tick.ask_volume_5.should.equal(1)
+    len(tick.extra["bids"]).should.equal(20)
+    tick.extra["last_update_id"].should.equal(11)
+
+    book.tick_time = 0
+    book.on_depth("btcusdt@depth", depth(20, 20))
+    len(ticks).should.equal(2)
+    ticks[1].bid_volume_1.should.equal(19)
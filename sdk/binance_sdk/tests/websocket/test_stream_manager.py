@@ -0,0 +1,311 @@
+import base64
+import hashlib
+import json
+import socketserver
+import struct
+import threading
+import time
+
+import pytest
+
+from binance.websocket.stream_manager import BinanceStreamManager, get_sequence
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def make_frame(payload, opcode=0x1):
+    """Server frames are not masked"""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+def read_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError
+        data += chunk
+    return data
+
+
+def read_frame(sock):
+    """Client frames are masked"""
+    first, second = read_exact(sock, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", read_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", read_exact(sock, 8))[0]
+    mask = read_exact(sock, 4)
+    payload = read_exact(sock, length)
+    return first & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+class StreamHandler(socketserver.BaseRequestHandler):
+    """Minimal websocket server recording connection paths and client messages"""
+
+    def handle(self):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += self.request.recv(4096)
+        lines = request.decode().split("\r\n")
+        path = lines[0].split(" ")[1]
+        headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+        accept = base64.b64encode(hashlib.sha1((headers["Sec-WebSocket-Key"] + GUID).encode()).digest()).decode()
+        self.request.sendall(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            "Sec-WebSocket-Accept: {}\r\n\r\n".format(accept).encode()
+        )
+
+        server = self.server
+        with server.lock:
+            server.paths.append(path)
+            server.clients.append(self)
+
+        try:
+            while True:
+                opcode, payload = read_frame(self.request)
+                if opcode == 0x8:
+                    self.request.sendall(make_frame(b"", 0x8))
+                    break
+                with server.lock:
+                    server.messages.append(json.loads(payload))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with server.lock:
+                if self in server.clients:
+                    server.clients.remove(self)
+
+    def send(self, stream, data):
+        self.request.sendall(make_frame(json.dumps({"stream": stream, "data": data}).encode()))
+
+    def drop(self):
+        """Close the socket without a close frame"""
+        self.request.shutdown(2)
+
+
+class StreamServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def server():
+    httpd = StreamServer(("127.0.0.1", 0), StreamHandler)
+    httpd.lock = threading.Lock()
+    httpd.paths = []
+    httpd.clients = []
+    httpd.messages = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_manager(server, **kwargs):
+    kwargs.setdefault("reconnect_delay", 0.05)
+    url = "ws://127.0.0.1:{}".format(server.server_address[1])
+    return BinanceStreamManager(url, **kwargs)
+
+
+def wait_until(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def get_client(server, stream):
+    with server.lock:
+        for client, path in zip(server.clients, server.paths[-len(server.clients):]):
+            if stream in path:
+                return client
+
+
+def depth(first, last):
+    return {"e": "depthUpdate", "s": "BTCUSDT", "U": first, "u": last, "b": [], "a": []}
+
+
+def test_get_sequence():
+    get_sequence(depth(1, 5)).should.equal((1, 5, None))
+    get_sequence({"e": "depthUpdate", "U": 1, "u": 5, "pu": 0}).should.equal((1, 5, 0))
+    get_sequence({"e": "trade", "t": 7}).should.equal((7, 7, None))
+    get_sequence({"e": "aggTrade", "a": 8}).should.equal((8, 8, None))
+    get_sequence({"e": "kline"}).should.be.none
+
+
+def test_combine_streams_and_route(server):
+    manager = make_manager(server, streams_per_connection=2)
+    received = []
+    streams = ["btcusdt@trade", "ethusdt@trade", "bnbusdt@trade", "btcusdt@kline_1m"]
+    manager.subscribe(streams, lambda stream, data: received.append((stream, data)))
+    manager.subscribe("btcusdt@kline_1m", lambda stream, data: received.append(("kline", data)))
+
+    try:
+        manager.wait_connected(3).should.be.true
+        wait_until(lambda: len(server.clients) == 2).should.be.true
+
+        # 每个连接最多2个stream，地址中包含全部stream
+        sorted(server.paths).should.equal(
+            ["/stream?streams=bnbusdt@trade/btcusdt@kline_1m", "/stream?streams=btcusdt@trade/ethusdt@trade"]
+        )
+
+        get_client(server, "ethusdt@trade").send("ethusdt@trade", {"e": "trade", "t": 1})
+        wait_until(lambda: len(received) == 1).should.be.true
+        get_client(server, "bnbusdt@trade").send("btcusdt@kline_1m", {"e": "kline"})
+        wait_until(lambda: len(received) == 3).should.be.true
+
+        # 同一个stream的处理函数按订阅顺序调用
+        received.should.equal([
+            ("ethusdt@trade", {"e": "trade", "t": 1}),
+            ("btcusdt@kline_1m", {"e": "kline"}),
+            ("kline", {"e": "kline"})
+        ])
+        server.messages.should.be.empty
+    finally:
+        manager.stop()
+
+
+def test_subscribe_on_open_connection(server):
+    manager = make_manager(server)
+    received = []
+    manager.subscribe("btcusdt@trade", lambda stream, data: received.append(stream))
+
+    try:
+        manager.wait_connected(3).should.be.true
+        manager.subscribe(["ethusdt@trade", "bnbusdt@trade"], lambda stream, data: received.append(stream))
+        wait_until(lambda: server.messages).should.be.true
+
+        message = server.messages[0]
+        message["method"].should.equal("SUBSCRIBE")
+        message["params"].should.equal(["ethusdt@trade", "bnbusdt@trade"])
+        len(manager.connections).should.equal(1)
+
+        manager.unsubscribe("ethusdt@trade")
+        wait_until(lambda: len(server.messages) == 2).should.be.true
+        server.messages[1]["method"].should.equal("UNSUBSCRIBE")
+        manager.handlers.should_not.have.key("ethusdt@trade")
+    finally:
+        manager.stop()
+
+
+def test_close_connection_without_streams(server):
+    manager = make_manager(server, streams_per_connection=1)
+    manager.subscribe(["btcusdt@trade", "ethusdt@trade"], lambda stream, data: None)
+
+    try:
+        manager.wait_connected(3).should.be.true
+        wait_until(lambda: len(server.clients) == 2).should.be.true
+        connection = manager.stream_connections["btcusdt@trade"]
+
+        # 连接上唯一的stream取消后关闭连接，不再重连
+        manager.unsubscribe("btcusdt@trade")
+        connection.join(3)
+        connection.is_alive().should.be.false
+        manager.connections.should.have.length_of(1)
+        wait_until(lambda: len(server.clients) == 1).should.be.true
+        time.sleep(0.2)
+        len(server.paths).should.equal(2)
+
+        # 新的stream使用新连接
+        manager.subscribe("bnbusdt@trade", lambda stream, data: None)
+        manager.wait_connected(3).should.be.true
+        server.paths[-1].should.equal("/stream?streams=bnbusdt@trade")
+    finally:
+        manager.stop()
+
+
+def test_subscribe_after_stop(server):
+    manager = make_manager(server)
+    received = []
+    manager.subscribe("btcusdt@trade", lambda stream, data: received.append(stream))
+    manager.wait_connected(3).should.be.true
+    manager.stop()
+
+    manager.connections.should.be.empty
+    manager.handlers.should.be.empty
+
+    # 停止后重新订阅创建新连接
+    manager.subscribe("ethusdt@trade", lambda stream, data: received.append(stream))
+    try:
+        manager.wait_connected(3).should.be.true
+        server.paths[-1].should.equal("/stream?streams=ethusdt@trade")
+        wait_until(lambda: get_client(server, "ethusdt@trade")).should.be.true
+        get_client(server, "ethusdt@trade").send("ethusdt@trade", {"e": "trade", "t": 1})
+        wait_until(lambda: received).should.be.true
+        received.should.equal(["ethusdt@trade"])
+    finally:
+        manager.stop()
+
+
+def test_reconnect_and_detect_gap(server):
+    gaps = []
+    reconnects = []
+    manager = make_manager(
+        server,
+        on_gap=lambda *args: gaps.append(args),
+        on_reconnect=lambda connection: reconnects.append(connection)
+    )
+    received = []
+    manager.subscribe("btcusdt@depth", lambda stream, data: received.append(data["u"]))
+
+    try:
+        manager.wait_connected(3).should.be.true
+        wait_until(lambda: server.clients).should.be.true
+        client = server.clients[0]
+        client.send("btcusdt@depth", depth(1, 10))
+        client.send("btcusdt@depth", depth(11, 20))
+        wait_until(lambda: len(received) == 2).should.be.true
+        gaps.should.be.empty
+
+        # 断线后自动重连，地址中包含原有stream
+        client.drop()
+        wait_until(lambda: len(server.paths) == 2 and server.clients).should.be.true
+        server.paths[1].should.equal(server.paths[0])
+        len(reconnects).should.equal(1)
+
+        # 重连期间丢失21-30
+        server.clients[0].send("btcusdt@depth", depth(31, 40))
+        wait_until(lambda: len(received) == 3).should.be.true
+        gaps.should.equal([("btcusdt@depth", 21, 31)])
+    finally:
+        manager.stop()
+
+
+def test_handler_error_does_not_stop_connection(server):
+    errors = []
+    received = []
+    manager = make_manager(server, on_error=errors.append)
+
+    def handler(stream, data):
+        if data["t"] == 1:
+            raise ValueError("bad data")
+        received.append(data["t"])
+
+    manager.subscribe("btcusdt@trade", handler)
+
+    try:
+        manager.wait_connected(3).should.be.true
+        wait_until(lambda: server.clients).should.be.true
+        client = server.clients[0]
+        client.send("btcusdt@trade", {"e": "trade", "t": 1})
+        client.send("btcusdt@trade", {"e": "trade", "t": 2})
+
+        wait_until(lambda: received).should.be.true
+        received.should.equal([2])
+        len(errors).should.equal(1)
+        len(server.paths).should.equal(1)
+    finally:
+        manager.stop()
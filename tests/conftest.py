@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.trader.constant import Exchange, Interval
+from core.trader.object import BarData
+from core.trader.utility import ZoneInfo
+
+TZ = ZoneInfo("Asia/Shanghai")
+
+
+def create_bars(count, interval=Interval.MINUTE, start=None, seed=0):
+    """Random walk bars with consistent open/high/low/close"""
+    rng = np.random.default_rng(seed)
+    start = start or datetime(2023, 1, 2, 9, 0, tzinfo=TZ)
+    delta = timedelta(hours=1) if interval == Interval.HOUR else timedelta(minutes=1)
+
+    closes = 100 + np.cumsum(rng.normal(0, 1, count))
+    bars = []
+    for i, close in enumerate(closes):
+        open_price = closes[i - 1] if i else close
+        bars.append(BarData(
+            symbol="BTCUSDT",
+            exchange=Exchange.BINANCE,
+            datetime=start + delta * i,
+            interval=interval,
+            volume=float(rng.integers(1, 100)),
+            turnover=float(rng.integers(100, 10000)),
+            open_price=float(open_price),
+            high_price=float(max(open_price, close) + rng.random()),
+            low_price=float(min(open_price, close) - rng.random()),
+            close_price=float(close),
+            gateway_name="DB"
+        ))
+    return bars
+
+
+@pytest.fixture
+def make_bars():
+    """K线数据生成函数"""
+    return create_bars
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+import apps.vnpy_ctastrategy.backtesting as backtesting
+from apps.vnpy_ctastrategy.backtesting import BacktestingEngine
+from core.trader.constant import Interval
+from core.trader.utility import BarSeries
+
+
+class FakeDatabase:
+    """记录缺失检查的调用参数"""
+
+    def __init__(self, gaps):
+        self.gaps = gaps
+        self.calls = []
+
+    def find_gaps(self, symbol, exchange, interval, start, end):
+        self.calls.append(interval)
+        return self.gaps
+
+
+class FakeLoader:
+    """代替ZQLoadBars返回固定的K线序列"""
+
+    series = None
+
+    def __init__(self, **kwargs):
+        pass
+
+    def load_series(self):
+        return self.series
+
+
+def make_engine(monkeypatch, interval, gaps=None):
+    database = FakeDatabase(gaps)
+    monkeypatch.setattr(backtesting, "get_database", lambda: database)
+
+    engine = BacktestingEngine()
+    engine.set_parameters(
+        vt_symbol="BTCUSDT.BINANCE",
+        interval=interval,
+        start=datetime(2023, 1, 1),
+        end=datetime(2023, 2, 1),
+        rate=0,
+        slippage=0,
+        size=1,
+        pricetick=0.01,
+        capital=1_000_000
+    )
+    engine.logs = []
+    monkeypatch.setattr(engine, "output", engine.logs.append)
+    return engine, database
+
+
+@pytest.mark.parametrize("interval", ["15m", "1h"])
+def test_check_data_gaps(monkeypatch, interval):
+    engine, database = make_engine(monkeypatch, interval, [(datetime(2023, 1, 5), datetime(2023, 1, 6))])
+    engine.check_data_gaps()
+
+    # 按数据库中保存的基础周期检查
+    assert database.calls == [Interval.MINUTE if interval == "15m" else Interval.HOUR]
+    assert "1处缺失" in engine.logs[-1]
+
+
+@pytest.mark.parametrize("interval", ["d", "w"])
+def test_skip_daily_and_weekly(monkeypatch, interval):
+    engine, database = make_engine(monkeypatch, interval)
+    engine.check_data_gaps()
+
+    assert database.calls == []
+
+
+def test_coverage_not_initialized(monkeypatch):
+    engine, database = make_engine(monkeypatch, "1m", None)
+    engine.check_data_gaps()
+
+    assert database.calls == [Interval.MINUTE]
+    assert "跳过" in engine.logs[-1]
+
+
+def test_load_data_does_not_check_gaps(monkeypatch, make_bars):
+    # 参数优化每次重新加载数据时不查询数据库缺失
+    engine, database = make_engine(monkeypatch, "1m", [])
+    monkeypatch.setattr(FakeLoader, "series", BarSeries.from_bars(make_bars(100)))
+    monkeypatch.setattr(backtesting, "ZQLoadBars", FakeLoader)
+
+    engine.load_data()
+
+    assert database.calls == []
+    assert engine.history_data is FakeLoader.series
@@ -0,0 +1,90 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from core.event import EventEngine, Event
+from core.trader.constant import Direction, Exchange, Offset, Status
+from core.trader.event import EVENT_LANES, EVENT_TICK, EVENT_TRADE, EVENT_ORDER
+from core.trader.object import TickData, TradeData, OrderData
+import apps.vnpy_ctastrategy.engine as cta_engine
+from apps.vnpy_ctastrategy.engine import CtaEngine
+
+
+class RecordingStrategy:
+    """Record how many strategy callbacks run at the same time"""
+
+    strategy_name = "test"
+    vt_symbol = "BTCUSDT.BINANCE"
+
+    def __init__(self):
+        self.inited = True
+        self.trading = True
+        self.pos = 0
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def record(self, data):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.0005)
+        with self.lock:
+            self.running -= 1
+            self.calls += 1
+
+    on_tick = on_order = on_trade = record
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # 测试环境没有数据库和数据服务
+    monkeypatch.setattr(cta_engine, "get_database", lambda: None)
+    monkeypatch.setattr(cta_engine, "get_datafeed", lambda main_engine: None)
+
+    event_engine = EventEngine(lanes=EVENT_LANES)
+    engine = CtaEngine(None, event_engine)
+    engine.sync_strategy_data = lambda strategy: None
+    engine.put_strategy_event = lambda strategy: None
+    engine.register_event()
+
+    event_engine.start()
+    yield engine
+    event_engine.stop()
+
+
+def test_handlers_serialized_across_lanes(engine):
+    strategy = RecordingStrategy()
+    engine.strategies[strategy.strategy_name] = strategy
+    engine.symbol_strategy_map[strategy.vt_symbol].append(strategy)
+
+    count = 200
+    for i in range(count):
+        orderid = f"BINANCE.{i}"
+        engine.orderid_strategy_map[orderid] = strategy
+
+        engine.event_engine.put(Event(EVENT_TICK, TickData(
+            symbol="BTCUSDT", exchange=Exchange.BINANCE, datetime=datetime.now(),
+            last_price=100, gateway_name="BINANCE"
+        )))
+        engine.event_engine.put(Event(EVENT_ORDER, OrderData(
+            symbol="BTCUSDT", exchange=Exchange.BINANCE, orderid=str(i),
+            direction=Direction.LONG, offset=Offset.OPEN, status=Status.ALLTRADED,
+            gateway_name="BINANCE"
+        )))
+        engine.event_engine.put(Event(EVENT_TRADE, TradeData(
+            symbol="BTCUSDT", exchange=Exchange.BINANCE, orderid=str(i), tradeid=str(i),
+            direction=Direction.LONG, offset=Offset.OPEN, volume=1, gateway_name="BINANCE"
+        )))
+
+    deadline = time.monotonic() + 10
+    while strategy.calls < count * 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # 行情和交易车道并行处理，但策略回调不会同时执行
+    assert strategy.calls == count * 3
+    assert strategy.max_running == 1
+    assert strategy.pos == count
@@ -0,0 +1,156 @@
+import os
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.trader.constant import Exchange, Interval
+from core.trader.database import get_bar_segments
+from apps.vnpy_datamanager.backfill import BackfillJob
+from sdk.binance_sdk.binance.download.downloader import STATUS_DOWNLOADED
+
+KEY = ("BTCUSDT", Exchange.BINANCE, Interval.HOUR)
+HOUR = timedelta(hours=1)
+
+
+class FakeDownloader:
+    """把每天24根小时K线写成binance格式的zip文件，跳过missing_hours中的K线，corrupt中的日期写入损坏的文件"""
+
+    def __init__(self, missing_hours=(), corrupt=(), on_download=None):
+        self.missing_hours = set(missing_hours)
+        self.corrupt = set(corrupt)
+        self.on_download = on_download
+        self.urls = []
+
+    def download_file(self, task):
+        self.urls.append(task.file_url)
+        if self.on_download:
+            self.on_download()
+
+        os.makedirs(os.path.dirname(task.save_path), exist_ok=True)
+        day = datetime.strptime(task.file_url[-14:-4], "%Y-%m-%d")
+
+        if day.strftime("%Y-%m-%d") in self.corrupt:
+            with open(task.save_path, "wb") as f:
+                f.write(b"broken")
+        else:
+            lines = []
+            for i in range(24):
+                dt = day + HOUR * i
+                if dt in self.missing_hours:
+                    continue
+                ms = int((dt - datetime(1970, 1, 1)).total_seconds() * 1000)
+                lines.append(f"{ms},1,2,0.5,1.5,10,{ms + 3599999},15,1,5,7,0")
+
+            with zipfile.ZipFile(task.save_path, "w") as zip_ref:
+                zip_ref.writestr(os.path.basename(task.save_path)[:-4] + ".csv", "\n".join(lines) + "\n")
+
+        task.status = STATUS_DOWNLOADED
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    """按K线时间维护连续区间"""
+
+    def __init__(self):
+        self.datetimes = set()
+        self.quiet = []
+
+    def save_bar_series(self, series, stream=False, quiet=False):
+        self.quiet.append(quiet)
+        self.datetimes.update(series.datetime_array.view("datetime64[ns]").astype("datetime64[us]").tolist())
+        return True
+
+    def delete_bar_data(self, symbol, exchange, interval):
+        count = len(self.datetimes)
+        self.datetimes.clear()
+        return count
+
+    def get_bar_coverage(self, symbol, exchange, interval):
+        return get_bar_segments(sorted(self.datetimes), interval)
+
+
+@pytest.fixture
+def make_job(tmp_path):
+    def make_job(database, downloader, **kwargs):
+        job = BackfillJob(
+            database,
+            ["BTCUSDT.BINANCE"],
+            [Interval.HOUR],
+            datetime(2023, 1, 1),
+            datetime(2023, 1, 3),
+            output=lambda msg: None,
+            folder=str(tmp_path / "data"),
+            checkpoint_name=str(tmp_path / "checkpoint.txt"),
+            **kwargs
+        )
+        job.downloader = downloader
+        return job
+
+    return make_job
+
+
+def test_resume_from_checkpoint(make_job):
+    # 1月2日缺少一根K线，数据库区间不能完整覆盖当天的文件
+    database = FakeDatabase()
+    missing = datetime(2023, 1, 2, 12)
+    job = make_job(database, FakeDownloader([missing]))
+    job.run()
+
+    assert len(job.downloader.urls) == 3
+    assert job.write_stats.files == 3
+    assert len(database.datetimes) == 71
+    assert database.quiet == [True] * 3
+
+    # 重新运行时按检查点跳过已写入的文件
+    job = make_job(database, FakeDownloader())
+    job.run()
+    assert job.downloader.urls == []
+
+    # 删除K线后检查点失效，重新下载全部文件
+    database.delete_bar_data(*KEY)
+    job = make_job(database, FakeDownloader())
+    job.run()
+    assert len(job.downloader.urls) == 3
+    assert len(database.datetimes) == 72
+
+
+def test_stop(make_job):
+    # 第一个文件下载时停止，已下载的文件仍写入数据库，其余文件不再下载
+    database = FakeDatabase()
+    downloader = FakeDownloader()
+    job = make_job(database, downloader, download_workers=1)
+    downloader.on_download = job.stop
+    job.run()
+
+    assert len(downloader.urls) == 1
+    assert job.write_stats.files == 1
+    assert len(database.datetimes) == 24
+
+    # 重新运行时只下载剩余的文件
+    job = make_job(database, FakeDownloader())
+    job.run()
+    assert len(job.downloader.urls) == 2
+    assert len(database.datetimes) == 72
+
+
+def test_parse_failure(make_job):
+    database = FakeDatabase()
+    downloader = FakeDownloader(corrupt=["2023-01-02"])
+    job = make_job(database, downloader)
+    job.run()
+
+    # 损坏的文件不写入数据库也不记录检查点，并从本地删除
+    assert job.parse_stats.failed == 1
+    assert job.write_stats.files == 2
+    assert len(database.datetimes) == 48
+    broken = job.make_task(*KEY, "daily", "2023-01-02")
+    assert not os.path.exists(broken.download.save_path)
+
+    # 重新运行时再次下载该文件
+    job = make_job(database, FakeDownloader())
+    job.run()
+    assert job.downloader.urls == [broken.download.file_url]
+    assert len(database.datetimes) == 72
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+from peewee import SqliteDatabase
+
+from core.trader.constant import Exchange, Interval
+from core.trader.utility import BarSeries
+from apps.vnpy_datamanager.database.vnpy_mysql.mysql_database import (
+    BAR_FIELDS,
+    DbBarCoverage,
+    DbBarData,
+    MysqlDatabase
+)
+
+START = datetime(2023, 1, 1)
+MINUTE = timedelta(minutes=1)
+KEY = ("BTCUSDT", Exchange.BINANCE, Interval.MINUTE)
+
+
+def minutes(first, last):
+    return [START + MINUTE * i for i in range(first, last + 1)]
+
+
+def segment(first, last):
+    return (START + MINUTE * first, START + MINUTE * last)
+
+
+@pytest.fixture
+def database():
+    # 区间索引只使用通用SQL，用内存SQLite代替MySQL
+    sqlite = SqliteDatabase(":memory:")
+    models = [DbBarData, DbBarCoverage]
+    with sqlite.bind_ctx(models):
+        sqlite.create_tables(models)
+        database = MysqlDatabase.__new__(MysqlDatabase)
+        database.db = sqlite
+        yield database
+
+
+def insert_bars(datetimes):
+    rows = [("BTCUSDT", "BINANCE", dt, "1m", 1, 1, 0, 1, 1, 1, 1) for dt in datetimes]
+    DbBarData.insert_many(rows, fields=BAR_FIELDS).execute()
+
+
+def test_save_empty_data(make_bars):
+    # 空数据在访问数据库之前返回，不需要数据库连接
+    database = MysqlDatabase.__new__(MysqlDatabase)
+    empty = BarSeries.from_bars(make_bars(10)).select(slice(0, 0))
+
+    assert database.save_bar_data([]) is False
+    assert database.save_bar_series(empty) is False
+
+
+def test_update_bar_coverage(database):
+    database.update_bar_coverage(*KEY, minutes(0, 9))
+    database.update_bar_coverage(*KEY, minutes(20, 29) + minutes(40, 49))
+    assert database.get_bar_coverage(*KEY) == [segment(0, 9), segment(20, 29), segment(40, 49)]
+
+    # 与前后区间相邻的新数据合并为一个区间，不相交的区间不变
+    database.update_bar_coverage(*KEY, minutes(10, 19))
+    assert database.get_bar_coverage(*KEY) == [segment(0, 29), segment(40, 49)]
+
+    # 重复写入已覆盖的数据
+    database.update_bar_coverage(*KEY, minutes(5, 25))
+    assert database.get_bar_coverage(*KEY) == [segment(0, 29), segment(40, 49)]
+
+    # 其他合约和周期的区间互不影响
+    database.update_bar_coverage("ETHUSDT", Exchange.BINANCE, Interval.MINUTE, minutes(30, 39))
+    assert database.get_bar_coverage(*KEY) == [segment(0, 29), segment(40, 49)]
+    assert DbBarCoverage.select().count() == 3
+
+
+def test_find_gaps(database):
+    database.update_bar_coverage(*KEY, minutes(0, 9) + minutes(20, 29) + minutes(40, 49))
+
+    assert database.find_gaps(*KEY, *segment(0, 49)) == [segment(10, 19), segment(30, 39)]
+    assert database.find_gaps(*KEY, *segment(20, 29)) == []
+    assert database.find_gaps(*KEY, *segment(25, 45)) == [segment(30, 39)]
+    assert database.find_gaps(*KEY, *segment(45, 60)) == [segment(50, 60)]
+
+
+def test_find_gaps_without_coverage(database):
+    insert_bars(minutes(0, 9) + minutes(20, 29))
+
+    # 索引未建立时不扫描K线
+    assert database.find_gaps(*KEY, *segment(0, 29)) is None
+    assert DbBarCoverage.select().count() == 0
+
+    # 查询区间时由已有K线建立索引
+    assert database.get_bar_coverage(*KEY) == [segment(0, 9), segment(20, 29)]
+    assert database.find_gaps(*KEY, *segment(0, 29)) == [segment(10, 19)]
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from core.trader.constant import Interval
+from core.trader.database import get_bar_gaps, get_bar_segments, merge_bar_segments
+
+START = datetime(2023, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+def minutes(*ranges):
+    """按(起始分钟, 结束分钟)生成连续的分钟时间"""
+    return [START + MINUTE * i for first, last in ranges for i in range(first, last + 1)]
+
+
+def segment(first, last):
+    return (START + MINUTE * first, START + MINUTE * last)
+
+
+def test_get_bar_segments():
+    assert get_bar_segments([], Interval.MINUTE) == []
+    assert get_bar_segments(minutes((0, 0)), Interval.MINUTE) == [segment(0, 0)]
+    assert get_bar_segments(minutes((0, 9), (11, 20), (30, 30)), Interval.MINUTE) == [
+        segment(0, 9), segment(11, 20), segment(30, 30)
+    ]
+
+    hours = [START + timedelta(hours=i) for i in [0, 1, 2, 5]]
+    assert get_bar_segments(hours, Interval.HOUR) == [(hours[0], hours[2]), (hours[3], hours[3])]
+
+
+def test_merge_bar_segments():
+    # 相邻（间隔一个周期）和重叠的区间合并，有缺失的区间保留
+    segments = [segment(20, 30), segment(0, 9), segment(10, 15), segment(25, 40), segment(42, 50)]
+    assert merge_bar_segments(segments, Interval.MINUTE) == [segment(0, 15), segment(20, 40), segment(42, 50)]
+
+    # 被包含的区间不缩短已有区间
+    assert merge_bar_segments([segment(0, 50), segment(10, 20)], Interval.MINUTE) == [segment(0, 50)]
+    assert merge_bar_segments([], Interval.MINUTE) == []
+
+
+def test_get_bar_gaps():
+    segments = [segment(0, 9), segment(20, 29), segment(40, 49)]
+
+    assert get_bar_gaps(segments, Interval.MINUTE, *segment(0, 49)) == [segment(10, 19), segment(30, 39)]
+
+    # 查询范围在区间内部或与区间边界相接
+    assert get_bar_gaps(segments, Interval.MINUTE, *segment(2, 8)) == []
+    assert get_bar_gaps(segments, Interval.MINUTE, *segment(9, 20)) == [segment(10, 19)]
+    assert get_bar_gaps(segments, Interval.MINUTE, *segment(10, 19)) == [segment(10, 19)]
+
+    # 范围两端超出已有数据
+    assert get_bar_gaps(segments, Interval.MINUTE, *segment(-5, 55)) == [
+        segment(-5, -1), segment(10, 19), segment(30, 39), segment(50, 55)
+    ]
+    assert get_bar_gaps([], Interval.MINUTE, *segment(0, 9)) == [segment(0, 9)]
@@ -0,0 +1,49 @@
+import pytest
+
+from core.trader.constant import Interval
+from core.trader.utility import BarGenerator, resample_bars
+
+
+def make_gapped_bars(make_bars, interval):
+    """K线数据中间缺失一段，并且不从整点开始"""
+    bars = make_bars(3000, interval)
+    return bars[7:1000] + bars[1013:2500] + bars[2600:]
+
+
+def generate_bars(bars, window, interval):
+    window_bars = []
+    generator = BarGenerator(None, window, window_bars.append, interval)
+    for bar in bars:
+        generator.update_bar(bar)
+    return window_bars
+
+
+def get_fields(bars):
+    return [
+        (
+            bar.datetime, bar.open_price, bar.high_price, bar.low_price, bar.close_price,
+            bar.volume, bar.turnover, bar.open_interest, bar.interval
+        )
+        for bar in bars
+    ]
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 5, 15, 30, 60])
+def test_minute_window(make_bars, window):
+    bars = make_gapped_bars(make_bars, Interval.MINUTE)
+    expected = get_fields(generate_bars(bars, window, Interval.MINUTE))
+    assert get_fields(resample_bars(bars, window, Interval.MINUTE)) == expected
+
+
+@pytest.mark.parametrize("window", [1, 2, 4, 24])
+def test_hour_window_from_hour_bars(make_bars, window):
+    bars = make_gapped_bars(make_bars, Interval.HOUR)
+    expected = get_fields(generate_bars(bars, window, Interval.HOUR))
+    assert get_fields(resample_bars(bars, window, Interval.HOUR)) == expected
+
+
+@pytest.mark.parametrize("window", [1, 2, 4])
+def test_hour_window_from_minute_bars(make_bars, window):
+    bars = make_gapped_bars(make_bars, Interval.MINUTE)
+    expected = get_fields(generate_bars(bars, window, Interval.HOUR))
+    assert get_fields(resample_bars(bars, window, Interval.HOUR)) == expected
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from core.trader.utility import ArrayManager, RingArrayManager
+
+FIELDS = ["open", "high", "low", "close", "volume", "turnover", "open_interest"]
+
+INDICATORS = {
+    "sma": lambda am: am.sma(10),
+    "ema": lambda am: am.ema(10),
+    "atr": lambda am: am.atr(14),
+    "rsi": lambda am: am.rsi(14),
+    "macd": lambda am: am.macd(12, 26, 9),
+    "boll": lambda am: am.boll(20, 2),
+    "donchian": lambda am: am.donchian(20),
+}
+
+
+@pytest.mark.parametrize("size", [1, 30, 100])
+def test_parity(make_bars, size):
+    # 500根K线在窗口中多次回绕
+    am = ArrayManager(size)
+    ram = RingArrayManager(size)
+
+    for i, bar in enumerate(make_bars(500)):
+        bar.open_interest = float(i)
+        am.update_bar(bar)
+        ram.update_bar(bar)
+
+        assert ram.count == am.count
+        assert ram.inited == am.inited
+
+        for field in FIELDS:
+            np.testing.assert_array_equal(getattr(ram, field + "_array"), getattr(am, field + "_array"))
+            np.testing.assert_array_equal(getattr(ram, field), getattr(am, field))
+
+        if size >= 30:
+            for func in INDICATORS.values():
+                np.testing.assert_array_equal(func(ram), func(am))
@@ -0,0 +1,31 @@
+from core.trader.utility import BarSeries, SharedBarSeries, _attached_series
+
+
+def test_attach_shares_history(make_bars):
+    series = BarSeries.from_bars(make_bars(100))
+    shared = SharedBarSeries(series)
+    try:
+        attached = shared.attach()
+        assert attached is shared.attach()
+        assert (attached.close_array == series.close_array).all()
+        assert attached[10] == series[10]
+    finally:
+        SharedBarSeries.detach_all()
+        shared.release()
+
+
+def test_attach_detaches_previous_run(make_bars):
+    first = SharedBarSeries(BarSeries.from_bars(make_bars(100)))
+    second = SharedBarSeries(BarSeries.from_bars(make_bars(50, seed=1)))
+    try:
+        first.attach()
+        shm = _attached_series[first.name][0]
+
+        # 工作进程开始新一轮优化时只保留当前的共享内存
+        second.attach()
+        assert list(_attached_series) == [second.name]
+        assert shm.buf is None
+    finally:
+        SharedBarSeries.detach_all()
+        first.release()
+        second.release()
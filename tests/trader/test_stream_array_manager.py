@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from core.trader.utility import ArrayManager, StreamArrayManager
+
+INDICATORS = {
+    "sma": lambda am: am.sma(20),
+    "std": lambda am: am.std(20, 2),
+    "boll": lambda am: am.boll(20, 2),
+    "donchian": lambda am: am.donchian(20),
+    "ema": lambda am: am.ema(20),
+    "rsi": lambda am: am.rsi(14),
+    "atr": lambda am: am.atr(14),
+    "keltner": lambda am: am.keltner(20, 2),
+    "macd": lambda am: am.macd(12, 26, 9),
+}
+
+
+def assert_parity(func, size, bars, start=0):
+    """从第start根K线开始，每根K线都与ArrayManager比较"""
+    am = ArrayManager(size)
+    sam = StreamArrayManager(size)
+    for i, bar in enumerate(bars):
+        am.update_bar(bar)
+        sam.update_bar(bar)
+        if i >= start:
+            np.testing.assert_allclose(func(sam), func(am), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("name", INDICATORS)
+@pytest.mark.parametrize("size", [30, 100])
+def test_parity(make_bars, name, size):
+    assert_parity(INDICATORS[name], size, make_bars(1000))
+
+
+@pytest.mark.parametrize("name", INDICATORS)
+def test_parity_after_late_first_call(make_bars, name):
+    # 运行中途首次调用时使用当前窗口预热
+    assert_parity(INDICATORS[name], 100, make_bars(500, seed=1), start=250)
+
+
+@pytest.mark.parametrize("name", ["ema", "rsi", "atr"])
+def test_window_shorter_than_period(make_bars, name):
+    # 窗口不足指标周期时与talib一样没有结果
+    assert_parity(INDICATORS[name], 10, make_bars(50))
+
+
+def test_no_drift_on_long_run(make_bars):
+    bars = make_bars(20000, seed=2)
+    for bar in bars:
+        bar.high_price += 100000
+        bar.low_price += 100000
+        bar.close_price += 100000
+
+    am = ArrayManager(100)
+    sam = StreamArrayManager(100)
+    for bar in bars:
+        am.update_bar(bar)
+        sam.update_bar(bar)
+        sam.sma(20), sam.std(20), sam.ema(20), sam.rsi(14), sam.atr(14)
+
+    assert sam.sma(20) == pytest.approx(am.sma(20), abs=1e-9)
+    assert sam.std(20) == pytest.approx(am.std(20), abs=1e-6)
+    assert sam.ema(20) == pytest.approx(am.ema(20), abs=1e-9)
+    assert sam.rsi(14) == pytest.approx(am.rsi(14), abs=1e-9)
+    assert sam.atr(14) == pytest.approx(am.atr(14), abs=1e-9)